@@ -10,8 +10,35 @@ class Settings(BaseSettings):
     APP_NAME: str = "ExtractionApp"
     SCHEMA_NAME: str = "extraction"
     DATABASE_URL: Optional[str] = None
+    # Optional read replica used by read-only sessions, falls back to DATABASE_URL
+    DATABASE_READ_URL: Optional[str] = None
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    # psycopg2 only: "values_only" batches INSERTs, "values_plus_batch" also UPDATE/DELETE executemany
+    DB_EXECUTEMANY_MODE: str = "values_plus_batch"
+    DB_INSERTMANYVALUES_PAGE_SIZE: int = 1000
+    DB_EXECUTEMANY_BATCH_PAGE_SIZE: int = 500
     NUCLEUS_API_URL: Optional[str] = None
     NUCLEUS_API_KEY: Optional[str] = None
+    # Extraction job worker, see services.job_queue
+    JOB_WORKER_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 8  # jobs processed at once per API process
+    JOB_POLL_INTERVAL: float = 2.0  # seconds between queue polls while idle
+    JOB_LEASE_SECONDS: int = 300  # a claimed job is picked up again if not done within this time
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: float = 5.0  # seconds, doubled after every failed attempt
+    JOB_RETRY_MAX_DELAY: float = 600.0
+    JOB_RESULT_POLL_DELAY: float = 5.0  # seconds, doubled after every pending results poll
+    JOB_RESULT_POLL_MAX_DELAY: float = 120.0
+    JOB_RESULT_TIMEOUT: float = 3600.0  # seconds before a running workflow counts as a failed attempt
+    # Incremental evaluation and export re-read changes written up to this many seconds before the
+    # previous run, to catch rows of transactions that were still open when it read
+    WATERMARK_OVERLAP_SECONDS: float = 300.0
 
     class Config:
         env_file = ".env"  # optionally load environment variables from a file
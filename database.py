@@ -1,17 +1,58 @@
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from config import settings
 from models.DataModels import Base
 
-# Create the SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL,
-                       echo=False,
-                       connect_args={"options":f"-csearch_path={settings.SCHEMA_NAME}"})
 
-# Create a session factory
+def create_db_engine(url: Optional[str] = None, **overrides: Any) -> Engine:
+    """
+    Create an engine configured from ``config.Settings``.
+
+    Args:
+        url (Optional[str]): Database URL, defaults to ``settings.DATABASE_URL``
+        **overrides: Keyword arguments passed to ``create_engine`` in place of the configured ones
+
+    Returns:
+        Engine: The engine, with its own connection pool
+    """
+    url = url or settings.DATABASE_URL
+    options = f"-csearch_path={settings.SCHEMA_NAME}"
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options += f" -cstatement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "insertmanyvalues_page_size": settings.DB_INSERTMANYVALUES_PAGE_SIZE,
+        "connect_args": {"options": options},
+    }
+    if make_url(url).get_driver_name() == "psycopg2":
+        kwargs["executemany_mode"] = settings.DB_EXECUTEMANY_MODE
+        kwargs["executemany_batch_page_size"] = settings.DB_EXECUTEMANY_BATCH_PAGE_SIZE
+    kwargs.update(overrides)
+    return create_engine(url, **kwargs)
+
+
+# Create the SQLAlchemy engines; without a configured replica, reads go to the primary
+engine = create_db_engine()
+read_engine = create_db_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+
+# Create the session factories
 SessionLocal = sessionmaker(autocommit=False,
                             autoflush=False,
                             bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False,
+                                autoflush=False,
+                                bind=read_engine)
 
 
 # Create all tables in the database
@@ -26,8 +67,113 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get a session on the read replica in read-only routes
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def session_scope(read_only: bool = False) -> Iterator[Session]:
+    """
+    Provide a session for batch jobs and scripts: committed when the block succeeds,
+    rolled back when it raises, and always closed.
+
+    Args:
+        read_only (bool): Use the read replica; the session is rolled back instead of committed
+
+    Yields:
+        Session: The session
+    """
+    db = ReadSessionLocal() if read_only else SessionLocal()
+    try:
+        yield db
+        if read_only:
+            db.rollback()
+        else:
+            db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+
+def create_async_db_engine(url: Optional[str] = None, **overrides: Any) -> AsyncEngine:
+    """
+    Create an asyncpg-backed async engine configured from ``config.Settings``.
+
+    Args:
+        url (Optional[str]): Database URL, defaults to ``settings.DATABASE_URL``; its driver is replaced by asyncpg
+        **overrides: Keyword arguments passed to ``create_async_engine`` in place of the configured ones
+
+    Returns:
+        AsyncEngine: The engine, with its own connection pool
+    """
+    url = make_url(url or settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+    server_settings = {"search_path": settings.SCHEMA_NAME}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "insertmanyvalues_page_size": settings.DB_INSERTMANYVALUES_PAGE_SIZE,
+        "connect_args": {"server_settings": server_settings},
+    }
+    kwargs.update(overrides)
+    return create_async_engine(url, **kwargs)
+
+
+# Async engines are created on first use, so the sync stack does not need asyncpg installed
+_async_engines: Dict[bool, AsyncEngine] = {}
+
+# Objects stay usable after commit; an expired attribute would need implicit IO to reload
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine(read_only: bool = False) -> AsyncEngine:
+    """
+    Get the shared async engine of the primary database or of the read replica.
+
+    Args:
+        read_only (bool): Get the read replica engine, which is the primary one when no replica is configured
+
+    Returns:
+        AsyncEngine: The engine
+    """
+    read_only = read_only and bool(settings.DATABASE_READ_URL)
+    if read_only not in _async_engines:
+        _async_engines[read_only] = create_async_db_engine(settings.DATABASE_READ_URL if read_only else None)
+    return _async_engines[read_only]
+
+
+async def dispose_async_engines():
+    """Close the pools of the async engines, e.g. on application shutdown."""
+    for async_engine in _async_engines.values():
+        await async_engine.dispose()
+    _async_engines.clear()
+
+# Dependency to get an async DB session in async routes
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+# Dependency to get an async session on the read replica in read-only async routes
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal(bind=get_async_engine(read_only=True)) as db:
+        yield db
+
 
 
 
 if __name__ == "__main__":
-    create_all()
\ No newline at end of file
+    create_all()
@@ -0,0 +1,203 @@
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INPUT_FORMATS = (
+    '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d',
+    '%m-%d-%Y', '%d-%m-%Y', '%Y-%m-%d',
+    '%b %d, %Y', '%B %d, %Y'
+)
+ISO_FORMAT = '%Y-%m-%d'
+
+# Permissive patterns per strptime directive. They only rule out formats that cannot
+# match, so strptime is never rejected for something it would have accepted
+_DIRECTIVE_PATTERNS = {
+    'Y': r'\d{4}',
+    'y': r'\d{2}',
+    'm': r'\s?\d{1,2}',
+    'd': r'\s?\d{1,2}',
+    'b': r'\w+',
+    'B': r'\w+',
+    'a': r'\w+',
+    'A': r'\w+',
+    '%': '%',
+}
+
+
+def format_pattern(date_format: str) -> re.Pattern:
+    """
+    Build a regex that matches every string ``datetime.strptime`` could parse with a format.
+
+    Args:
+        date_format (str): A strptime format
+
+    Returns:
+        re.Pattern: Case-insensitive pattern to ``fullmatch`` against a stripped value
+    """
+    parts = []
+    i = 0
+    while i < len(date_format):
+        char = date_format[i]
+        if char == '%' and i + 1 < len(date_format):
+            parts.append(_DIRECTIVE_PATTERNS.get(date_format[i + 1], r'.*?'))
+            i += 2
+            continue
+        parts.append(r'\s+' if char.isspace() else re.escape(char))
+        i += 1
+    return re.compile(''.join(parts), re.IGNORECASE)
+
+
+class DateNormalizer:
+    """
+    Converts date strings in several input formats to ISO format (YYYY-MM-DD).
+
+    For every (field, source) pair the normalizer remembers the format that last parsed a
+    value and tries it first next time, so for ambiguous values such as ``01/02/2023`` the
+    learned format decides and the reading stays consistent per document source. Values
+    given without field and source always follow the priority order of ``input_formats``.
+    Results are memoized in an LRU cache keyed on the raw string and the format tried first.
+
+    Args:
+        input_formats (Optional[Sequence[str]]): Accepted input formats in priority order
+        cache_size (int): Maximum number of memoized raw strings
+    """
+
+    def __init__(self, input_formats: Optional[Sequence[str]] = None, cache_size: int = 65536):
+        self.input_formats = tuple(input_formats or DEFAULT_INPUT_FORMATS)
+        self._patterns = {fmt: format_pattern(fmt) for fmt in self.input_formats}
+        self._learned: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        self._lock = threading.Lock()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _candidate_formats(self, preferred: Optional[str]) -> Tuple[str, ...]:
+        if preferred is None:
+            return self.input_formats
+        return (preferred,) + tuple(fmt for fmt in self.input_formats if fmt != preferred)
+
+    def _parse(self, text: str, preferred: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a stripped value, returning the ISO date and the format that matched."""
+        for fmt in self._candidate_formats(preferred):
+            if not self._patterns[fmt].fullmatch(text):
+                continue
+            try:
+                return datetime.strptime(text, fmt).strftime(ISO_FORMAT), fmt
+            except ValueError:
+                continue
+        return None, None
+
+    def learned_format(self, field: Optional[str] = None, source: Optional[str] = None) -> Optional[str]:
+        """
+        Get the format that last parsed a value for a field and document source.
+
+        Args:
+            field (Optional[str]): Field name
+            source (Optional[str]): Document source, e.g. a vendor or template name
+
+        Returns:
+            Optional[str]: The learned format, or None if nothing was parsed yet
+        """
+        return self._learned.get((field, source))
+
+    def _learn(self, field: Optional[str], source: Optional[str], fmt: Optional[str]) -> None:
+        # Without a field or source there is nothing to learn for, the priority order stays fixed
+        if field is None and source is None:
+            return
+        if fmt is not None and self._learned.get((field, source)) != fmt:
+            with self._lock:
+                self._learned[(field, source)] = fmt
+
+    def normalize(self, text: str, field: Optional[str] = None, source: Optional[str] = None) -> Optional[str]:
+        """
+        Convert a date string to ISO format.
+
+        Args:
+            text (str): Input date string
+            field (Optional[str]): Field name the value belongs to
+            source (Optional[str]): Document source the value comes from
+
+        Returns:
+            Optional[str]: Standardized date string in YYYY-MM-DD format, or None if parsing fails
+        """
+        result, fmt = self._parse_cached(text.strip(), self._learned.get((field, source)))
+        self._learn(field, source, fmt)
+        return result
+
+    def normalize_series(self,
+                         values: Iterable[Optional[str]],
+                         field: Optional[str] = None,
+                         source: Optional[str] = None) -> pd.Series:
+        """
+        Convert a column of date strings to ISO format.
+
+        Each distinct value is parsed once. Formats are applied column-wise with
+        ``pd.to_datetime`` in priority order, and values no format parsed this way are
+        retried one by one, so the results equal those of ``normalize``.
+
+        Args:
+            values (Iterable[Optional[str]]): Input date strings, missing values are allowed
+            field (Optional[str]): Field name the values belong to
+            source (Optional[str]): Document source the values come from
+
+        Returns:
+            pd.Series: Standardized date strings, None where parsing failed or the value was missing
+        """
+        values = pd.Series(values, dtype=object)
+        codes, uniques = pd.factorize(values)
+        if len(uniques) == 0:
+            return pd.Series([None] * len(values), index=values.index, dtype=object)
+
+        stripped = pd.Series(uniques, dtype=object).map(lambda value: value.strip() if isinstance(value, str) else value)
+        results: List[Optional[str]] = [None] * len(stripped)
+        remaining = np.ones(len(stripped), dtype=bool)
+        parsed_counts: Dict[str, int] = {}
+
+        for fmt in self._candidate_formats(self._learned.get((field, source))):
+            if not remaining.any():
+                break
+            candidates = stripped[remaining]
+            candidates = candidates[candidates.map(lambda value: isinstance(value, str)
+                                                   and self._patterns[fmt].fullmatch(value) is not None)]
+            if candidates.empty:
+                continue
+            parsed = pd.to_datetime(candidates, format=fmt, errors='coerce')
+            parsed = parsed[parsed.notna()]
+            for position, iso in zip(parsed.index, parsed.dt.strftime(ISO_FORMAT)):
+                results[position] = iso
+            remaining[parsed.index.to_numpy()] = False
+            parsed_counts[fmt] = len(parsed)
+
+        # Values outside the datetime64 range and similar edge cases go through strptime
+        for position in np.flatnonzero(remaining):
+            if isinstance(stripped[position], str):
+                results[position], fmt = self._parse_cached(stripped[position], self._learned.get((field, source)))
+                if fmt is not None:
+                    parsed_counts[fmt] = parsed_counts.get(fmt, 0) + 1
+
+        if parsed_counts:
+            self._learn(field, source, max(parsed_counts, key=parsed_counts.get))
+
+        return pd.Series(np.append(np.array(results, dtype=object), None).take(codes),
+                         index=values.index, dtype=object)
+
+    def cache_info(self):
+        """Hit and miss statistics of the memo, see ``functools.lru_cache``."""
+        return self._parse_cached.cache_info()
+
+
+@lru_cache(maxsize=32)
+def get_date_normalizer(input_formats: Optional[Tuple[str, ...]] = None) -> DateNormalizer:
+    """
+    Get the shared normalizer for a set of input formats.
+
+    Args:
+        input_formats (Optional[Tuple[str, ...]]): Accepted input formats, defaults to ``DEFAULT_INPUT_FORMATS``
+
+    Returns:
+        DateNormalizer: The normalizer, created on first use
+    """
+    return DateNormalizer(input_formats)
@@ -1,8 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
 
-import functions.metrics
-from models.DataModels import Document, ExtractionModel
+from models.DataModels import Document, ExtractionModel, Prediction
 
 class DocumentValidator(ABC):
     """
@@ -26,6 +25,26 @@ class DocumentValidator(ABC):
         """
         pass
 
+    @staticmethod
+    def model_predictions(document: Document,
+                          extraction_model: ExtractionModel,
+                          predictions: Optional[List[Prediction]] = None) -> List[Prediction]:
+        """
+        Get the predictions of a model for a document.
+
+        Args:
+            document (Document): The document object
+            extraction_model (ExtractionModel): The extraction model
+            predictions (Optional[List[Prediction]]): Predictions already loaded for this document
+                and model, e.g. by ``run_document_validators``; used as-is to avoid a lazy load
+
+        Returns:
+            List[Prediction]: The model's predictions for the document
+        """
+        if predictions is not None:
+            return predictions
+        return [p for p in document.predictions if p.model_id == extraction_model.id]
+
 
 
 class RequiredFieldsValidator(DocumentValidator):
@@ -37,7 +56,7 @@ class RequiredFieldsValidator(DocumentValidator):
         required_fields = [field for field in document.taxonomy.fields if field.is_required]
         
         # Get all predictions for this document and model
-        predictions = [p for p in document.predictions if functions.metrics.model_id == extraction_model.id]
+        predictions = self.model_predictions(document, extraction_model, kwargs.get("predictions"))
         
         # Check that each required field has at least one prediction
         predicted_field_ids = {p.field_id for p in predictions}
@@ -53,34 +72,15 @@ class FieldTypeValidator(DocumentValidator):
     Validates that all predictions in a document match their field's data type rules.
     """
     def validate(self, document: Document, extraction_model: ExtractionModel, *args: Any, **kwargs: Any) -> bool:
-        from functions.field_validators import (
-            DecimalNumberValidator,
-            DateFormatValidator,
-            StringLengthValidator
-        )
+        from functions.validation_engine import compile_rules_cached
 
         # Get all predictions for this document and model
-        predictions = [p for p in document.predictions if functions.metrics.model_id == extraction_model.id]
+        predictions = self.model_predictions(document, extraction_model, kwargs.get("predictions"))
         
-        # Validate each prediction according to its field's data type
+        # Validate each prediction against the compiled, cached type rule of its field
         for prediction in predictions:
-            field = prediction.field
-            
-            # Select appropriate validator based on field data type
-            if field.data_type == "number":
-                validator = DecimalNumberValidator()
-                if not validator.validate(prediction):
-                    return False
-                    
-            elif field.data_type == "date":
-                validator = DateFormatValidator()
-                if not validator.validate(prediction):
-                    return False
-                    
-            elif field.data_type == "string":
-                validator = StringLengthValidator()
-                # Example: Validate string length is between 1 and 1000 characters
-                if not validator.validate(prediction, min_length=1, max_length=1000):
+            for rule in compile_rules_cached(prediction.field.data_type, None):
+                if not rule.check(prediction.value):
                     return False
         
         return True
@@ -92,7 +92,7 @@ class MissingFieldsValidator(DocumentValidator):
     """
     def validate(self, document: Document, extraction_model: ExtractionModel, *args: Any, **kwargs: Any) -> bool:
         # Get all predictions for this document and model
-        predictions = [p for p in document.predictions if functions.metrics.model_id == extraction_model.id]
+        predictions = self.model_predictions(document, extraction_model, kwargs.get("predictions"))
         
         # Get all fields from the taxonomy
         taxonomy_fields = document.taxonomy.fields if document.taxonomy else []
@@ -0,0 +1,128 @@
+from typing import Iterable, Mapping, Optional
+
+import pandas as pd
+from sqlalchemy import and_, exists, select
+from sqlalchemy.orm import Session, aliased
+
+from functions.matchers import Matcher, match_values
+from models.DataModels import ExtractionModel, FieldLabel, Prediction, TaxonomyField
+from models.validation_models import ModelEvaluationResult
+
+COMPARISON_COLUMNS = ["document_id", "field_name", "label_value", "prediction_value"]
+
+
+def load_comparison_frame(db: Session,
+                          model_id: int,
+                          document_ids: Optional[Iterable[int]] = None,
+                          matchers: Optional[Mapping[str, Matcher]] = None) -> pd.DataFrame:
+    """
+    Load all labels of a model's taxonomy alongside the model's predictions in one joined query.
+
+    Every label becomes one row; a label without a prediction gets an empty prediction value
+    and counts as a mismatch.
+
+    Args:
+        db (Session): Database session
+        model_id (int): ID of the extraction model to evaluate
+        document_ids (Optional[Iterable[int]]): Documents to evaluate. Defaults to every
+            labelled document the model has predictions for
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, see ``add_match_column``
+
+    Returns:
+        pd.DataFrame: One row per label with the columns ``document_id``, ``field_name``,
+            ``label_value``, ``prediction_value`` and a boolean ``match``
+    """
+    taxonomy_id = select(ExtractionModel.taxonomy_id).where(ExtractionModel.id == model_id).scalar_subquery()
+    stmt = (
+        select(FieldLabel.document_id,
+               FieldLabel.field_name,
+               FieldLabel.value.label("label_value"),
+               Prediction.value.label("prediction_value"))
+        .join(TaxonomyField, TaxonomyField.id == FieldLabel.field_id)
+        .outerjoin(Prediction, and_(Prediction.document_id == FieldLabel.document_id,
+                                    Prediction.field_id == FieldLabel.field_id,
+                                    Prediction.model_id == model_id))
+        .where(TaxonomyField.taxonomy_id == taxonomy_id)
+    )
+    if document_ids is not None:
+        stmt = stmt.where(FieldLabel.document_id.in_(list(document_ids)))
+    else:
+        predicted = aliased(Prediction)
+        stmt = stmt.where(exists().where(predicted.document_id == FieldLabel.document_id,
+                                         predicted.model_id == model_id))
+
+    frame = pd.DataFrame.from_records(db.execute(stmt).all(), columns=COMPARISON_COLUMNS)
+    return add_match_column(frame, matchers)
+
+
+def add_match_column(frame: pd.DataFrame, matchers: Optional[Mapping[str, Matcher]] = None) -> pd.DataFrame:
+    """
+    Fill missing predictions with an empty string and add the boolean ``match`` column.
+
+    Values are compared exactly, or with the matcher of their field, see ``functions.matchers``.
+    Calling it again on a loaded frame replaces ``match``, so matchers can be tuned without
+    reloading the labels and predictions.
+
+    Args:
+        frame (pd.DataFrame): Comparison frame with ``field_name``, ``label_value`` and ``prediction_value`` columns
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher
+
+    Returns:
+        pd.DataFrame: The same frame with ``match`` added
+    """
+    frame["prediction_value"] = frame["prediction_value"].fillna("")
+    if matchers:
+        frame["match"] = match_values(frame["field_name"].to_numpy(), frame["label_value"].to_numpy(),
+                                      frame["prediction_value"].to_numpy(), matchers)
+    else:
+        frame["match"] = frame["label_value"].to_numpy() == frame["prediction_value"].to_numpy()
+    return frame
+
+
+def compute_evaluation(frame: pd.DataFrame, model_id: int) -> ModelEvaluationResult:
+    """
+    Compute per-field accuracy, full-document correctness and overall accuracy from a comparison frame.
+
+    Overall accuracy is the mean of the per-document accuracy rates, as in ``get_overall_accuracy``.
+
+    Args:
+        frame (pd.DataFrame): Comparison frame as returned by ``load_comparison_frame``
+        model_id (int): ID of the evaluated extraction model
+
+    Returns:
+        ModelEvaluationResult: Accuracy figures in percent
+    """
+    if frame.empty:
+        return ModelEvaluationResult(model_id=model_id, sample_size=0, overall_accuracy=0.0,
+                                     perc_of_full_correct=0.0, field_accuracy={})
+
+    field_accuracy = frame.groupby("field_name", sort=True)["match"].mean() * 100
+    document_matches = frame.groupby("document_id")["match"]
+
+    return ModelEvaluationResult(
+        model_id=model_id,
+        sample_size=int(document_matches.ngroups),
+        overall_accuracy=float(document_matches.mean().mean() * 100),
+        perc_of_full_correct=float(document_matches.all().mean() * 100),
+        field_accuracy={field: float(value) for field, value in field_accuracy.items()},
+    )
+
+
+def evaluate_model(db: Session,
+                   model_id: int,
+                   document_ids: Optional[Iterable[int]] = None,
+                   matchers: Optional[Mapping[str, Matcher]] = None) -> ModelEvaluationResult:
+    """
+    Evaluate an extraction model against the labels in a single query and vectorized aggregation.
+
+    Args:
+        db (Session): Database session
+        model_id (int): ID of the extraction model to evaluate
+        document_ids (Optional[Iterable[int]]): Documents to evaluate. Defaults to every
+            labelled document the model has predictions for
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, exact comparison for other fields
+
+    Returns:
+        ModelEvaluationResult: Accuracy figures in percent
+    """
+    return compute_evaluation(load_comparison_frame(db, model_id, document_ids, matchers), model_id)
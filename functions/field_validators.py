@@ -1,15 +1,19 @@
 from abc import ABC, abstractmethod
 from models.DataModels import Prediction
-from typing import Any
+from typing import Any, Pattern, Sequence, Union
+from datetime import datetime
 import re
 
+import numpy as np
+
+from functions.trading_calendar import TRADE_DATE_FORMAT, get_calendar, parse_trade_dates
+
 class FieldValidator(ABC):
     """
     Abstract base class for field validators.
     Validates prediction values according to field type and rules.
     """
 
-    @abstractmethod
     def validate(self, prediction: Prediction, *args: Any, **kwargs: Any) -> bool:
         """
         Validate a prediction value according to the field's type and rules.
@@ -19,20 +23,50 @@ class FieldValidator(ABC):
             *args: Variable length argument list for additional validation parameters
             **kwargs: Arbitrary keyword arguments for additional validation parameters
 
+        Returns:
+            bool: True if validation passes, False otherwise
+        """
+        return self.validate_value(prediction.value, *args, **kwargs)
+
+    @abstractmethod
+    def validate_value(self, value: str, *args: Any, **kwargs: Any) -> bool:
+        """
+        Validate a raw value according to the field's type and rules.
+
+        Args:
+            value (str): The value to validate
+            *args: Variable length argument list for additional validation parameters
+            **kwargs: Arbitrary keyword arguments for additional validation parameters
+
         Returns:
             bool: True if validation passes, False otherwise
         """
         pass
 
+    def validate_values(self, values: Sequence[str], *args: Any, **kwargs: Any) -> np.ndarray:
+        """
+        Validate many raw values at once. Subclasses override this with a vectorized check where possible.
+
+        Args:
+            values (Sequence[str]): The values to validate
+            *args: Variable length argument list for additional validation parameters
+            **kwargs: Arbitrary keyword arguments for additional validation parameters
+
+        Returns:
+            np.ndarray: Boolean mask, True where validation passes
+        """
+        return np.fromiter((self.validate_value(value, *args, **kwargs) for value in values),
+                           dtype=bool, count=len(values))
+
 
 
 class DecimalNumberValidator(FieldValidator):
     """
     Validates that a prediction value is a valid decimal number.
     """
-    def validate(self, prediction: Prediction, *args: Any, **kwargs: Any) -> bool:
+    def validate_value(self, value: str, *args: Any, **kwargs: Any) -> bool:
         try:
-            float(prediction.value)
+            float(value)
             return True
         except ValueError:
             return False
@@ -42,9 +76,9 @@ class NumberRangeValidator(FieldValidator):
     """
     Validates that a numeric prediction value falls within a specified range.
     """
-    def validate(self, prediction: Prediction, min_value: float = None, max_value: float = None, *args: Any, **kwargs: Any) -> bool:
+    def validate_value(self, value: str, min_value: float = None, max_value: float = None, *args: Any, **kwargs: Any) -> bool:
         try:
-            value = float(prediction.value)
+            value = float(value)
             if min_value is not None and value < min_value:
                 return False
             if max_value is not None and value > max_value:
@@ -58,8 +92,8 @@ class StringLengthValidator(FieldValidator):
     """
     Validates that a string prediction value is within specified length limits.
     """
-    def validate(self, prediction: Prediction, max_length: int = None, min_length: int = None, *args: Any, **kwargs: Any) -> bool:
-        value_length = len(str(prediction.value))
+    def validate_value(self, value: str, max_length: int = None, min_length: int = None, *args: Any, **kwargs: Any) -> bool:
+        value_length = len(str(value))
         if max_length is not None and value_length > max_length:
             return False
         if min_length is not None and value_length < min_length:
@@ -71,10 +105,10 @@ class DateFormatValidator(FieldValidator):
     """
     Validates that a prediction value matches a specified date format.
     """
-    def validate(self, prediction: Prediction, date_format: str = "%Y-%m-%d", *args: Any, **kwargs: Any) -> bool:
+    def validate_value(self, value: str, date_format: str = "%Y-%m-%d", *args: Any, **kwargs: Any) -> bool:
         from datetime import datetime
         try:
-            datetime.strptime(prediction.value, date_format)
+            datetime.strptime(value, date_format)
             return True
         except ValueError:
             return False
@@ -84,63 +118,150 @@ class RegexValidator(FieldValidator):
     """
     Validates that a prediction value matches a specified regex pattern.
     """
-    def validate(self, prediction: Prediction, pattern: str, *args: Any, **kwargs: Any) -> bool:
+    def validate_value(self, value: str, pattern: Union[str, Pattern], *args: Any, **kwargs: Any) -> bool:
         try:
-            return bool(re.match(pattern, prediction.value))
+            return bool(re.match(pattern, value))
         except (TypeError, re.error):
             return False
 
 
 
 
+def _luhn_digit(digit: int, double: bool) -> int:
+    if not double:
+        return digit
+    doubled = digit * 2
+    return doubled - 9 if doubled > 9 else doubled
+
+
+def _digit_sum(n: int) -> int:
+    return sum(int(d) for d in str(n))
+
+
+# Character -> value lookup tables for identifier check digits (0-9 -> 0-9, A-Z -> 10-35).
+# The ISIN and CUSIP tables hold each character's contribution to the check sum by parity:
+# for ISIN the parity of the character's position counted from the right of the expanded
+# digit string (letters expand to two digits), for CUSIP the parity of its index
+_IDENTIFIER_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_CHAR_VALUES = {char: value for value, char in enumerate(_IDENTIFIER_CHARS)}
+_ISIN_CONTRIBUTIONS = tuple(
+    {char: (_luhn_digit(value, parity == 0) if value < 10 else
+            _luhn_digit(value % 10, parity == 0) + _luhn_digit(value // 10, parity == 1))
+     for char, value in _CHAR_VALUES.items()}
+    for parity in (0, 1)
+)
+# Whether a character flips the parity of the characters to its left (digits take one position, letters two)
+_ISIN_PARITY_FLIPS = {char: int(value < 10) for char, value in _CHAR_VALUES.items()}
+_CUSIP_CONTRIBUTIONS = tuple(
+    {char: _digit_sum(value * (2 if parity else 1)) for char, value in _CHAR_VALUES.items()}
+    for parity in (0, 1)
+)
+
+
+def _code_table(mapping: dict, default: int = 0) -> np.ndarray:
+    table = np.full(128, default, dtype=np.int16)
+    for char, value in mapping.items():
+        table[ord(char)] = value
+    return table
+
+
+_CHAR_VALUE_TABLE = _code_table(_CHAR_VALUES, default=-1)
+_IS_ALPHA_TABLE = _CHAR_VALUE_TABLE >= 10
+_IS_ALNUM_TABLE = _CHAR_VALUE_TABLE >= 0
+_ISIN_WIDTH_TABLE = _code_table({char: 1 if value < 10 else 2 for char, value in _CHAR_VALUES.items()})
+_ISIN_CONTRIBUTION_TABLE = np.stack([_code_table(contributions) for contributions in _ISIN_CONTRIBUTIONS])
+_CUSIP_CONTRIBUTION_TABLE = np.stack([_code_table(contributions) for contributions in _CUSIP_CONTRIBUTIONS])
+
+
+def _normalize_identifier(value: Any, length: int) -> Union[str, None]:
+    if not isinstance(value, str):
+        return None
+    identifier = value.strip().upper()
+    if len(identifier) != length or not identifier.isascii():
+        return None
+    return identifier
+
+
+def _identifier_codes(values: Sequence[str], length: int):
+    """
+    Normalize identifiers and pack those of the right length into a matrix of ASCII codes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Positions of the packed values and their (n, length) uint8 codes
+    """
+    normalized = [_normalize_identifier(value, length) for value in values]
+    positions = np.fromiter((identifier is not None for identifier in normalized), dtype=bool, count=len(normalized))
+    positions = np.flatnonzero(positions)
+    packed = "".join(normalized[i] for i in positions).encode("ascii")
+    return positions, np.frombuffer(packed, dtype=np.uint8).reshape(-1, length)
+
+
+def is_valid_isin(value: str) -> bool:
+    """
+    Check an ISIN's format and Luhn check digit.
+
+    Args:
+        value (str): Candidate ISIN, surrounding whitespace and case are ignored
+
+    Returns:
+        bool: True if the value is a valid ISIN
+    """
+    isin = _normalize_identifier(value, 12)
+    if isin is None or not (isin[:2].isalpha() and isin[2:11].isalnum() and isin[11].isdigit()):
+        return False
+    total = 0
+    parity = 0
+    for char in reversed(isin[:11]):
+        total += _ISIN_CONTRIBUTIONS[parity][char]
+        parity ^= _ISIN_PARITY_FLIPS[char]
+    return (10 - total % 10) % 10 == _CHAR_VALUES[isin[11]]
+
+
+def is_valid_cusip(value: str) -> bool:
+    """
+    Check a CUSIP's format and modulus-10 check digit.
+
+    Args:
+        value (str): Candidate CUSIP, surrounding whitespace and case are ignored
+
+    Returns:
+        bool: True if the value is a valid CUSIP
+    """
+    cusip = _normalize_identifier(value, 9)
+    if cusip is None or not (cusip[:8].isalnum() and cusip[8].isdigit()):
+        return False
+    total = 0
+    for i, char in enumerate(cusip[:8]):
+        total += _CUSIP_CONTRIBUTIONS[i % 2][char]
+    return (10 - total % 10) % 10 == _CHAR_VALUES[cusip[8]]
+
+
 class ISINValidator(FieldValidator):
     """
     Validates that a prediction value is a valid ISIN (International Securities Identification Number).
     ISIN format: 2 letters (country code) + 9 alphanumeric chars + 1 check digit
     """
-    def validate(self, prediction: Prediction, *args: Any, **kwargs: Any) -> bool:
-        # Basic format check
-        if not isinstance(prediction.value, str):
-            return False
-            
-        isin = prediction.value.strip().upper()
-        if len(isin) != 12:
-            return False
-            
-        # Check country code (first 2 chars are letters)
-        if not isin[:2].isalpha():
-            return False
-            
-        # Check middle 9 chars are alphanumeric
-        if not isin[2:-1].isalnum():
-            return False
-            
-        # Validate check digit
-        try:
-            # Convert letters to numbers (A=10, B=11, etc)
-            values = []
-            for char in isin[:-1]:
-                if char.isalpha():
-                    values.append(str(ord(char) - ord('A') + 10))
-                else:
-                    values.append(char)
-                    
-            # Double alternate digits from right to left
-            num = ''.join(values)
-            total = 0
-            for i, digit in enumerate(reversed(num)):
-                n = int(digit)
-                if i % 2 == 0:
-                    n *= 2
-                    if n > 9:
-                        n -= 9
-                total += n
-                
-            check_digit = (10 - (total % 10)) % 10
-            return str(check_digit) == isin[-1]
-            
-        except (ValueError, TypeError):
-            return False
+    def validate_value(self, value: str, *args: Any, **kwargs: Any) -> bool:
+        return is_valid_isin(value)
+
+    def validate_values(self, values: Sequence[str], *args: Any, **kwargs: Any) -> np.ndarray:
+        result = np.zeros(len(values), dtype=bool)
+        positions, codes = _identifier_codes(values, 12)
+        if not len(positions):
+            return result
+
+        payload = codes[:, :11]
+        well_formed = (_IS_ALPHA_TABLE[codes[:, :2]].all(axis=1)
+                       & _IS_ALNUM_TABLE[codes[:, 2:11]].all(axis=1))
+
+        # Position of each character's last expanded digit, counted from the right
+        widths = _ISIN_WIDTH_TABLE[payload]
+        offsets = np.cumsum(widths[:, ::-1], axis=1)[:, ::-1] - widths
+        total = _ISIN_CONTRIBUTION_TABLE[offsets & 1, payload].sum(axis=1)
+
+        check_digit = (10 - total % 10) % 10
+        result[positions] = well_formed & (check_digit == _CHAR_VALUE_TABLE[codes[:, 11]])
+        return result
 
 
 class CUSIPValidator(FieldValidator):
@@ -148,69 +269,36 @@ class CUSIPValidator(FieldValidator):
     Validates that a prediction value is a valid CUSIP (Committee on Uniform Security Identification Procedures).
     CUSIP format: 9 characters - first 6 are alphanumeric issuer code, 2 alphanumeric issue number, 1 check digit
     """
-    def validate(self, prediction: Prediction, *args: Any, **kwargs: Any) -> bool:
-        if not isinstance(prediction.value, str):
-            return False
-            
-        cusip = prediction.value.strip().upper()
-        if len(cusip) != 9:
-            return False
-            
-        # Check first 8 chars are alphanumeric
-        if not cusip[:-1].isalnum():
-            return False
-            
-        try:
-            # Convert letters to numbers (A=10, B=11, etc)
-            values = []
-            for char in cusip[:-1]:
-                if char.isalpha():
-                    values.append(str(ord(char) - ord('A') + 10))
-                else:
-                    values.append(char)
-                    
-            # Calculate weighted sum
-            total = 0
-            for i, digit in enumerate(values):
-                n = int(digit)
-                if i % 2 == 1:
-                    n *= 2
-                total += sum(int(d) for d in str(n))
-                
-            check_digit = (10 - (total % 10)) % 10
-            return str(check_digit) == cusip[-1]
-            
-        except (ValueError, TypeError):
-            return False
+    def validate_value(self, value: str, *args: Any, **kwargs: Any) -> bool:
+        return is_valid_cusip(value)
+
+    def validate_values(self, values: Sequence[str], *args: Any, **kwargs: Any) -> np.ndarray:
+        result = np.zeros(len(values), dtype=bool)
+        positions, codes = _identifier_codes(values, 9)
+        if not len(positions):
+            return result
+
+        payload = codes[:, :8]
+        well_formed = _IS_ALNUM_TABLE[payload].all(axis=1)
+        parities = np.arange(8) % 2
+        total = _CUSIP_CONTRIBUTION_TABLE[parities, payload].sum(axis=1)
+
+        check_digit = (10 - total % 10) % 10
+        result[positions] = well_formed & (check_digit == _CHAR_VALUE_TABLE[codes[:, 8]])
+        return result
 
 
 class TradeDateValidator(FieldValidator):
     """
-    Validates that a prediction value is a valid trade date (not weekend or major US holiday).
+    Validates that a prediction value is a valid trade date (a YYYY-MM-DD day the market is open).
+    Markets and their holiday rules are defined in ``functions.trading_calendar``.
     """
-    def validate(self, prediction: Prediction, *args: Any, **kwargs: Any) -> bool:
-        from datetime import datetime
-        
+    def validate_value(self, value: str, market: str = "US", *args: Any, **kwargs: Any) -> bool:
         try:
-            # First validate basic date format
-            date = datetime.strptime(prediction.value, "%Y-%m-%d")
-            
-            # Check if weekend
-            if date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                return False
-                
-            # Major US holidays (simplified list)
-            holidays = [
-                (1, 1),    # New Year's Day
-                (7, 4),    # Independence Day
-                (12, 25),  # Christmas
-            ]
-            
-            if (date.month, date.day) in holidays:
-                return False
-                
-            return True
-            
-        except ValueError:
+            date = datetime.strptime(value, TRADE_DATE_FORMAT).date()
+        except (TypeError, ValueError):
             return False
+        return get_calendar(market).is_trading_day(date)
 
+    def validate_values(self, values: Sequence[str], market: str = "US", *args: Any, **kwargs: Any) -> np.ndarray:
+        return get_calendar(market).is_trading_day_many(parse_trade_dates(values, TRADE_DATE_FORMAT))
@@ -0,0 +1,388 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from functions.date_normalization import get_date_normalizer
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+    from rapidfuzz.process import cpdist as _rapidfuzz_cpdist
+except ImportError:  # The pure Python distance below gives the same scores, only slower
+    _rapidfuzz_levenshtein = None
+    _rapidfuzz_cpdist = None
+
+# Slack for similarities on the threshold, e.g. 1 - 3/15 against 0.8, which float rounding would reject
+SIMILARITY_EPSILON = 1e-6
+
+
+def _per_distinct(values: Sequence[Optional[str]], convert: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Apply a column-wise conversion once per distinct value, missing values stay missing."""
+    values = pd.Series(values, dtype=object)
+    codes, uniques = pd.factorize(values)
+    converted = convert(pd.Series(uniques, dtype=object)).to_numpy(object)
+    return pd.Series(np.append(converted, None).take(codes), index=values.index, dtype=object)
+
+
+def normalize_text(values: Sequence[Optional[str]],
+                   case_sensitive: bool = False,
+                   strip_punctuation: bool = False) -> pd.Series:
+    """
+    Normalize strings for comparison: Unicode NFKC, whitespace runs collapsed to one space and
+    trimmed, casefolded and optionally without punctuation. Missing values become empty strings.
+
+    Args:
+        values (Sequence[Optional[str]]): Values to normalize
+        case_sensitive (bool): Keep the case of the values
+        strip_punctuation (bool): Remove characters that are neither word characters nor whitespace
+
+    Returns:
+        pd.Series: The normalized values
+    """
+    def convert(uniques: pd.Series) -> pd.Series:
+        text = uniques.astype(str).str.normalize("NFKC")
+        if strip_punctuation:
+            text = text.str.replace(r"[^\w\s]", "", regex=True)
+        text = text.str.replace(r"\s+", " ", regex=True).str.strip()
+        return text if case_sensitive else text.str.casefold()
+
+    return _per_distinct(values, convert).fillna("")
+
+
+def parse_numbers(values: Sequence[Optional[str]], decimal: str = ".", thousands: Optional[str] = ",") -> pd.Series:
+    """
+    Parse formatted numbers such as ``"1,234.50"``, ``"USD 99"``, ``"12 %"``, ``"-$5"`` or ``"(300)"``.
+
+    Thousands separators are dropped and the value must hold exactly one number, with only
+    currency symbols, codes and units around it; parentheses or a minus sign mean a negative
+    number. Values such as ``"2023-01-05"``, ``"12-34"`` or ``"(-5)"`` are not numbers.
+
+    Args:
+        values (Sequence[Optional[str]]): Values to parse
+        decimal (str): Decimal separator
+        thousands (Optional[str]): Thousands separator
+
+    Returns:
+        pd.Series: Float values, NaN where a value is not a single number
+    """
+    separator = re.escape(decimal)
+    pattern = (rf"^(?P<open>\()?(?P<sign>[-+])?[^\d()+\-{separator}]*"
+               rf"(?P<number>[-+]?(?:\d+(?:{separator}\d+)?|{separator}\d+)(?:[eE][-+]?\d+)?)"
+               rf"[^\d()]*(?P<close>\))?$")
+
+    def convert(uniques: pd.Series) -> pd.Series:
+        text = uniques.astype(str).str.strip()
+        if thousands:
+            text = text.str.replace(thousands, "", regex=False)
+        numbers = np.full(len(text), np.nan)
+        if decimal == ".":
+            numbers = pd.to_numeric(text, errors="coerce").to_numpy(float, copy=True)
+        # Only the values that are not plain numbers go through the pattern
+        formatted = np.flatnonzero(~np.isfinite(numbers))
+        if len(formatted):
+            parts = text.iloc[formatted].str.extract(pattern)
+            number = parts["number"]
+            if decimal != ".":
+                number = number.str.replace(decimal, ".", regex=False)
+            parsed = pd.to_numeric(number, errors="coerce").to_numpy(float)
+
+            parenthesized = parts["open"].notna().to_numpy(bool)
+            signed_number = number.str.match(r"[-+]", na=False).to_numpy(bool)
+            signs = parenthesized.astype(int) + parts["sign"].notna().to_numpy(int) + signed_number
+            # A sign inside parentheses or before the currency and the number again is ambiguous
+            invalid = (parenthesized != parts["close"].notna().to_numpy(bool)) | (signs > 1)
+            negative = parenthesized | (parts["sign"] == "-").to_numpy(bool)
+            numbers[formatted] = np.where(invalid, np.nan, np.where(negative, -parsed, parsed))
+        return pd.Series(numbers, dtype=object)
+
+    return pd.to_numeric(_per_distinct(values, convert), errors="coerce")
+
+
+def levenshtein_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance of two strings, giving up once it exceeds ``max_distance``.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_distance (Optional[int]): Distance beyond which the exact value is not needed
+
+    Returns:
+        int: The distance, or ``max_distance + 1`` if it is larger than ``max_distance``
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        # Row minima never decrease, so the distance cannot come back under the cutoff
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def similarity_scores(labels: Sequence[str], predictions: Sequence[str], score_cutoff: float = 0.0) -> np.ndarray:
+    """
+    Normalized Levenshtein similarity, ``1 - distance / max(len)``, of each label and prediction pair.
+
+    With RapidFuzz installed the pairs are scored by its C implementation across all cores,
+    otherwise in Python; both stop computing a distance once the similarity falls below the
+    cutoff.
+
+    Args:
+        labels (Sequence[str]): Label values
+        predictions (Sequence[str]): Prediction values, paired with the labels by position
+        score_cutoff (float): Similarity below which a pair scores 0
+
+    Returns:
+        np.ndarray: Similarities between 0 and 1
+    """
+    if len(labels) == 0:
+        return np.zeros(0)
+    if _rapidfuzz_cpdist is not None:
+        return _rapidfuzz_cpdist(labels, predictions, scorer=_rapidfuzz_levenshtein.normalized_similarity,
+                                 score_cutoff=max(0.0, score_cutoff - SIMILARITY_EPSILON), dtype=np.float64,
+                                 workers=-1)
+
+    scores = np.zeros(len(labels))
+    for i, (label, prediction) in enumerate(zip(labels, predictions)):
+        length = max(len(label), len(prediction))
+        if length == 0:
+            scores[i] = 1.0
+            continue
+        max_distance = int((1 - score_cutoff) * length + SIMILARITY_EPSILON)
+        distance = levenshtein_distance(label, prediction, max_distance)
+        if distance <= max_distance:
+            scores[i] = 1 - distance / length
+    return scores
+
+
+class Matcher(ABC):
+    """
+    Decides whether predictions match their labels, for a batch of value pairs at a time.
+
+    Subclasses implement ``match``; calling a matcher compares a single pair.
+    """
+
+    @abstractmethod
+    def match(self, labels: Sequence[Optional[str]], predictions: Sequence[Optional[str]]) -> np.ndarray:
+        """
+        Compare label and prediction values pairwise.
+
+        Args:
+            labels (Sequence[Optional[str]]): Label values
+            predictions (Sequence[Optional[str]]): Prediction values, paired with the labels by position
+
+        Returns:
+            np.ndarray: Boolean match per pair
+        """
+        pass
+
+    def __call__(self, label: Optional[str], prediction: Optional[str]) -> bool:
+        return bool(self.match([label], [prediction])[0])
+
+
+class ExactMatcher(Matcher):
+    """Exact string equality, the default comparison of labels and predictions."""
+
+    def match(self, labels, predictions) -> np.ndarray:
+        return np.asarray(labels, dtype=object) == np.asarray(predictions, dtype=object)
+
+
+class NormalizedExactMatcher(Matcher):
+    """
+    Equality after ``normalize_text``, ignoring whitespace and, by default, case differences.
+
+    Args:
+        case_sensitive (bool): Keep the case of the values
+        strip_punctuation (bool): Ignore punctuation
+    """
+
+    def __init__(self, case_sensitive: bool = False, strip_punctuation: bool = False):
+        self.case_sensitive = case_sensitive
+        self.strip_punctuation = strip_punctuation
+
+    def match(self, labels, predictions) -> np.ndarray:
+        return (normalize_text(labels, self.case_sensitive, self.strip_punctuation).to_numpy()
+                == normalize_text(predictions, self.case_sensitive, self.strip_punctuation).to_numpy())
+
+
+def _match_unparsed(result: np.ndarray, parsed: np.ndarray, labels, predictions) -> np.ndarray:
+    """Compare the pairs a typed matcher could not parse with ``NormalizedExactMatcher``."""
+    result = result & parsed
+    unparsed = np.flatnonzero(~parsed)
+    if len(unparsed):
+        result[unparsed] = NormalizedExactMatcher().match(np.asarray(labels, dtype=object)[unparsed],
+                                                          np.asarray(predictions, dtype=object)[unparsed])
+    return result
+
+
+class NumericToleranceMatcher(Matcher):
+    """
+    Numbers equal within a tolerance, whatever their formatting, see ``parse_numbers``.
+
+    Two numbers match when ``|a - b| <= max(abs_tol, rel_tol * max(|a|, |b|))``. Pairs where
+    either value holds no number are compared with ``NormalizedExactMatcher``.
+
+    Args:
+        abs_tol (float): Absolute tolerance
+        rel_tol (float): Tolerance relative to the larger magnitude
+        decimal (str): Decimal separator
+        thousands (Optional[str]): Thousands separator
+    """
+
+    def __init__(self, abs_tol: float = 0.0, rel_tol: float = 0.0, decimal: str = ".", thousands: Optional[str] = ","):
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self.decimal = decimal
+        self.thousands = thousands
+
+    def match(self, labels, predictions) -> np.ndarray:
+        a = parse_numbers(labels, self.decimal, self.thousands).to_numpy(float)
+        b = parse_numbers(predictions, self.decimal, self.thousands).to_numpy(float)
+        parsed = ~np.isnan(a) & ~np.isnan(b)
+        tolerance = np.maximum(self.abs_tol, self.rel_tol * np.maximum(np.abs(a), np.abs(b)))
+        with np.errstate(invalid="ignore"):
+            result = np.abs(a - b) <= tolerance
+        return _match_unparsed(result, parsed, labels, predictions)
+
+
+class DateMatcher(Matcher):
+    """
+    Dates equal once converted to ISO format by the shared ``DateNormalizer``, so that
+    ``03/15/2023`` matches ``2023-03-15``. Pairs where either value is not a date in one of the
+    input formats are compared with ``NormalizedExactMatcher``.
+
+    Args:
+        input_formats (Optional[Sequence[str]]): Accepted input formats in priority order
+    """
+
+    def __init__(self, input_formats: Optional[Sequence[str]] = None):
+        self.normalizer = get_date_normalizer(tuple(input_formats) if input_formats else None)
+
+    def match(self, labels, predictions) -> np.ndarray:
+        a = self.normalizer.normalize_series(labels).to_numpy(object)
+        b = self.normalizer.normalize_series(predictions).to_numpy(object)
+        parsed = pd.notna(a) & pd.notna(b)
+        return _match_unparsed(a == b, parsed, labels, predictions)
+
+
+class SimilarityMatcher(Matcher):
+    """
+    Normalized Levenshtein similarity of at least ``threshold``, see ``similarity_scores``.
+
+    Values are compared after ``normalize_text``. With ``method="token_sort"`` the words of
+    each value are sorted first, so word order does not count. Equal values are not scored and
+    every distinct pair is scored once.
+
+    Args:
+        threshold (float): Minimum similarity between 0 and 1 for a match
+        method (str): "levenshtein" or "token_sort"
+        case_sensitive (bool): Keep the case of the values
+
+    Raises:
+        ValueError: If the method is unknown or the threshold is outside 0 to 1
+    """
+    METHODS = ("levenshtein", "token_sort")
+
+    def __init__(self, threshold: float = 0.9, method: str = "levenshtein", case_sensitive: bool = False):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown similarity method '{method}', expected one of {self.METHODS}")
+        if not 0 <= threshold <= 1:
+            raise ValueError(f"Similarity threshold must be between 0 and 1, got {threshold}")
+        self.threshold = threshold
+        self.method = method
+        self.case_sensitive = case_sensitive
+
+    def _prepare(self, values) -> np.ndarray:
+        text = normalize_text(values, self.case_sensitive)
+        if self.method == "token_sort":
+            text = _per_distinct(text, lambda uniques: uniques.str.split().map(sorted).str.join(" "))
+        return text.to_numpy(object)
+
+    def match(self, labels, predictions) -> np.ndarray:
+        a, b = self._prepare(labels), self._prepare(predictions)
+        result = a == b
+        unequal = np.flatnonzero(~result)
+        if len(unequal):
+            codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([a[unequal], b[unequal]]))
+            scores = similarity_scores(list(pairs.get_level_values(0)), list(pairs.get_level_values(1)),
+                                       score_cutoff=self.threshold)
+            result[unequal] = scores[codes] >= self.threshold - SIMILARITY_EPSILON
+        return result
+
+
+# Matchers by TaxonomyField.data_type, see matchers_for_data_types
+DATA_TYPE_MATCHERS: Dict[str, Callable[[], Matcher]] = {
+    "string": NormalizedExactMatcher,
+    "number": NumericToleranceMatcher,
+    "date": DateMatcher,
+    "trade_date": DateMatcher,
+}
+
+
+def matchers_for_data_types(data_types: Mapping[str, str],
+                            overrides: Optional[Mapping[str, Matcher]] = None) -> Dict[str, Matcher]:
+    """
+    Pick a matcher for every field from its data type, e.g. from ``taxonomy_cache.get(db, taxonomy_id).data_types``.
+
+    Strings are compared normalized, numbers with ``NumericToleranceMatcher`` and dates with
+    ``DateMatcher``; fields of other types keep the exact comparison.
+
+    Args:
+        data_types (Mapping[str, str]): Field name to data type
+        overrides (Optional[Mapping[str, Matcher]]): Matchers of particular fields, taking precedence
+
+    Returns:
+        Dict[str, Matcher]: Field name to matcher
+    """
+    matchers = {field_name: DATA_TYPE_MATCHERS[data_type]()
+                for field_name, data_type in data_types.items() if data_type in DATA_TYPE_MATCHERS}
+    matchers.update(overrides or {})
+    return matchers
+
+
+def match_values(field_names: Sequence[str],
+                 labels: Sequence[Optional[str]],
+                 predictions: Sequence[Optional[str]],
+                 matchers: Optional[Mapping[str, Matcher]] = None,
+                 default: Optional[Matcher] = None) -> np.ndarray:
+    """
+    Compare label and prediction values with the matcher of each value's field.
+
+    Each field's values are matched as one batch.
+
+    Args:
+        field_names (Sequence[str]): Field name of each pair
+        labels (Sequence[Optional[str]]): Label values
+        predictions (Sequence[Optional[str]]): Prediction values, paired with the labels by position
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher
+        default (Optional[Matcher]): Matcher of the fields without one, exact equality by default
+
+    Returns:
+        np.ndarray: Boolean match per pair
+    """
+    labels = np.asarray(labels, dtype=object)
+    predictions = np.asarray(predictions, dtype=object)
+    result = np.zeros(len(labels), dtype=bool)
+    remaining = np.ones(len(labels), dtype=bool)
+    if matchers:
+        field_names = np.asarray(field_names, dtype=object)
+        for field_name, matcher in matchers.items():
+            selected = field_names == field_name
+            if selected.any():
+                result[selected] = matcher.match(labels[selected], predictions[selected])
+                remaining &= ~selected
+    if remaining.any():
+        result[remaining] = (default or ExactMatcher()).match(labels[remaining], predictions[remaining])
+    return result
@@ -1,7 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional
 
 from requests import Session
 
+from functions.matchers import Matcher, match_values
 from models.DataModels import FieldLabel
 from models.validation_models import FieldComparisonResult, DocumentComparisonResult
 from services.extractions import get_predictions_for_document_and_model
@@ -9,7 +10,8 @@ from services.extractions import get_predictions_for_document_and_model
 
 def compare_labels_and_predictions(db: Session,
                                    document_id: int,
-                                   model_id: int) -> DocumentComparisonResult:
+                                   model_id: int,
+                                   matchers: Optional[Mapping[str, Matcher]] = None) -> DocumentComparisonResult:
     """
     Compare document's labels and predictions from a specified model.
 
@@ -17,6 +19,8 @@ def compare_labels_and_predictions(db: Session,
         db (Session): Database session
         document_id (int): ID of the document to compare
         model_id (int): ID of the extraction model to use for predictions
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, exact comparison for
+            other fields, see ``functions.matchers``
 
     Returns:
         Dict[str, bool]: A dictionary with field names as keys and a boolean indicating match status as values
@@ -32,17 +36,18 @@ def compare_labels_and_predictions(db: Session,
 
     dcr = DocumentComparisonResult(document_id=document_id, model_id=model_id, field_results={})
 
-    # Compare each field label with the corresponding prediction
-    for label in field_labels:
-        field_name = label.field_name
-        label_value = label.value
-
-        # Check if the field exists in predictions and compare values
-        f = FieldComparisonResult(field_name=field_name,
-                                  label_value=label_value,
-                                  prediction_value=prediction_map[field_name] if field_name in prediction_map else "",
-                                  match=(prediction_map[field_name] == label_value))
-        dcr.field_results[field_name] = f
+    # Compare each field label with the corresponding prediction, a missing one compares as an empty string
+    prediction_values = [prediction_map.get(label.field_name, "") for label in field_labels]
+    matches = match_values([label.field_name for label in field_labels],
+                           [label.value for label in field_labels],
+                           prediction_values,
+                           matchers)
+    for label, prediction_value, match in zip(field_labels, prediction_values, matches):
+        f = FieldComparisonResult(field_name=label.field_name,
+                                  label_value=label.value,
+                                  prediction_value=prediction_value,
+                                  match=bool(match))
+        dcr.field_results[label.field_name] = f
     return dcr
 
 
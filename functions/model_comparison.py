@@ -0,0 +1,320 @@
+import argparse
+import html
+import os
+import time
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from functions.evaluation import add_match_column
+from functions.matchers import Matcher
+from models.DataModels import ExtractionModel, FieldLabel, Prediction, TaxonomyField
+from models.validation_models import ModelComparisonEntry, ModelComparisonReport
+
+# Bootstrap resamples are drawn in chunks of about this many document weights, to bound memory
+BOOTSTRAP_CHUNK_CELLS = 5_000_000
+
+
+def load_model_matches(db: Session,
+                       models: Sequence[ExtractionModel],
+                       document_ids: Optional[Iterable[int]] = None,
+                       matchers: Optional[Mapping[str, Matcher]] = None) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Load the labels of the models' taxonomy and match the predictions of every model against them.
+
+    The labels are read with one query and the predictions of all models with a second one;
+    predictions are aligned to their labels by sorted ``(document_id, field_id)`` keys, and each
+    model's column is matched with ``add_match_column``, so a label without a prediction counts
+    as a mismatch, as in ``evaluate_model``.
+
+    Args:
+        db (Session): Database session
+        models (Sequence[ExtractionModel]): Models to compare, all of the same taxonomy
+        document_ids (Optional[Iterable[int]]): Documents to compare on, e.g. a holdout set.
+            Defaults to every labelled document all of the models have predictions for, so the
+            models are scored on the same documents
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, exact comparison for other fields
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray]: One row per label with ``document_id``, ``field_name`` and
+            ``label_value``, and a boolean matrix with a row per label and a column per model
+    """
+    model_ids = [model.id for model in models]
+    stmt = (
+        select(FieldLabel.document_id, FieldLabel.field_id, FieldLabel.field_name, FieldLabel.value)
+        .join(TaxonomyField, TaxonomyField.id == FieldLabel.field_id)
+        .where(TaxonomyField.taxonomy_id == models[0].taxonomy_id)
+    )
+    prediction_stmt = select(Prediction.document_id, Prediction.field_id, Prediction.model_id, Prediction.value) \
+        .where(Prediction.model_id.in_(model_ids))
+    if document_ids is not None:
+        document_ids = list(document_ids)
+        stmt = stmt.where(FieldLabel.document_id.in_(document_ids))
+        prediction_stmt = prediction_stmt.where(Prediction.document_id.in_(document_ids))
+    else:
+        # A document some model has no predictions for would count as all mismatches for that model
+        predicted_by_all = (
+            select(Prediction.document_id)
+            .where(Prediction.model_id.in_(model_ids))
+            .group_by(Prediction.document_id)
+            .having(func.count(distinct(Prediction.model_id)) == len(set(model_ids)))
+        )
+        stmt = stmt.where(FieldLabel.document_id.in_(predicted_by_all))
+
+    # Executed on the connection, millions of prediction rows skip the ORM row processing
+    connection = db.connection()
+    labels = pd.DataFrame.from_records(connection.execute(stmt).all(),
+                                       columns=["document_id", "field_id", "field_name", "label_value"])
+    predictions = pd.DataFrame.from_records(connection.execute(prediction_stmt).all(),
+                                            columns=["document_id", "field_id", "model_id", "prediction_value"])
+    matches = np.zeros((len(labels), len(models)), dtype=bool)
+    if labels.empty:
+        return labels.drop(columns="field_id"), matches
+
+    # (document_id, field_id) is unique per label, see uq_document_field
+    stride = int(max(labels["field_id"].max(), predictions["field_id"].max() if len(predictions) else 0)) + 1
+    label_keys = labels["document_id"].to_numpy(np.int64) * stride + labels["field_id"].to_numpy(np.int64)
+    prediction_keys = predictions["document_id"].to_numpy(np.int64) * stride + predictions["field_id"].to_numpy(np.int64)
+    order = np.argsort(label_keys)
+    positions = np.minimum(np.searchsorted(label_keys[order], prediction_keys), len(order) - 1)
+    found = label_keys[order][positions] == prediction_keys
+    label_index = order[positions]
+
+    prediction_model_ids = predictions["model_id"].to_numpy()
+    prediction_values = predictions["prediction_value"].to_numpy(object)
+    for column, model_id in enumerate(model_ids):
+        selected = found & (prediction_model_ids == model_id)
+        values = np.full(len(labels), None, dtype=object)
+        values[label_index[selected]] = prediction_values[selected]
+        frame = labels[["document_id", "field_name", "label_value"]].assign(prediction_value=values)
+        matches[:, column] = add_match_column(frame, matchers)["match"].to_numpy(bool)
+    return labels.drop(columns="field_id"), matches
+
+
+def _percentile_interval(samples: np.ndarray, confidence_level: float) -> np.ndarray:
+    """Percentile bootstrap interval along the first axis, ignoring resamples without data."""
+    tail = (1 - confidence_level) / 2 * 100
+    return np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+
+
+def compare_models(db: Session,
+                   model_ids: Sequence[int],
+                   document_ids: Optional[Iterable[int]] = None,
+                   bootstrap_samples: int = 1000,
+                   confidence_level: float = 0.95,
+                   seed: Optional[int] = 0,
+                   matchers: Optional[Mapping[str, Matcher]] = None) -> ModelComparisonReport:
+    """
+    Compare extraction models of the same taxonomy on the same documents.
+
+    The first model is the baseline. For every model the report holds the figures of
+    ``evaluate_model`` (per-field accuracy, overall accuracy as the mean of the per-document
+    accuracy rates, and the share of fully correct documents) and their differences to the
+    baseline in percentage points. Per-document accuracy rates give a win/tie matrix: how many
+    documents each model extracts better than, or as well as, each other model.
+
+    Confidence intervals come from a paired bootstrap over documents: every resample weights
+    the documents by how often they were drawn and applies the same weights to all models, so
+    the delta intervals account for the models being scored on the same documents. The
+    resamples are drawn in chunks and reduced with matrix products, without a loop per
+    document or per model.
+
+    Args:
+        db (Session): Database session
+        model_ids (Sequence[int]): IDs of the extraction models, the baseline first
+        document_ids (Optional[Iterable[int]]): Documents to compare on, e.g. a holdout set.
+            Defaults to every labelled document all of the models have predictions for
+        bootstrap_samples (int): Number of bootstrap resamples
+        confidence_level (float): Coverage of the confidence intervals
+        seed (Optional[int]): Seed of the resampling, for reproducible intervals
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, exact comparison for other fields
+
+    Returns:
+        ModelComparisonReport: Per-model figures, deltas to the baseline with their intervals, and
+            the win/tie matrices
+
+    Raises:
+        ValueError: If fewer than two models are given, a model does not exist, the models
+            belong to different taxonomies or there are no labelled documents to compare on
+    """
+    started = time.perf_counter()
+    model_ids = list(dict.fromkeys(model_ids))
+    if len(model_ids) < 2:
+        raise ValueError("At least two extraction models are needed for a comparison")
+    models = {model.id: model for model in db.scalars(select(ExtractionModel).where(ExtractionModel.id.in_(model_ids)))}
+    missing = [model_id for model_id in model_ids if model_id not in models]
+    if missing:
+        raise ValueError(f"Extraction models with IDs {missing} not found")
+    models = [models[model_id] for model_id in model_ids]
+    if len({model.taxonomy_id for model in models}) > 1:
+        raise ValueError("Only extraction models of the same taxonomy can be compared")
+
+    labels, matches = load_model_matches(db, models, document_ids, matchers)
+    if labels.empty:
+        raise ValueError(f"No labelled documents with predictions of the models {model_ids}")
+    document_codes, document_index = pd.factorize(labels["document_id"])
+    field_codes, field_names = pd.factorize(labels["field_name"], sort=True)
+    n_documents, n_fields, n_models = len(document_index), len(field_names), len(models)
+
+    # Per-document and per-field match counts; a document has at most one label per field
+    label_counts = np.zeros((n_documents, n_fields), dtype=np.float32)
+    label_counts[document_codes, field_codes] = 1
+    field_matches = np.zeros((n_documents, n_fields, n_models), dtype=np.float32)
+    field_matches[document_codes, field_codes] = matches
+    document_rates = field_matches.sum(axis=1, dtype=np.float64) / label_counts.sum(axis=1, dtype=np.float64)[:, None]
+
+    overall_accuracy = document_rates.mean(axis=0) * 100
+    perc_of_full_correct = (document_rates == 1).mean(axis=0) * 100
+    field_accuracy = field_matches.sum(axis=0, dtype=np.float64) / label_counts.sum(axis=0, dtype=np.float64)[:, None] * 100
+    wins = (document_rates[:, :, None] > document_rates[:, None, :]).sum(axis=0)
+    ties = (document_rates[:, :, None] == document_rates[:, None, :]).sum(axis=0)
+
+    rng = np.random.default_rng(seed)
+    boot_overall = np.empty((bootstrap_samples, n_models))
+    boot_field = np.empty((bootstrap_samples, n_fields, n_models))
+    chunk = max(1, BOOTSTRAP_CHUNK_CELLS // n_documents)
+    flat_matches = field_matches.reshape(n_documents, n_fields * n_models)
+    for start in range(0, bootstrap_samples, chunk):
+        size = min(chunk, bootstrap_samples - start)
+        # How often each document is drawn in each resample
+        draws = rng.integers(0, n_documents, size=(size, n_documents)) + (np.arange(size) * n_documents)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=size * n_documents).reshape(size, n_documents)
+        weights = weights.astype(np.float32)
+        boot_overall[start:start + size] = weights @ document_rates / n_documents * 100
+        with np.errstate(invalid="ignore", divide="ignore"):
+            boot_field[start:start + size] = ((weights @ flat_matches).reshape(size, n_fields, n_models)
+                                              / (weights @ label_counts)[:, :, None] * 100)
+
+    overall_ci = _percentile_interval(boot_overall, confidence_level)
+    overall_delta_ci = _percentile_interval(boot_overall - boot_overall[:, [0]], confidence_level)
+    field_delta_ci = _percentile_interval(boot_field - boot_field[:, :, [0]], confidence_level)
+
+    entries = []
+    for column, model in enumerate(models):
+        entries.append(ModelComparisonEntry(
+            model_id=model.id,
+            name=model.name,
+            overall_accuracy=float(overall_accuracy[column]),
+            overall_accuracy_ci=(float(overall_ci[0, column]), float(overall_ci[1, column])),
+            perc_of_full_correct=float(perc_of_full_correct[column]),
+            field_accuracy={field: float(field_accuracy[f, column]) for f, field in enumerate(field_names)},
+            overall_accuracy_delta=float(overall_accuracy[column] - overall_accuracy[0]),
+            overall_accuracy_delta_ci=(float(overall_delta_ci[0, column]), float(overall_delta_ci[1, column])),
+            field_accuracy_delta={field: float(field_accuracy[f, column] - field_accuracy[f, 0])
+                                  for f, field in enumerate(field_names)},
+            field_accuracy_delta_ci={field: (float(field_delta_ci[0, f, column]), float(field_delta_ci[1, f, column]))
+                                     for f, field in enumerate(field_names)},
+        ))
+
+    return ModelComparisonReport(
+        baseline_model_id=models[0].id,
+        sample_size=n_documents,
+        labels=len(labels),
+        confidence_level=confidence_level,
+        bootstrap_samples=bootstrap_samples,
+        models=entries,
+        wins=wins.tolist(),
+        ties=ties.tolist(),
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def _format_delta(delta: float, interval: Tuple[float, float]) -> str:
+    """A delta with its interval, marked when the interval excludes zero."""
+    significant = interval[0] > 0 or interval[1] < 0
+    css_class = ("better" if delta > 0 else "worse") if significant else "neutral"
+    return (f'<td class="{css_class}">{delta:+.2f}<br><small>[{interval[0]:+.2f}, {interval[1]:+.2f}]</small></td>')
+
+
+def comparison_report_html(report: ModelComparisonReport) -> str:
+    """
+    Render a model comparison report as a standalone HTML page.
+
+    Deltas whose confidence interval excludes zero are highlighted.
+
+    Args:
+        report (ModelComparisonReport): Report as returned by ``compare_models``
+
+    Returns:
+        str: The HTML page
+    """
+    names = [f"{html.escape(entry.name)} ({entry.model_id})" for entry in report.models]
+    fields = list(report.models[0].field_accuracy)
+    level = f"{report.confidence_level:.0%}"
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset=\"utf-8\"><title>Model comparison</title><style>",
+        "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+        "th,td{border:1px solid #ccc;padding:4px 8px;text-align:right}th:first-child{text-align:left}"
+        ".better{background:#d4f4d4}.worse{background:#f8d4d4}small{color:#666}",
+        "</style></head><body>",
+        "<h1>Model comparison</h1>",
+        f"<p>{report.sample_size} documents, {report.labels} labels. Baseline: {names[0]}. "
+        f"Intervals: {level} paired bootstrap over {report.bootstrap_samples} resamples of the documents.</p>",
+        "<h2>Summary</h2><table><tr><th>Model</th><th>Overall accuracy %</th><th>Delta pp</th>"
+        "<th>Fully correct %</th></tr>",
+    ]
+    for name, entry in zip(names, report.models):
+        low, high = entry.overall_accuracy_ci
+        parts.append(f"<tr><td>{name}</td><td>{entry.overall_accuracy:.2f}<br><small>[{low:.2f}, {high:.2f}]</small></td>"
+                     f"{_format_delta(entry.overall_accuracy_delta, entry.overall_accuracy_delta_ci)}"
+                     f"<td>{entry.perc_of_full_correct:.2f}</td></tr>")
+    parts.append("</table>")
+
+    parts.append("<h2>Field accuracy % and delta to the baseline (pp)</h2><table><tr><th>Field</th>"
+                 + "".join(f"<th>{name}</th>" for name in names) + "</tr>")
+    for field in fields:
+        cells = [f"<td>{report.models[0].field_accuracy[field]:.2f}</td>"]
+        cells += [_format_delta(entry.field_accuracy_delta[field], entry.field_accuracy_delta_ci[field])
+                  for entry in report.models[1:]]
+        parts.append(f"<tr><td>{html.escape(field)}</td>{''.join(cells)}</tr>")
+    parts.append("</table>")
+
+    parts.append("<h2>Documents won / tied / lost (row model against column model)</h2><table><tr><th></th>"
+                 + "".join(f"<th>{name}</th>" for name in names) + "</tr>")
+    for i, name in enumerate(names):
+        cells = ["<td>-</td>" if i == j else
+                 f"<td>{report.wins[i][j]} / {report.ties[i][j]} / {report.wins[j][i]}</td>"
+                 for j in range(len(names))]
+        parts.append(f"<tr><td>{name}</td>{''.join(cells)}</tr>")
+    parts.append("</table></body></html>")
+    return "\n".join(parts)
+
+
+def write_comparison_report(report: ModelComparisonReport, path: str) -> None:
+    """
+    Write a model comparison report as HTML (``.html``) or JSON (any other extension).
+
+    Args:
+        report (ModelComparisonReport): Report as returned by ``compare_models``
+        path (str): Output file
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".html", ".htm"):
+            f.write(comparison_report_html(report))
+        else:
+            f.write(report.model_dump_json(indent=2))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare extraction models on their labelled documents.")
+    parser.add_argument("model_ids", type=int, nargs="+", help="Extraction model IDs, the baseline first")
+    parser.add_argument("--output", help="Write the report to this .html or .json file")
+    parser.add_argument("--bootstrap-samples", type=int, default=1000)
+    parser.add_argument("--confidence-level", type=float, default=0.95)
+    args = parser.parse_args(argv)
+
+    from database import session_scope
+    with session_scope(read_only=True) as db:
+        report = compare_models(db, args.model_ids, bootstrap_samples=args.bootstrap_samples,
+                                confidence_level=args.confidence_level)
+    print(report)
+    if args.output:
+        write_comparison_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,118 @@
 from typing import Optional, Dict, List, Callable
-from datetime import datetime
 
-from functools import reduce
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from functions.date_normalization import get_date_normalizer
+
+class OperationChain:
+    """Applies operations in order. A class instead of nested lambdas, so a PostProcessor can be pickled."""
+
+    def __init__(self, operations):
+        self.operations = tuple(operations)
+
+    def __call__(self, value):
+        for operation in self.operations:
+            value = operation(value)
+        return value
+
+
+class MapValues:
+    """Maps a scalar operation over the values of a Series; picklable like ``OperationChain``."""
+
+    def __init__(self, operation: Callable[[str], str]):
+        self.operation = operation
+
+    def __call__(self, values: pd.Series) -> pd.Series:
+        return values.map(self.operation)
+
 
 # Combine the functions into one
 def compose(*functions):
-    return reduce(lambda f, g: lambda x: g(f(x)), functions)
+    return OperationChain(functions)
+
+
+# Column-wise equivalents of scalar operations, used by PostProcessor.process_batch.
+# A vectorized operation takes a Series plus the scalar operation's extra arguments.
+VECTORIZED_OPERATIONS: Dict[Callable, Callable[..., pd.Series]] = {}
+
+
+def register_vectorized(operation: Callable[[str], str], vectorized_operation: Callable[..., pd.Series]):
+    """
+    Register a column-wise equivalent of a scalar post-processing operation.
+
+    Args:
+        operation (Callable[[str], str]): The scalar operation
+        vectorized_operation (Callable[..., pd.Series]): Function applying the same operation to a Series
+    """
+    VECTORIZED_OPERATIONS[operation] = vectorized_operation
+
+
+def vectorize(operation: Callable[[str], str]) -> Callable[[pd.Series], pd.Series]:
+    """
+    Get the column-wise form of an operation, falling back to mapping it over the values.
+    ``functools.partial`` objects of registered operations keep their bound arguments.
+    """
+    if isinstance(operation, partial) and operation.func in VECTORIZED_OPERATIONS:
+        return partial(VECTORIZED_OPERATIONS[operation.func], *operation.args, **operation.keywords)
+    if operation in VECTORIZED_OPERATIONS:
+        return VECTORIZED_OPERATIONS[operation]
+    return MapValues(operation)
 
 
 class PostProcessor:
     def __init__(self, operations_datapoint: Dict[str, List[Callable[[str], str]]]):
         self.operations_datapoint = operations_datapoint
+        # Operation chains are compiled once, per field
+        self._chains = {key: compose(*operations)
+                        for key, operations in operations_datapoint.items() if operations}
+        self._batch_chains = {key: [vectorize(operation) for operation in operations]
+                              for key, operations in operations_datapoint.items() if operations}
+
     def process(self, predictions: Dict[str, str]) -> Dict[str, str]:
         """
         Converting predictions dictionary according to specified rules
         :param predictions:
         :return:
         """
-        for pred_key in [p for p in predictions if p in self.operations_datapoint]:
-            operations = self.operations_datapoint[pred_key]
-            predictions[pred_key] = compose(*operations)(predictions[pred_key])
+        for pred_key in predictions:
+            chain = self._chains.get(pred_key)
+            if chain is not None:
+                predictions[pred_key] = chain(predictions[pred_key])
 
         return predictions
 
+    def process_batch(self, predictions: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Converting many predictions dictionaries at once. Each field's chain runs over the
+        column of that field's values, once per distinct value, using the registered
+        vectorized form of an operation where there is one. Missing values are left as they
+        are. Unlike ``process`` the input is not modified
+        :param predictions:
+        :return:
+        """
+        results = [dict(prediction) for prediction in predictions]
+
+        for pred_key, chain in self._batch_chains.items():
+            positions = [i for i, prediction in enumerate(predictions) if pred_key in prediction]
+            if not positions:
+                continue
+
+            codes, uniques = pd.factorize(pd.Series([predictions[i][pred_key] for i in positions], dtype=object))
+            values = pd.Series(uniques, dtype=object)
+            for operation in chain:
+                values = operation(values)
+            # Missing values (code -1) pick the trailing None and stay missing
+            values = np.append(values.astype(object).where(values.notna(), None).to_numpy(), None)
+
+            for i, value in zip(positions, values.take(codes).tolist()):
+                results[i][pred_key] = value
+
+        return results
+
+
 def normalize_whitespace(text: str) -> str:
     """
     Normalizes whitespace in a string by removing extra spaces, newlines and tabs.
@@ -61,33 +151,38 @@ def remove_special_characters(text: str, keep_chars: Optional[str] = None) -> st
     return re.sub(pattern, '', text)
 
 
-def standardize_date_format(text: str, input_formats: list[str] = None) -> Optional[str]:
+def standardize_date_format(text: str,
+                            input_formats: list[str] = None,
+                            field: Optional[str] = None,
+                            source: Optional[str] = None) -> Optional[str]:
     """
     Attempts to parse a date string and convert it to standard ISO format (YYYY-MM-DD).
+
+    Parsing goes through a shared ``DateNormalizer``, which tries the format that last
+    succeeded for the same field and source first and memoizes results.
     
     Args:
         text (str): Input date string
         input_formats (list[str]): List of expected input date formats
+        field (Optional[str]): Field name the value belongs to
+        source (Optional[str]): Document source the value comes from
         
     Returns:
         Optional[str]: Standardized date string in YYYY-MM-DD format, or None if parsing fails
     """
+    normalizer = get_date_normalizer(tuple(input_formats) if input_formats else None)
+    return normalizer.normalize(text, field=field, source=source)
 
-    if input_formats is None:
-        input_formats = [
-            '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d',
-            '%m-%d-%Y', '%d-%m-%Y', '%Y-%m-%d',
-            '%b %d, %Y', '%B %d, %Y'
-        ]
-    
-    for fmt in input_formats:
-        try:
-            parsed_date = datetime.strptime(text.strip(), fmt)
-            return parsed_date.strftime('%Y-%m-%d')
-        except ValueError:
-            continue
-            
-    return None
+
+def _standardize_date_format_vectorized(values: pd.Series,
+                                        input_formats: list[str] = None,
+                                        field: Optional[str] = None,
+                                        source: Optional[str] = None) -> pd.Series:
+    normalizer = get_date_normalizer(tuple(input_formats) if input_formats else None)
+    return normalizer.normalize_series(values, field=field, source=source)
+
+
+register_vectorized(standardize_date_format, _standardize_date_format_vectorized)
 
 
 if __name__ == '__main__':
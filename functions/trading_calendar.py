@@ -0,0 +1,292 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_START_YEAR = 1990
+DEFAULT_END_YEAR = 2100
+TRADE_DATE_FORMAT = "%Y-%m-%d"
+
+MONDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = 0, 3, 4, 5, 6
+
+
+def easter_sunday(year: int) -> date:
+    """
+    Get the date of (Western) Easter Sunday, using the anonymous Gregorian algorithm.
+
+    Args:
+        year (int): Year
+
+    Returns:
+        date: Easter Sunday of that year
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """
+    Get the n-th given weekday of a month, counting from the end of the month if n is negative.
+
+    Args:
+        year (int): Year
+        month (int): Month
+        weekday (int): Weekday, Monday is 0
+        n (int): 1 for the first, 2 for the second, ..., -1 for the last
+
+    Returns:
+        date: The requested day
+    """
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _observed_nearest_weekday(day: date) -> date:
+    # Saturday holidays are observed on Friday, Sunday holidays on Monday
+    if day.weekday() == SATURDAY:
+        return day - timedelta(days=1)
+    if day.weekday() == SUNDAY:
+        return day + timedelta(days=1)
+    return day
+
+
+def _us_holidays(year: int) -> List[date]:
+    """NYSE full-day closures. One-off closures (national days of mourning, weather) are not included."""
+    holidays = []
+
+    # New Year's Day on a Saturday is not observed on the Friday before
+    new_year = date(year, 1, 1)
+    if new_year.weekday() == SUNDAY:
+        holidays.append(date(year, 1, 2))
+    elif new_year.weekday() != SATURDAY:
+        holidays.append(new_year)
+
+    if year >= 1998:
+        holidays.append(nth_weekday(year, 1, MONDAY, 3))  # Martin Luther King Jr. Day
+    holidays.append(nth_weekday(year, 2, MONDAY, 3))  # Washington's Birthday
+    holidays.append(easter_sunday(year) - timedelta(days=2))  # Good Friday
+    holidays.append(nth_weekday(year, 5, MONDAY, -1))  # Memorial Day
+    if year >= 2022:
+        holidays.append(_observed_nearest_weekday(date(year, 6, 19)))  # Juneteenth
+    holidays.append(_observed_nearest_weekday(date(year, 7, 4)))  # Independence Day
+    holidays.append(nth_weekday(year, 9, MONDAY, 1))  # Labor Day
+    holidays.append(nth_weekday(year, 11, THURSDAY, 4))  # Thanksgiving
+    holidays.append(_observed_nearest_weekday(date(year, 12, 25)))  # Christmas
+    return holidays
+
+
+def _uk_holidays(year: int) -> List[date]:
+    """London Stock Exchange closures (England and Wales bank holidays). One-off bank holidays are not included."""
+    easter = easter_sunday(year)
+    holidays = [
+        date(year, 1, 1) + timedelta(days={SATURDAY: 2, SUNDAY: 1}.get(date(year, 1, 1).weekday(), 0)),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        nth_weekday(year, 5, MONDAY, 1),  # Early May bank holiday
+        nth_weekday(year, 5, MONDAY, -1),  # Spring bank holiday
+        nth_weekday(year, 8, MONDAY, -1),  # Summer bank holiday
+    ]
+
+    # Christmas and Boxing Day falling on a weekend are substituted by the next free weekdays
+    christmas = date(year, 12, 25)
+    if christmas.weekday() == FRIDAY:
+        holidays += [christmas, date(year, 12, 28)]
+    elif christmas.weekday() == SATURDAY:
+        holidays += [date(year, 12, 27), date(year, 12, 28)]
+    elif christmas.weekday() == SUNDAY:
+        holidays += [date(year, 12, 26), date(year, 12, 27)]
+    else:
+        holidays += [christmas, date(year, 12, 26)]
+    return holidays
+
+
+def _target_holidays(year: int) -> List[date]:
+    """TARGET2 closing days, which are never moved when they fall on a weekend."""
+    easter = easter_sunday(year)
+    return [
+        date(year, 1, 1),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 5, 1),
+        date(year, 12, 25),
+        date(year, 12, 26),
+    ]
+
+
+MARKET_HOLIDAYS: Dict[str, Callable[[int], List[date]]] = {
+    "US": _us_holidays,
+    "UK": _uk_holidays,
+    "TARGET": _target_holidays,
+}
+MARKET_ALIASES = {"NYSE": "US", "XNYS": "US", "LSE": "UK", "XLON": "UK", "EUR": "TARGET"}
+
+
+def resolve_market(market: str) -> str:
+    """
+    Get the canonical code of a market.
+
+    Args:
+        market (str): Market code or alias, e.g. "US", "NYSE", "UK", "LSE", "TARGET"
+
+    Returns:
+        str: The canonical market code
+
+    Raises:
+        ValueError: If the market is unknown
+    """
+    code = MARKET_ALIASES.get(market.upper(), market.upper())
+    if code not in MARKET_HOLIDAYS:
+        raise ValueError(f"Unknown market '{market}', expected one of {sorted(MARKET_HOLIDAYS)}")
+    return code
+
+
+@lru_cache(maxsize=None)
+def _holiday_set(market: str, year: int) -> FrozenSet[date]:
+    return frozenset(MARKET_HOLIDAYS[market](year))
+
+
+class TradingCalendar:
+    """
+    Trading days of one market over a range of years.
+
+    Every day of the range is precomputed into a boolean array indexed by the day's offset from
+    January 1st of the first year, so membership checks are a single array lookup and a column
+    of dates is checked with one fancy-indexing operation. Dates outside the range fall back
+    to the holiday rules of their year.
+
+    Args:
+        market (str): Market code or alias, see ``resolve_market``
+        start_year (int): First year covered by the precomputed index
+        end_year (int): Last year covered by the precomputed index
+    """
+
+    def __init__(self, market: str, start_year: int = DEFAULT_START_YEAR, end_year: int = DEFAULT_END_YEAR):
+        self.market = resolve_market(market)
+        self.start_year = start_year
+        self.end_year = end_year
+        self._epoch = np.datetime64(f"{start_year}-01-01", "D")
+
+        days = np.arange(self._epoch, np.datetime64(f"{end_year + 1}-01-01", "D"))
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 gives Monday = 0
+        weekdays = (days.astype(np.int64) + 3) % 7
+        self._trading_days = weekdays < SATURDAY
+
+        holidays = np.array(sorted(day for year in range(start_year, end_year + 1)
+                                   for day in _holiday_set(self.market, year)), dtype="datetime64[D]")
+        self.holidays = holidays
+        self._trading_days[(holidays - self._epoch).astype(np.int64)] = False
+
+    def _in_range(self, day: date) -> bool:
+        return self.start_year <= day.year <= self.end_year
+
+    def is_trading_day(self, day: date) -> bool:
+        """
+        Check whether the market is open on a day.
+
+        Args:
+            day (date): The day to check
+
+        Returns:
+            bool: True for weekdays that are not holidays of the market
+        """
+        if not self._in_range(day):
+            return day.weekday() < SATURDAY and day not in _holiday_set(self.market, day.year)
+        return bool(self._trading_days[(day - date(self.start_year, 1, 1)).days])
+
+    def is_trading_day_many(self, days: np.ndarray) -> np.ndarray:
+        """
+        Check a column of days at once.
+
+        Args:
+            days (np.ndarray): Days as datetime64 values, NaT is allowed
+
+        Returns:
+            np.ndarray: Boolean mask, True where the market is open; False for NaT
+        """
+        days = np.asarray(days, dtype="datetime64[D]")
+        result = np.zeros(days.shape, dtype=bool)
+        offsets = (days - self._epoch).astype(np.int64)
+        valid = ~np.isnat(days)
+        in_range = valid & (offsets >= 0) & (offsets < len(self._trading_days))
+        result[in_range] = self._trading_days[offsets[in_range]]
+
+        for i in np.flatnonzero(valid & ~in_range):
+            result[i] = self.is_trading_day(days[i].astype(date))
+        return result
+
+    def trading_days(self, start: date, end: date) -> np.ndarray:
+        """
+        Get the trading days between two days of the precomputed range.
+
+        Args:
+            start (date): First day, inclusive
+            end (date): Last day, inclusive
+
+        Returns:
+            np.ndarray: The trading days as datetime64[D] values
+        """
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        return days[self.is_trading_day_many(days)]
+
+
+@lru_cache(maxsize=None)
+def _get_calendar(market: str, start_year: int, end_year: int) -> TradingCalendar:
+    return TradingCalendar(market, start_year, end_year)
+
+
+def get_calendar(market: str = "US",
+                 start_year: int = DEFAULT_START_YEAR,
+                 end_year: int = DEFAULT_END_YEAR) -> TradingCalendar:
+    """
+    Get the shared trading calendar of a market, built on first use.
+
+    Args:
+        market (str): Market code or alias, see ``resolve_market``
+        start_year (int): First year covered by the precomputed index
+        end_year (int): Last year covered by the precomputed index
+
+    Returns:
+        TradingCalendar: The calendar
+    """
+    return _get_calendar(resolve_market(market), start_year, end_year)
+
+
+def parse_trade_dates(values: Sequence[Optional[str]], date_format: str = TRADE_DATE_FORMAT) -> np.ndarray:
+    """
+    Parse a column of date strings, each distinct value once.
+
+    Values are parsed column-wise with ``pd.to_datetime`` and the ones it rejects are retried with
+    ``datetime.strptime``, so the result matches parsing every value with strptime.
+
+    Args:
+        values (Sequence[Optional[str]]): Date strings; missing and non-string values become NaT
+        date_format (str): strptime format of the values
+
+    Returns:
+        np.ndarray: datetime64[D] values, NaT where parsing failed
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    strings = pd.Series([value if isinstance(value, str) else None for value in uniques], dtype=object)
+    parsed = pd.to_datetime(strings, format=date_format, errors="coerce").to_numpy(dtype="datetime64[D]")
+
+    for i in np.flatnonzero(np.isnat(parsed)):
+        if strings[i] is not None:
+            try:
+                parsed[i] = np.datetime64(datetime.strptime(strings[i], date_format).date(), "D")
+            except ValueError:
+                continue
+    return np.append(parsed, np.datetime64("NaT", "D")).take(codes)
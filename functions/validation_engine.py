@@ -0,0 +1,261 @@
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from functions.field_validators import (
+    CUSIPValidator,
+    DateFormatValidator,
+    DecimalNumberValidator,
+    FieldValidator,
+    ISINValidator,
+    NumberRangeValidator,
+    RegexValidator,
+    StringLengthValidator,
+    TradeDateValidator,
+)
+from functions.trading_calendar import resolve_market
+from models.DataModels import Prediction
+from models.validation_models import FieldValidationFailure
+from services.taxonomy_cache import TaxonomyMetadata, taxonomy_cache
+
+# Validators are stateless, so one instance of each serves every compiled rule
+_DECIMAL_NUMBER = DecimalNumberValidator()
+_NUMBER_RANGE = NumberRangeValidator()
+_STRING_LENGTH = StringLengthValidator()
+_DATE_FORMAT = DateFormatValidator()
+_REGEX = RegexValidator()
+_ISIN = ISINValidator()
+_CUSIP = CUSIPValidator()
+_TRADE_DATE = TradeDateValidator()
+
+IDENTIFIER_VALIDATORS = {"isin": _ISIN, "cusip": _CUSIP}
+
+
+class CompiledRule(NamedTuple):
+    """A validator bound to the arguments of one rule of a field."""
+    name: str
+    validator: FieldValidator
+    kwargs: Dict[str, Any]
+
+    def check(self, value: str) -> bool:
+        return self.validator.validate_value(value, **self.kwargs)
+
+    def check_many(self, values: Sequence[str]) -> np.ndarray:
+        return self.validator.validate_values(values, **self.kwargs)
+
+
+def parse_validation_rules(validation_rules: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """
+    Parse the validation rules stored on a taxonomy field.
+
+    Supported keys: ``regex``, ``min_value``, ``max_value``, ``min_length``, ``max_length``,
+    ``date_format``, ``identifier`` ("isin" or "cusip") and ``trade_date`` (true for the US market, or a
+    market code such as "UK" or "TARGET", see ``functions.trading_calendar``).
+
+    Args:
+        validation_rules (Union[str, Dict[str, Any], None]): JSON string or dictionary of rules
+
+    Returns:
+        Dict[str, Any]: The rules, empty if none are set
+
+    Raises:
+        ValueError: If the rules are not a JSON object
+    """
+    if not validation_rules:
+        return {}
+    if isinstance(validation_rules, dict):
+        return validation_rules
+    rules = json.loads(validation_rules)
+    if not isinstance(rules, dict):
+        raise ValueError(f"Validation rules must be a JSON object, got: {validation_rules}")
+    return rules
+
+
+def dump_validation_rules(validation_rules: Union[str, Dict[str, Any], None]) -> Optional[str]:
+    """
+    Serialize validation rules for storage on a taxonomy field, checking they parse.
+
+    Args:
+        validation_rules (Union[str, Dict[str, Any], None]): JSON string or dictionary of rules
+
+    Returns:
+        Optional[str]: JSON string, or None if there are no rules
+    """
+    rules = parse_validation_rules(validation_rules)
+    return json.dumps(rules) if rules else None
+
+
+def _trade_date_market(rules: Dict[str, Any]) -> str:
+    market = rules.get("trade_date")
+    return resolve_market(market) if isinstance(market, str) else "US"
+
+
+def _type_rules(data_type: Optional[str], rules: Dict[str, Any]) -> List[CompiledRule]:
+    if data_type == "number":
+        return [CompiledRule("type", _DECIMAL_NUMBER, {})]
+    if data_type == "date":
+        return [CompiledRule("type", _DATE_FORMAT, {"date_format": rules.get("date_format", "%Y-%m-%d")})]
+    if data_type == "string":
+        # Same bounds FieldTypeValidator has always applied to strings
+        return [CompiledRule("type", _STRING_LENGTH, {"min_length": 1, "max_length": 1000})]
+    if data_type in IDENTIFIER_VALIDATORS:
+        return [CompiledRule("type", IDENTIFIER_VALIDATORS[data_type], {})]
+    if data_type == "trade_date":
+        return [CompiledRule("type", _TRADE_DATE, {"market": _trade_date_market(rules)})]
+    return []
+
+
+def compile_field_rules(data_type: Optional[str],
+                        validation_rules: Union[str, Dict[str, Any], None]) -> Tuple[CompiledRule, ...]:
+    """
+    Compile a field's data type and validation rules into a tuple of bound validators.
+
+    Args:
+        data_type (Optional[str]): Data type of the field (e.g. "string", "number", "date")
+        validation_rules (Union[str, Dict[str, Any], None]): JSON string or dictionary of rules
+
+    Returns:
+        Tuple[CompiledRule, ...]: The rules in the order they are checked
+    """
+    rules = parse_validation_rules(validation_rules)
+    compiled = _type_rules(data_type, rules)
+
+    if "regex" in rules:
+        compiled.append(CompiledRule("regex", _REGEX, {"pattern": re.compile(rules["regex"])}))
+    if "min_value" in rules or "max_value" in rules:
+        compiled.append(CompiledRule("range", _NUMBER_RANGE, {"min_value": rules.get("min_value"),
+                                                             "max_value": rules.get("max_value")}))
+    if "min_length" in rules or "max_length" in rules:
+        compiled.append(CompiledRule("length", _STRING_LENGTH, {"min_length": rules.get("min_length"),
+                                                               "max_length": rules.get("max_length")}))
+    if "identifier" in rules:
+        identifier = str(rules["identifier"]).lower()
+        if identifier not in IDENTIFIER_VALIDATORS:
+            raise ValueError(f"Unknown identifier type '{rules['identifier']}'")
+        compiled.append(CompiledRule(identifier, IDENTIFIER_VALIDATORS[identifier], {}))
+    if rules.get("trade_date") and data_type != "trade_date":
+        compiled.append(CompiledRule("trade_date", _TRADE_DATE, {"market": _trade_date_market(rules)}))
+
+    return tuple(compiled)
+
+
+@lru_cache(maxsize=1024)
+def compile_rules_cached(data_type: Optional[str], validation_rules: Optional[str]) -> Tuple[CompiledRule, ...]:
+    """``compile_field_rules`` memoized on the stored (data type, JSON rules) pair."""
+    return compile_field_rules(data_type, validation_rules)
+
+
+ValidationPlan = Dict[str, Tuple[CompiledRule, ...]]
+
+
+class ValidationEngine:
+    """
+    Validates predictions against their taxonomy's field rules.
+
+    Each taxonomy's rules are compiled once into a plan (field name to compiled rules). Plans are
+    built from the metadata in ``services.taxonomy_cache`` and rebuilt whenever that metadata is
+    reloaded, so invalidating a taxonomy there also invalidates its plan.
+
+    Args:
+        max_plans (int): Maximum number of cached taxonomy plans
+    """
+
+    def __init__(self, max_plans: int = 128):
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[int, Tuple[TaxonomyMetadata, ValidationPlan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, db: Session, taxonomy_id: int) -> ValidationPlan:
+        """
+        Get the compiled validation plan of a taxonomy.
+
+        Args:
+            db (Session): Database session
+            taxonomy_id (int): ID of the taxonomy
+
+        Returns:
+            ValidationPlan: Dictionary mapping field names to their compiled rules, empty for an unknown taxonomy
+        """
+        metadata = taxonomy_cache.get(db, taxonomy_id)
+        if metadata is None:
+            return {}
+
+        with self._lock:
+            cached = self._plans.get(taxonomy_id)
+            if cached is not None and cached[0] is metadata:
+                self._plans.move_to_end(taxonomy_id)
+                return cached[1]
+
+        plan = {name: compile_rules_cached(data_type, metadata.validation_rules[name])
+                for name, data_type in metadata.data_types.items()}
+
+        with self._lock:
+            self._plans[taxonomy_id] = (metadata, plan)
+            self._plans.move_to_end(taxonomy_id)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, taxonomy_id: Optional[int] = None) -> None:
+        """
+        Drop the cached plan of a taxonomy, or of all taxonomies.
+
+        Args:
+            taxonomy_id (Optional[int]): ID of the taxonomy, None to clear everything
+        """
+        with self._lock:
+            if taxonomy_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(taxonomy_id, None)
+
+    def validate(self,
+                 db: Session,
+                 taxonomy_id: int,
+                 predictions: Iterable[Union[Prediction, Tuple[int, str, str]]]) -> Dict[str, List[FieldValidationFailure]]:
+        """
+        Validate a batch of predictions in one pass, one column of values per field and rule.
+
+        Args:
+            db (Session): Database session
+            taxonomy_id (int): ID of the taxonomy the predictions belong to
+            predictions (Iterable[Union[Prediction, Tuple[int, str, str]]]): Prediction objects or
+                (document_id, field_name, value) tuples
+
+        Returns:
+            Dict[str, List[FieldValidationFailure]]: Failures grouped by field name; fields
+                without failures are left out
+        """
+        plan = self.plan(db, taxonomy_id)
+
+        columns: Dict[str, Tuple[List[int], List[str]]] = {}
+        for prediction in predictions:
+            if isinstance(prediction, Prediction):
+                document_id, field_name, value = prediction.document_id, prediction.field_name, prediction.value
+            else:
+                document_id, field_name, value = prediction
+            document_ids, values = columns.setdefault(field_name, ([], []))
+            document_ids.append(document_id)
+            values.append(value)
+
+        failures: Dict[str, List[FieldValidationFailure]] = {}
+        for field_name, (document_ids, values) in columns.items():
+            for rule in plan.get(field_name, ()):
+                passed = rule.check_many(values)
+                for i in np.flatnonzero(~passed):
+                    failures.setdefault(field_name, []).append(
+                        FieldValidationFailure(document_id=document_ids[i],
+                                               field_name=field_name,
+                                               value=values[i],
+                                               rule=rule.name)
+                    )
+        return failures
+
+
+validation_engine = ValidationEngine()
@@ -1,18 +1,37 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
-from database import engine
-from models import Base
-from routers import taxonomy, documents
+from database import dispose_async_engines, engine
+from models.DataModels import Base
+from routers import taxonomy, documents, organizations, extraction_models, jobs
 # Import other routers as needed
 from config import settings
+from services.job_queue import ExtractionJobWorker
+from services.nucleus_async_client import close_nucleus_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    worker = ExtractionJobWorker() if settings.JOB_WORKER_ENABLED else None
+    if worker:
+        worker.start()
+    yield
+    if worker:
+        await worker.stop()
+    # Close the shared connection pools on shutdown
+    await close_nucleus_client()
+    await dispose_async_engines()
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.APP_NAME)
+    app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
     Base.metadata.create_all(bind=engine)
 
     # Register routers
     app.include_router(taxonomy.router)
     app.include_router(documents.router)
+    app.include_router(organizations.router)
+    app.include_router(extraction_models.router)
+    app.include_router(jobs.router)
     # Add more routers (extraction, validation, metrics)...
 
     return app
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum, Float, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum, Float, UniqueConstraint, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime, UTC
 from enum import Enum as PyEnum  # Rename to avoid confusion
@@ -71,6 +71,8 @@ class Document(Base):
         name (str): Document name
         file_path (str): Path to the document file
         individual_id (str): Unique identifier for the individual associated with the document
+        content_hash (str): SHA-256 hex digest of the document file content
+        nucleus_doc_id (str): ID of the document in Nucleus, once uploaded
         is_labeled (bool): Flag indicating if the document has been labeled
         organization_id (int): Foreign key to the organization that owns this document
         organization (Organization): Relationship to the organization that owns this document
@@ -84,6 +86,8 @@ class Document(Base):
     name = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     individual_id = Column(String, nullable=False, index=True)
+    content_hash = Column(String(64), nullable=True, index=True)
+    nucleus_doc_id = Column(String, nullable=True)
     is_labeled = Column(Boolean, default=False)
 
     # Add the status field using the enum
@@ -103,6 +107,10 @@ class Document(Base):
 
     predictions = relationship("Prediction", back_populates="document")
 
+    __table_args__ = (
+        Index('ix_documents_organization_status', 'organization_id', 'status'),
+    )
+
     def __repr__(self):
         return f"<Document(name='{self.name}', individual_id='{self.individual_id}')>"
 
@@ -118,6 +126,7 @@ class TaxonomyField(Base):
         data_type (str): Data type of the field (e.g., "string", "number", "date")
         description (str): Detailed description of the field
         is_required (bool): Flag indicating if the field is required
+        validation_rules (str): JSON object with validation rules (e.g. regex, range, length, identifier)
         taxonomy_id (int): Foreign key to the taxonomy that this field belongs to
         taxonomy (Taxonomy): Relationship to the taxonomy that this field belongs to
         field_labels (list): List of field labels associated with this field
@@ -129,6 +138,7 @@ class TaxonomyField(Base):
     data_type = Column(String, nullable=False)  # e.g., "string", "number", "date"
     description = Column(String)
     is_required = Column(Boolean, default=False)
+    validation_rules = Column(Text, nullable=True)  # JSON, e.g. {"regex": "^INV-", "max_length": 20}
     # Add direct foreign key to taxonomy
     taxonomy_id = Column(Integer, ForeignKey('taxonomies.id'), nullable=True)
     # Add relationship to field labels
@@ -140,6 +150,11 @@ class TaxonomyField(Base):
     # Add relationship to predictions
     predictions = relationship("Prediction", back_populates="field")
 
+    __table_args__ = (
+        Index('ix_fields_taxonomy_name', 'taxonomy_id', 'name'),
+        Index('ix_fields_taxonomy_required', 'taxonomy_id', 'is_required'),
+    )
+
     def __repr__(self):
         return f"<TaxonomyField(name='{self.name}', data_type='{self.data_type}')>"
 
@@ -196,6 +211,8 @@ class FieldLabel(Base):
         value (str): Value of the field label
         document_id (int): Foreign key to the document that this field label belongs to
         field_id (int): Foreign key to the field that this field label belongs to
+        created_at (datetime): Timestamp when the field label was created
+        updated_at (datetime): Timestamp when the field label value was last written
         document (Document): Relationship to the document that this field label belongs to
         field (TaxonomyField): Relationship to the field that this field label belongs to
     """
@@ -213,9 +230,13 @@ class FieldLabel(Base):
     field = relationship("TaxonomyField", back_populates="field_labels")
     field_name = Column(String, nullable=False)
     occurrence = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     __table_args__ = (
         UniqueConstraint('document_id', 'field_id', name='uq_document_field'),
+        # Incremental dataset exports look up the labels written since a timestamp
+        Index('ix_field_labels_updated_at', 'updated_at'),
     )
 
 
@@ -290,6 +311,10 @@ class Prediction(Base):
 
     __table_args__ = (
         UniqueConstraint('document_id', 'model_id', 'field_id', name='uq_document_model_field'),
+        # uq_document_model_field leads with document_id, so model-wide filters need their own index
+        Index('ix_predictions_model_document', 'model_id', 'document_id'),
+        # Incremental evaluation looks up the predictions of a model written since its last run
+        Index('ix_predictions_model_created', 'model_id', 'created_at'),
     )
 
 
@@ -299,6 +324,71 @@ class Prediction(Base):
     def __repr__(self):
         return f"<Prediction(document_id={self.document_id}, model_id={self.model_id})>"
 
+class JobStatus(PyEnum):
+    """
+    Enum for extraction job status
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ExtractionJob(Base):
+    """
+    ExtractionJob model
+    Represents a queued Nucleus extraction run of one document, processed by the job worker.
+
+    Attributes:
+        id (int): Unique identifier for the job
+        document_id (int): Foreign key to the document to extract
+        model_id (int): Foreign key to the extraction model the results are stored for
+        workflow_id (str): ID of the Nucleus workflow to run
+        status (JobStatus): Processing status of the job
+        nucleus_job_id (str): ID of the Nucleus workflow job, once submitted
+        attempts (int): Number of failed attempts so far
+        max_attempts (int): Number of failed attempts after which the job fails for good
+        polls (int): Number of times the results were polled for the current submission
+        next_run_at (datetime): Earliest time the worker picks the job up again
+        last_error (str): Error of the last failed attempt
+        created_at (datetime): Timestamp when the job was queued
+        started_at (datetime): Timestamp when the workflow was last submitted
+        updated_at (datetime): Timestamp when the job was last updated
+        completed_at (datetime): Timestamp when the job succeeded or failed for good
+    """
+    __tablename__ = 'extraction_jobs'
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey('documents.id'), nullable=False, index=True)
+    model_id = Column(Integer, ForeignKey('extraction_models.id'), nullable=False)
+    workflow_id = Column(String, nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    nucleus_job_id = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    polls = Column(Integer, nullable=False, default=0)
+    next_run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+    document = relationship("Document")
+    model = relationship("ExtractionModel")
+
+    __table_args__ = (
+        # The worker claims due jobs by status and next_run_at
+        Index('ix_extraction_jobs_status_next_run', 'status', 'next_run_at'),
+        # At most one active job per document, model and workflow; the enum is stored by member name
+        Index('uq_extraction_jobs_active', 'document_id', 'model_id', 'workflow_id', unique=True,
+              postgresql_where=text("status IN ('QUEUED', 'RUNNING')")),
+    )
+
+    def __repr__(self):
+        return f"<ExtractionJob(document_id={self.document_id}, status='{self.status}')>"
+
+
 class Metric(Base):
     """
     PerformanceMetric model
@@ -332,4 +422,66 @@ class Metric(Base):
 
 
     def __repr__(self):
-        return f"<Metric(name='{self.name}')>"
\ No newline at end of file
+        return f"<Metric(name='{self.name}')>"
+
+
+class EvaluationCount(Base):
+    """
+    EvaluationCount model
+    Running per-field match counts of an extraction model, kept up to date by incremental evaluation.
+
+    Attributes:
+        id (int): Unique identifier for the counts
+        model_id (int): Foreign key to the evaluated extraction model
+        field_name (str): Name of the taxonomy field
+        matches (int): Number of labels of the field the model's prediction matches
+        total (int): Number of labels of the field in the evaluated documents
+        updated_at (datetime): Timestamp when the counts were last updated
+    """
+    __tablename__ = 'evaluation_counts'
+
+    id = Column(Integer, primary_key=True, index=True)
+    model_id = Column(Integer, ForeignKey('extraction_models.id'), nullable=False)
+    field_name = Column(String, nullable=False)
+    matches = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('model_id', 'field_name', name='uq_evaluation_count_model_field'),
+    )
+
+    def __repr__(self):
+        return f"<EvaluationCount(model_id={self.model_id}, field_name='{self.field_name}')>"
+
+
+class DocumentEvaluation(Base):
+    """
+    DocumentEvaluation model
+    Outcome of the last evaluation of one document against an extraction model's predictions.
+
+    Attributes:
+        id (int): Unique identifier for the outcome
+        model_id (int): Foreign key to the evaluated extraction model
+        document_id (int): Foreign key to the evaluated document
+        matches (int): Number of the document's labels the model's predictions match
+        total (int): Number of labels of the document
+        field_matches (str): JSON object with the match outcome per field name
+        evaluated_at (datetime): Start of the evaluation run that produced the outcome
+    """
+    __tablename__ = 'document_evaluations'
+
+    id = Column(Integer, primary_key=True, index=True)
+    model_id = Column(Integer, ForeignKey('extraction_models.id'), nullable=False)
+    document_id = Column(Integer, ForeignKey('documents.id'), nullable=False)
+    matches = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+    field_matches = Column(Text, nullable=False)  # JSON, e.g. {"isin": true, "issue_date": false}
+    evaluated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('model_id', 'document_id', name='uq_document_evaluation_model_document'),
+    )
+
+    def __repr__(self):
+        return f"<DocumentEvaluation(model_id={self.model_id}, document_id={self.document_id})>"
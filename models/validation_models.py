@@ -1,4 +1,5 @@
-from typing import Optional, Dict
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
 
 from pydantic import BaseModel
 
@@ -44,6 +45,165 @@ class DocumentComparisonResult(BaseModel):
         return self.field_results.keys()
 
 
+class FieldValidationFailure(BaseModel):
+    document_id: int
+    field_name: str
+    value: Optional[str]
+    rule: str
+
+
+class DocumentValidationReport(BaseModel):
+    document_id: int
+    model_id: int
+    passed: bool
+    results: Dict[str, bool]
+    errors: Dict[str, str] = {}
+
+
+class ModelEvaluationResult(BaseModel):
+    model_id: int
+    sample_size: int
+    overall_accuracy: float
+    perc_of_full_correct: float
+    field_accuracy: Dict[str, float]
+
+    def to_performance_metrics(self) -> List[PerformanceMetric]:
+        return [
+            PerformanceMetric(name='overall_accuracy', value=self.overall_accuracy, sample_size=self.sample_size),
+            PerformanceMetric(name='perc_of_full_correct', value=self.perc_of_full_correct, sample_size=self.sample_size),
+        ] + [PerformanceMetric(name=f"{field}_accuracy", value=value, sample_size=self.sample_size)
+             for field, value in self.field_accuracy.items()]
+
+
+class ExtractionRunReport(BaseModel):
+    model_id: int
+    mode: str
+    documents_total: int
+    documents_succeeded: int
+    documents_failed: int
+    errors: Dict[int, str] = {}
+    elapsed_seconds: float
+    documents_per_second: float
+
+    def __str__(self):
+        return (f"Model ID: {self.model_id}, {self.documents_succeeded}/{self.documents_total} documents "
+                f"in {self.elapsed_seconds:.2f}s ({self.documents_per_second:.1f} docs/s, mode={self.mode})")
+
+
+class IngestionReport(BaseModel):
+    organization_id: int
+    files_total: int = 0
+    files_ingested: int = 0
+    files_failed: int = 0
+    files_deduplicated: int = 0
+    bytes_copied: int = 0
+    errors: Dict[str, str] = {}
+    elapsed_seconds: float = 0.0
+    files_per_second: float = 0.0
+
+    def __str__(self):
+        return (f"Organization ID: {self.organization_id}, {self.files_ingested}/{self.files_total} files "
+                f"in {self.elapsed_seconds:.2f}s ({self.files_per_second:.1f} files/s)")
+
+
+class ResultIngestionReport(BaseModel):
+    model_id: int
+    documents_total: int = 0
+    documents_ingested: int = 0
+    predictions_written: int = 0
+    predictions_deleted: int = 0
+    unknown_fields: Dict[str, int] = {}
+    errors: Dict[str, str] = {}
+    elapsed_seconds: float = 0.0
+
+    def __str__(self):
+        return (f"Model ID: {self.model_id}, {self.documents_ingested}/{self.documents_total} documents, "
+                f"{self.predictions_written} predictions written, {self.predictions_deleted} deleted "
+                f"in {self.elapsed_seconds:.2f}s")
+
+
+class LabelImportConfig(BaseModel):
+    """How the columns of a label file map to documents and taxonomy fields."""
+    # Column identifying the document of each row
+    document_column: str = "file_name"
+    # Document attribute the document column holds: "document_id", "name", "file_path" or "nucleus_doc_id"
+    document_key: str = "name"
+    # Column name to taxonomy field name; empty maps every column named like a taxonomy field
+    field_columns: Dict[str, str] = {}
+    # Output format of date and datetime cells
+    date_format: str = "%Y-%m-%d"
+    # Worksheet of XLSX files, the active one by default
+    sheet_name: Optional[str] = None
+
+
+class LabelImportReport(BaseModel):
+    taxonomy_id: int
+    rows_total: int = 0
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    rejection_reasons: Dict[str, int] = {}
+    rejected_rows_path: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+    def __str__(self):
+        return (f"Taxonomy ID: {self.taxonomy_id}, {self.rows_imported}/{self.rows_total} rows imported, "
+                f"{self.rows_rejected} rejected in {self.elapsed_seconds:.2f}s ({self.rows_per_second:.1f} rows/s)")
+
+
+class DatasetExportReport(BaseModel):
+    taxonomy_id: int
+    model_id: Optional[int] = None
+    layout: str
+    format: str
+    path: str
+    since: Optional[datetime] = None
+    # Pass as ``since`` to the next export to get only what changed after this one started
+    exported_at: datetime
+    rows: int = 0
+    documents: int = 0
+    elapsed_seconds: float = 0.0
+
+    def __str__(self):
+        return (f"Taxonomy ID: {self.taxonomy_id}, {self.rows} rows of {self.documents} documents "
+                f"exported to {self.path} in {self.elapsed_seconds:.2f}s")
+
+
+class ModelComparisonEntry(BaseModel):
+    model_id: int
+    name: str
+    overall_accuracy: float
+    overall_accuracy_ci: Tuple[float, float]
+    perc_of_full_correct: float
+    field_accuracy: Dict[str, float]
+    # Differences to the baseline model in percentage points, with paired bootstrap intervals
+    overall_accuracy_delta: float = 0.0
+    overall_accuracy_delta_ci: Tuple[float, float] = (0.0, 0.0)
+    field_accuracy_delta: Dict[str, float] = {}
+    field_accuracy_delta_ci: Dict[str, Tuple[float, float]] = {}
+
+
+class ModelComparisonReport(BaseModel):
+    baseline_model_id: int
+    sample_size: int
+    labels: int
+    confidence_level: float
+    bootstrap_samples: int
+    models: List[ModelComparisonEntry]
+    # wins[i][j]: documents on which models[i] has a higher accuracy rate than models[j]
+    wins: List[List[int]]
+    ties: List[List[int]]
+    elapsed_seconds: float = 0.0
+
+    def __str__(self):
+        lines = [f"{self.sample_size} documents, {self.labels} labels, baseline model ID {self.baseline_model_id}"]
+        for entry in self.models:
+            low, high = entry.overall_accuracy_delta_ci
+            lines.append(f"Model ID: {entry.model_id} ({entry.name}), overall accuracy {entry.overall_accuracy:.2f} %, "
+                         f"delta {entry.overall_accuracy_delta:+.2f} pp [{low:+.2f}, {high:+.2f}]")
+        return "\n".join(lines)
+
+
 if __name__ == '__main__':
     p = PerformanceMetric(name='accuracy', value=100.0)
-    p = PerformanceMetric(name='accuracy', value=100)
\ No newline at end of file
+    p = PerformanceMetric(name='accuracy', value=100)
@@ -1,71 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import models, schemas
-from app.database import get_db
-from app.services.nucleus_client import upload_document_to_nucleus, run_extraction_workflow, fetch_extraction_results
+from typing import Optional
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+import schemas
+from database import get_async_db, get_async_read_db
+from models.DataModels import Document, DocumentStatus
+from services import async_service
+from services.nucleus_async_client import (FAILED_JOB_STATUSES, PENDING_JOB_STATUSES, AsyncNucleusClient,
+                                           get_nucleus_client)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+async def _get_document_or_404(db: AsyncSession, document_id: int) -> Document:
+    doc = await async_service.get_document(db, document_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return doc
+
+@router.get("/", response_model=schemas.Page[schemas.DocumentOut])
+async def list_documents(organization_id: Optional[int] = None,
+                         individual_id: Optional[str] = None,
+                         after_id: Optional[int] = None,
+                         limit: int = Query(100, ge=1, le=1000),
+                         db: AsyncSession = Depends(get_async_read_db)):
+    documents = await async_service.get_documents(db, organization_id=organization_id, individual_id=individual_id,
+                                                  limit=limit, after_id=after_id)
+    return schemas.Page[schemas.DocumentOut].from_items(documents, limit)
+
+@router.get("/{document_id}", response_model=schemas.DocumentOut)
+async def get_document(document_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    return await _get_document_or_404(db, document_id)
+
 @router.post("/", response_model=schemas.DocumentOut)
-def create_document(doc_in: schemas.DocumentCreate, db: Session = Depends(get_db)):
-    doc = models.Document(
-        document_type_id=doc_in.document_type_id,
-        nucleus_doc_id=doc_in.nucleus_doc_id,
-        status="uploaded"
-    )
+async def create_document(doc_in: schemas.DocumentCreate, db: AsyncSession = Depends(get_async_db)):
+    doc = Document(**doc_in.model_dump(), status=DocumentStatus.PENDING)
     db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    await db.commit()
+    await db.refresh(doc)
     return doc
 
 @router.post("/{document_id}/upload_to_nucleus")
-def upload_doc_to_nucleus(document_id: int, file_path: str, db: Session = Depends(get_db)):
-    doc = db.query(models.Document).filter_by(id=document_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+async def upload_doc_to_nucleus(document_id: int,
+                                file_path: Optional[str] = None,
+                                db: AsyncSession = Depends(get_async_db),
+                                nucleus: AsyncNucleusClient = Depends(get_nucleus_client)):
+    doc = await _get_document_or_404(db, document_id)
+    # Return the connection to the pool while waiting on Nucleus
+    await db.commit()
 
-    nucleus_doc_id = upload_document_to_nucleus(file_path)
+    try:
+        nucleus_doc_id = await nucleus.upload_document(file_path or doc.file_path)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Nucleus upload failed: {e}")
     doc.nucleus_doc_id = nucleus_doc_id
-    doc.status = "uploaded_to_nucleus"
-    db.commit()
-    db.refresh(doc)
+    await db.commit()
     return {"message": "Document uploaded to Nucleus", "nucleus_doc_id": nucleus_doc_id}
 
-@router.post("/{document_id}/run_extraction")
-def run_extraction(document_id: int, workflow_id: str, db: Session = Depends(get_db)):
-    doc = db.query(models.Document).filter_by(id=document_id).first()
-    if not doc or not doc.nucleus_doc_id:
-        raise HTTPException(status_code=404, detail="Document not found or not uploaded to Nucleus")
-
-    result = run_extraction_workflow(doc.nucleus_doc_id, workflow_id)
-    # Suppose result has a job_id
-    job_id = result.get("job_id")
-    return {"message": "Extraction started", "job_id": job_id}
+@router.post("/{document_id}/run_extraction", status_code=202)
+async def run_extraction(document_id: int,
+                         workflow_id: str,
+                         model_id: int,
+                         db: AsyncSession = Depends(get_async_db)):
+    # The job worker uploads the document if needed, runs the workflow and stores the results
+    try:
+        [job_id] = await async_service.enqueue_extraction_jobs(db, [document_id], model_id, workflow_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Extraction queued", "job_id": job_id}
 
 @router.get("/{document_id}/fetch_results")
-def fetch_results(document_id: int, job_id: str, db: Session = Depends(get_db)):
-    doc = db.query(models.Document).filter_by(id=document_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+async def fetch_results(document_id: int,
+                        job_id: str,
+                        model_id: int,
+                        db: AsyncSession = Depends(get_async_db),
+                        nucleus: AsyncNucleusClient = Depends(get_nucleus_client)):
+    doc = await _get_document_or_404(db, document_id)
+    extraction_model = await async_service.get_extraction_model(db, model_id)
+    if not extraction_model:
+        raise HTTPException(status_code=404, detail="Extraction model not found")
+    await db.commit()
+
+    try:
+        extraction_data = await nucleus.fetch_extraction_results(job_id)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Nucleus results could not be fetched: {e}")
+    status = str(extraction_data.get("status", "")).lower()
+    if status in PENDING_JOB_STATUSES:
+        return {"message": "Extraction still running", "status": status}
+    if status in FAILED_JOB_STATUSES:
+        raise HTTPException(status_code=502, detail=f"Nucleus job '{job_id}' finished with status '{status}'")
 
-    extraction_data = fetch_extraction_results(job_id)
-    # Map extraction_data to ExtractionResult model
-    # This is highly dependent on how Nucleus returns data
-    for item in extraction_data.get("fields", []):
-        # e.g., item might have "field_name" and "value"
-        taxonomy_field = db.query(models.TaxonomyField).filter_by(
-            document_type_id=doc.document_type_id,
-            field_name=item["field_name"]
-        ).first()
-        if taxonomy_field:
-            new_result = models.ExtractionResult(
-                document_id=doc.id,
-                taxonomy_field_id=taxonomy_field.id,
-                extracted_value=item.get("value"),
-                confidence=item.get("confidence", None),
-            )
-            db.add(new_result)
-    doc.status = "extracted"
-    db.commit()
-    db.refresh(doc)
-    return {"message": "Extraction results fetched and stored"}
+    report = await async_service.ingest_extraction_results(db, extraction_model, [{**extraction_data, "document_id": doc.id}])
+    if report.errors:
+        raise HTTPException(status_code=502, detail=f"Nucleus results could not be ingested: {report.errors}")
+    return {"message": "Extraction results fetched and stored", "predictions_written": report.predictions_written,
+            "unknown_fields": report.unknown_fields}
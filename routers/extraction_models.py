@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db, get_async_read_db
+from models.validation_models import ResultIngestionReport
+from schemas import ExtractionModelOut, ExtractionResultBatch, Page
+from services.async_service import get_extraction_model, get_extraction_models, ingest_extraction_results
+
+router = APIRouter(prefix="/models", tags=["models"])
+
+@router.get("/", response_model=Page[ExtractionModelOut])
+async def list_extraction_models(taxonomy_id: Optional[int] = None,
+                                 after_id: Optional[int] = None,
+                                 limit: int = Query(100, ge=1, le=1000),
+                                 db: AsyncSession = Depends(get_async_read_db)):
+    models = await get_extraction_models(db, taxonomy_id=taxonomy_id, limit=limit, after_id=after_id)
+    return Page[ExtractionModelOut].from_items(models, limit)
+
+@router.post("/{model_id}/results", response_model=ResultIngestionReport)
+async def ingest_results(model_id: int,
+                         batch: ExtractionResultBatch,
+                         strict: bool = False,
+                         db: AsyncSession = Depends(get_async_db)):
+    extraction_model = await get_extraction_model(db, model_id)
+    if not extraction_model:
+        raise HTTPException(status_code=404, detail="Extraction model not found")
+    try:
+        return await ingest_extraction_results(db, extraction_model,
+                                               [record.model_dump() for record in batch.results], strict=strict)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+from database import get_async_db, get_async_read_db
+from models.DataModels import JobStatus
+from services import async_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.post("/", response_model=schemas.ExtractionJobsQueued, status_code=202)
+async def queue_extraction_jobs(jobs_in: schemas.ExtractionJobCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        job_ids = await async_service.enqueue_extraction_jobs(db, jobs_in.document_ids, jobs_in.model_id,
+                                                              jobs_in.workflow_id, jobs_in.max_attempts)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return schemas.ExtractionJobsQueued(job_ids=job_ids)
+
+@router.get("/", response_model=schemas.Page[schemas.ExtractionJobOut])
+async def list_extraction_jobs(status: Optional[JobStatus] = None,
+                               document_id: Optional[int] = None,
+                               after_id: Optional[int] = None,
+                               limit: int = Query(100, ge=1, le=1000),
+                               db: AsyncSession = Depends(get_async_read_db)):
+    jobs = await async_service.get_extraction_jobs(db, status=status, document_id=document_id,
+                                                   limit=limit, after_id=after_id)
+    return schemas.Page[schemas.ExtractionJobOut].from_items(jobs, limit)
+
+@router.get("/{job_id}", response_model=schemas.ExtractionJobOut)
+async def get_extraction_job(job_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    job = await async_service.get_extraction_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_read_db
+from schemas import OrganizationOut, Page
+from services.async_service import get_organizations
+
+router = APIRouter(prefix="/organizations", tags=["organizations"])
+
+@router.get("/", response_model=Page[OrganizationOut])
+async def list_organizations(after_id: Optional[int] = None,
+                             limit: int = Query(100, ge=1, le=1000),
+                             db: AsyncSession = Depends(get_async_read_db)):
+    organizations = await get_organizations(db, limit=limit, after_id=after_id)
+    return Page[OrganizationOut].from_items(organizations, limit)
@@ -1,33 +1,48 @@
-from database import get_db
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from models import DocumentType, TaxonomyField
-from schemas import TaxonomyFieldCreate, TaxonomyFieldOut
+from database import get_async_db, get_async_read_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from functions.validation_engine import dump_validation_rules
+from models.DataModels import TaxonomyField
+from schemas import Page, TaxonomyFieldCreate, TaxonomyFieldOut, TaxonomyOut
+from services import async_service
+from services.taxonomy_cache import taxonomy_cache
 
 router = APIRouter(prefix="/taxonomy", tags=["taxonomy"])
 
+@router.get("/", response_model=Page[TaxonomyOut])
+async def list_taxonomies(organization_id: Optional[int] = None,
+                          after_id: Optional[int] = None,
+                          limit: int = Query(100, ge=1, le=1000),
+                          db: AsyncSession = Depends(get_async_read_db)):
+    taxonomies = await async_service.get_taxonomies(db, organization_id=organization_id, limit=limit, after_id=after_id)
+    return Page[TaxonomyOut].from_items(taxonomies, limit)
+
 @router.post("/", response_model=TaxonomyFieldOut)
-def create_taxonomy_field(taxonomy_in: TaxonomyFieldCreate, db: Session = Depends(get_db)):
-    doc_type = db.query(DocumentType).filter_by(id=taxonomy_in.document_type_id).first()
-    if not doc_type:
-        raise HTTPException(status_code=404, detail="DocumentType not found")
+async def create_taxonomy_field(taxonomy_in: TaxonomyFieldCreate, db: AsyncSession = Depends(get_async_db)):
+    taxonomy = await async_service.get_taxonomy(db, taxonomy_in.taxonomy_id)
+    if not taxonomy:
+        raise HTTPException(status_code=404, detail="Taxonomy not found")
 
     field = TaxonomyField(
-        document_type_id=taxonomy_in.document_type_id,
-        field_name=taxonomy_in.field_name,
+        taxonomy_id=taxonomy_in.taxonomy_id,
+        name=taxonomy_in.name,
         data_type=taxonomy_in.data_type,
+        description=taxonomy_in.description,
         is_required=taxonomy_in.is_required,
-        validation_rules=taxonomy_in.validation_rules
+        validation_rules=dump_validation_rules(taxonomy_in.validation_rules)
     )
     db.add(field)
-    db.commit()
-    db.refresh(field)
+    await db.commit()
+    await db.refresh(field)
+    taxonomy_cache.invalidate(taxonomy_in.taxonomy_id)
     return field
 
 @router.get("/{taxonomy_id}", response_model=TaxonomyFieldOut)
-def get_taxonomy_field(taxonomy_id: int, db: Session = Depends(get_db)):
-    field = db.query(TaxonomyField).filter_by(id=taxonomy_id).first()
+async def get_taxonomy_field(taxonomy_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    field = await async_service.get_taxonomy_field(db, taxonomy_id)
     if not field:
         raise HTTPException(status_code=404, detail="Field not found")
     return field
@@ -1,5 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+
+from models.DataModels import DocumentStatus, JobStatus
+
+T = TypeVar("T")
 
 class DocumentTypeCreate(BaseModel):
     name: str
@@ -14,17 +19,19 @@ class DocumentTypeOut(BaseModel):
         orm_mode = True
 
 class TaxonomyFieldCreate(BaseModel):
-    document_type_id: int
-    field_name: str
+    taxonomy_id: int
+    name: str
     data_type: str
+    description: Optional[str] = None
     is_required: bool = False
     validation_rules: Optional[str] = None
 
 class TaxonomyFieldOut(BaseModel):
     id: int
-    document_type_id: int
-    field_name: str
+    taxonomy_id: Optional[int]
+    name: str
     data_type: str
+    description: Optional[str]
     is_required: bool
     validation_rules: Optional[str]
 
@@ -32,16 +39,103 @@ class TaxonomyFieldOut(BaseModel):
         orm_mode = True
 
 class DocumentCreate(BaseModel):
-    document_type_id: int
+    name: str
+    file_path: str
+    individual_id: str
+    organization_id: int
+    taxonomy_id: Optional[int] = None
     nucleus_doc_id: Optional[str] = None
 
 class DocumentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
-    document_type_id: int
+    name: str
+    organization_id: int
+    individual_id: str
+    taxonomy_id: Optional[int]
     nucleus_doc_id: Optional[str]
-    status: str
+    is_labeled: Optional[bool]
+    status: DocumentStatus
 
-    class Config:
-        orm_mode = True
+class OrganizationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str]
+    is_active: Optional[bool]
+
+class TaxonomyOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str]
+    version: Optional[str]
+    is_active: Optional[bool]
+    organization_id: int
+
+class ExtractionModelOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str]
+    is_active: Optional[bool]
+    taxonomy_id: int
+
+class ExtractionJobCreate(BaseModel):
+    document_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    model_id: int
+    workflow_id: str
+    max_attempts: Optional[int] = Field(None, ge=1)
+
+class ExtractionJobsQueued(BaseModel):
+    job_ids: List[int]
+
+class ExtractionJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    document_id: int
+    model_id: int
+    workflow_id: str
+    status: JobStatus
+    nucleus_job_id: Optional[str]
+    attempts: int
+    max_attempts: int
+    next_run_at: datetime
+    last_error: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+
+class ExtractionResultField(BaseModel):
+    field_name: str
+    value: Optional[Any] = None
+    occurrence: int = 1
+
+class ExtractionResultRecord(BaseModel):
+    document_id: Optional[int] = None
+    nucleus_doc_id: Optional[str] = None
+    fields: List[ExtractionResultField] = []
+
+class ExtractionResultBatch(BaseModel):
+    results: List[ExtractionResultRecord]
+
+class Page(BaseModel, Generic[T]):
+    """
+    A page of a keyset-paginated listing; pass next_after_id as after_id to get the next page.
+
+    Keyset cursors seek the primary key index to the first row after the cursor, so deep pages
+    cost the same as the first one, while an offset scans and discards every skipped row.
+    """
+    items: List[T]
+    next_after_id: Optional[int] = None
+
+    @classmethod
+    def from_items(cls, items: List, limit: int) -> "Page":
+        return cls(items=items, next_after_id=items[-1].id if len(items) == limit else None)
 
 # Similarly, create schemas for ExtractionResult, Label, etc.
@@ -0,0 +1,167 @@
+# Async versions of the core service functions. Most run the sync service function through
+# AsyncSession.run_sync, so the query logic lives in one place. Lazy relationships cannot be
+# loaded from async code, so only use attributes the function loaded.
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.DataModels import (Document, DocumentStatus, ExtractionJob, ExtractionModel, JobStatus, Organization,
+                               Prediction, Taxonomy, TaxonomyField)
+from models.validation_models import ResultIngestionReport
+from services import documents, extractions, job_queue, model, organization_service, result_ingestion, taxonomy_service
+from services.taxonomy_cache import TaxonomyMetadata, taxonomy_cache
+
+
+async def get_document(db: AsyncSession, document_id: int) -> Optional[Document]:
+    """Async version of ``services.documents.get_document``."""
+    return await db.get(Document, document_id)
+
+
+async def get_documents(db: AsyncSession,
+                        organization_id: Optional[int] = None,
+                        individual_id: Optional[str] = None,
+                        skip: int = 0,
+                        limit: int = 100,
+                        after_id: Optional[int] = None) -> List[Document]:
+    """Async version of ``services.documents.get_documents``."""
+    return await db.run_sync(documents.get_documents, organization_id=organization_id,
+                             individual_id=individual_id, skip=skip, limit=limit, after_id=after_id)
+
+
+async def stream_documents(db: AsyncSession,
+                           organization_id: Optional[int] = None,
+                           status: Optional[DocumentStatus] = None,
+                           after_id: Optional[int] = None,
+                           batch_size: int = 1000) -> AsyncIterator[Document]:
+    """
+    Async version of ``services.documents.iter_documents``, streaming documents ordered by ID.
+
+    Args:
+        db (AsyncSession): Async database session
+        organization_id (Optional[int]): Filter documents by organization ID
+        status (Optional[DocumentStatus]): Filter documents by status
+        after_id (Optional[int]): Only stream documents with a greater ID
+        batch_size (int): Number of rows fetched at a time
+
+    Yields:
+        Document: The matching documents
+    """
+    stmt = select(Document)
+    if organization_id:
+        stmt = stmt.where(Document.organization_id == organization_id)
+    if status is not None:
+        stmt = stmt.where(Document.status == status)
+    if after_id is not None:
+        stmt = stmt.where(Document.id > after_id)
+    result = await db.stream_scalars(stmt.order_by(Document.id).execution_options(yield_per=batch_size))
+    async for document in result:
+        yield document
+
+
+async def get_organization(db: AsyncSession, organization_id: int) -> Optional[Organization]:
+    """Async version of ``services.organization_service.get_organization``."""
+    return await db.get(Organization, organization_id)
+
+
+async def get_organizations(db: AsyncSession,
+                            skip: int = 0,
+                            limit: int = 100,
+                            after_id: Optional[int] = None) -> List[Organization]:
+    """Async version of ``services.organization_service.get_organizations``."""
+    return await db.run_sync(organization_service.get_organizations, skip=skip, limit=limit, after_id=after_id)
+
+
+async def get_taxonomy(db: AsyncSession, taxonomy_id: int) -> Optional[Taxonomy]:
+    """Async version of ``services.taxonomy_service.get_taxonomy``."""
+    return await db.get(Taxonomy, taxonomy_id)
+
+
+async def get_taxonomies(db: AsyncSession,
+                         organization_id: Optional[int] = None,
+                         skip: int = 0,
+                         limit: int = 100,
+                         after_id: Optional[int] = None) -> List[Taxonomy]:
+    """Async version of ``services.taxonomy_service.get_taxonomies``."""
+    return await db.run_sync(taxonomy_service.get_taxonomies, organization_id=organization_id,
+                             skip=skip, limit=limit, after_id=after_id)
+
+
+async def get_taxonomy_field(db: AsyncSession, field_id: int) -> Optional[TaxonomyField]:
+    """Get a taxonomy field by ID."""
+    return await db.get(TaxonomyField, field_id)
+
+
+async def get_taxonomy_metadata(db: AsyncSession, taxonomy_id: int) -> Optional[TaxonomyMetadata]:
+    """Get the cached field metadata of a taxonomy, see ``services.taxonomy_cache``."""
+    return await db.run_sync(taxonomy_cache.get, taxonomy_id)
+
+
+async def get_field_id_map(db: AsyncSession, taxonomy_id: int) -> Dict[str, int]:
+    """Async version of ``services.taxonomy_service.get_field_id_map``."""
+    return await db.run_sync(taxonomy_service.get_field_id_map, taxonomy_id)
+
+
+async def get_required_field_names(db: AsyncSession, taxonomy_id: int) -> Set[str]:
+    """Async version of ``services.taxonomy_service.get_required_field_names``."""
+    return await db.run_sync(taxonomy_service.get_required_field_names, taxonomy_id)
+
+
+async def get_extraction_model(db: AsyncSession, model_id: int) -> Optional[ExtractionModel]:
+    """Async version of ``services.model.get_extraction_model``."""
+    return await db.get(ExtractionModel, model_id)
+
+
+async def get_extraction_models(db: AsyncSession,
+                                taxonomy_id: Optional[int] = None,
+                                skip: int = 0,
+                                limit: int = 100,
+                                after_id: Optional[int] = None) -> List[ExtractionModel]:
+    """Async version of ``services.model.get_extraction_models``."""
+    return await db.run_sync(model.get_extraction_models, taxonomy_id=taxonomy_id,
+                             skip=skip, limit=limit, after_id=after_id)
+
+
+async def get_predictions_for_document_and_model(db: AsyncSession, document_id: int, model_id: int) -> List[Prediction]:
+    """Async version of ``services.extractions.get_predictions_for_document_and_model``."""
+    return await db.run_sync(extractions.get_predictions_for_document_and_model, document_id, model_id)
+
+
+async def add_predictions(db: AsyncSession,
+                          extraction_model: ExtractionModel,
+                          document: Document,
+                          predictions: Dict[str, str]) -> bool:
+    """Async version of ``services.extractions.add_predictions``."""
+    return await db.run_sync(extractions.add_predictions, extraction_model, document, predictions)
+
+
+async def ingest_extraction_results(db: AsyncSession,
+                                    extraction_model: ExtractionModel,
+                                    records: Iterable[Dict[str, Any]],
+                                    strict: bool = False) -> ResultIngestionReport:
+    """Async version of ``services.result_ingestion.ingest_extraction_results``."""
+    return await db.run_sync(result_ingestion.ingest_extraction_results, extraction_model, records, strict)
+
+
+async def enqueue_extraction_jobs(db: AsyncSession,
+                                  document_ids: List[int],
+                                  model_id: int,
+                                  workflow_id: str,
+                                  max_attempts: Optional[int] = None) -> List[int]:
+    """Async version of ``services.job_queue.enqueue_extraction_jobs``."""
+    return await db.run_sync(job_queue.enqueue_extraction_jobs, document_ids, model_id, workflow_id, max_attempts)
+
+
+async def get_extraction_job(db: AsyncSession, job_id: int) -> Optional[ExtractionJob]:
+    """Async version of ``services.job_queue.get_extraction_job``."""
+    return await db.get(ExtractionJob, job_id)
+
+
+async def get_extraction_jobs(db: AsyncSession,
+                              status: Optional[JobStatus] = None,
+                              document_id: Optional[int] = None,
+                              limit: int = 100,
+                              after_id: Optional[int] = None) -> List[ExtractionJob]:
+    """Async version of ``services.job_queue.get_extraction_jobs``."""
+    return await db.run_sync(job_queue.get_extraction_jobs, status=status, document_id=document_id,
+                             limit=limit, after_id=after_id)
@@ -0,0 +1,40 @@
+from typing import Any, Dict, Hashable, Iterable, Mapping
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+
+def upsert_rows(
+    db: Session,
+    table: Table,
+    constraint: str,
+    rows: Mapping[Hashable, Dict[str, Any]],
+    update_columns: Iterable[str]
+) -> int:
+    """
+    Insert rows or update the listed columns of the rows that already exist, in one INSERT ... ON CONFLICT.
+
+    ``rows`` is keyed by the conflict target of ``constraint`` so a key given twice keeps its last values;
+    a single INSERT ... ON CONFLICT cannot touch the same row twice. The rows are sent as executemany,
+    so the compiled statement is cached and the driver pages the rows. Does not commit.
+
+    Args:
+        db (Session): Database session
+        table (Table): Table to upsert into
+        constraint (str): Name of the unique constraint the rows conflict on
+        rows (Mapping[Hashable, Dict[str, Any]]): Column values of each row, keyed by its conflict target
+        update_columns (Iterable[str]): Columns overwritten with the new values when the row exists
+
+    Returns:
+        int: Number of rows sent
+    """
+    if not rows:
+        return 0
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    db.execute(stmt, list(rows.values()))
+    return len(rows)
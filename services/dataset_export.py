@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, and_, select, union
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.DataModels import Document, FieldLabel, Prediction, TaxonomyField
+from models.validation_models import DatasetExportReport
+from services.taxonomy_cache import taxonomy_cache
+
+EXPORT_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".jsonl": "jsonl"}
+LAYOUTS = ("long", "wide")
+PREDICTION_SUFFIX = "_prediction"
+
+
+def dataset_query(taxonomy_id: int,
+                  model_id: Optional[int] = None,
+                  since: Optional[datetime] = None,
+                  organization_id: Optional[int] = None) -> Select:
+    """
+    Build the query of a labelled dataset: one row per label, with the model's prediction for it.
+
+    Rows are ordered by document and field, so the rows of a document are contiguous and the
+    order follows the ``uq_document_field`` index. With ``since``, only documents with a label
+    written, or a prediction of the model created, after that time are included, with all their
+    labels.
+
+    Args:
+        taxonomy_id (int): ID of the taxonomy whose labels are exported
+        model_id (Optional[int]): ID of the extraction model whose predictions are joined in
+        since (Optional[datetime]): Only include documents changed after this UTC time
+        organization_id (Optional[int]): Only include documents of this organization
+
+    Returns:
+        Select: The query
+    """
+    columns = [
+        FieldLabel.document_id,
+        Document.name.label("document_name"),
+        Document.individual_id,
+        FieldLabel.field_name,
+        FieldLabel.value.label("label"),
+        FieldLabel.updated_at.label("label_updated_at"),
+    ]
+    if model_id is not None:
+        columns += [Prediction.value.label("prediction"), Prediction.created_at.label("prediction_created_at")]
+
+    stmt = (
+        select(*columns)
+        .join(Document, Document.id == FieldLabel.document_id)
+        .join(TaxonomyField, TaxonomyField.id == FieldLabel.field_id)
+        .where(TaxonomyField.taxonomy_id == taxonomy_id)
+    )
+    if model_id is not None:
+        stmt = stmt.outerjoin(Prediction, and_(Prediction.document_id == FieldLabel.document_id,
+                                               Prediction.field_id == FieldLabel.field_id,
+                                               Prediction.model_id == model_id))
+    if organization_id:
+        stmt = stmt.where(Document.organization_id == organization_id)
+    if since is not None:
+        changed = select(FieldLabel.document_id).where(FieldLabel.updated_at > since)
+        if model_id is not None:
+            changed = union(changed, select(Prediction.document_id).where(Prediction.model_id == model_id,
+                                                                          Prediction.created_at > since))
+        stmt = stmt.where(FieldLabel.document_id.in_(changed))
+    return stmt.order_by(FieldLabel.document_id, FieldLabel.field_id)
+
+
+def iter_dataset_batches(db: Session, stmt: Select, batch_size: int = 10000) -> Iterator[Sequence[Row]]:
+    """
+    Stream the rows of a dataset query in batches through a server-side cursor.
+
+    Args:
+        db (Session): Database session
+        stmt (Select): Query as built by ``dataset_query``
+        batch_size (int): Number of rows fetched at a time
+
+    Yields:
+        Sequence[Row]: The next batch of plain rows; no ORM objects are built
+    """
+    result = db.execute(stmt, execution_options={"yield_per": batch_size})
+    yield from result.partitions()
+
+
+def pivot_batches(batches: Iterator[Sequence[Row]], with_predictions: bool) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Pivot batches of label rows into one row per document, with a column per field.
+
+    A document whose rows span two batches is held back until its last row has been seen,
+    so every document is emitted exactly once. Predictions go to ``<field>_prediction`` columns
+    and ``updated_at`` is the latest label or prediction time of the document.
+
+    Args:
+        batches (Iterator[Sequence[Row]]): Label rows ordered by document, see ``iter_dataset_batches``
+        with_predictions (bool): Whether the rows carry predictions
+
+    Yields:
+        List[Dict[str, Any]]: The documents completed by each batch
+    """
+    current: Optional[Dict[str, Any]] = None
+    for rows in batches:
+        completed = []
+        for row in rows:
+            if current is None or current["document_id"] != row.document_id:
+                if current is not None:
+                    completed.append(current)
+                current = {"document_id": row.document_id, "document_name": row.document_name,
+                           "individual_id": row.individual_id, "updated_at": row.label_updated_at}
+            current[row.field_name] = row.label
+            updated = [current["updated_at"], row.label_updated_at]
+            if with_predictions:
+                current[row.field_name + PREDICTION_SUFFIX] = row.prediction
+                updated.append(row.prediction_created_at)
+            current["updated_at"] = max((value for value in updated if value is not None), default=None)
+        if completed:
+            yield completed
+    if current is not None:
+        yield [current]
+
+
+def _arrow_schema(layout: str, field_names: List[str], with_predictions: bool):
+    import pyarrow as pa
+
+    columns = [("document_id", pa.int64()), ("document_name", pa.string()), ("individual_id", pa.string())]
+    if layout == "long":
+        columns += [("field_name", pa.string()), ("label", pa.string()), ("label_updated_at", pa.timestamp("us"))]
+        if with_predictions:
+            columns += [("prediction", pa.string()), ("prediction_created_at", pa.timestamp("us"))]
+    else:
+        columns.append(("updated_at", pa.timestamp("us")))
+        for field_name in field_names:
+            columns.append((field_name, pa.string()))
+            if with_predictions:
+                columns.append((field_name + PREDICTION_SUFFIX, pa.string()))
+    return pa.schema(columns)
+
+
+class _DatasetWriter:
+    """Writes record batches to a Parquet, Arrow IPC or JSON Lines file."""
+
+    def __init__(self, path: str, export_format: str, schema):
+        self.format = export_format
+        self.schema = schema
+        if export_format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, schema, compression="zstd")
+        elif export_format == "arrow":
+            import pyarrow as pa
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    def write_rows(self, rows: Sequence[Row]) -> None:
+        if self.format == "jsonl":
+            self.write_dicts([row._asdict() for row in rows])
+            return
+        import pyarrow as pa
+        columns = list(zip(*rows))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)], schema=self.schema))
+
+    def write_dicts(self, rows: List[Dict[str, Any]]) -> None:
+        if self.format == "jsonl":
+            self._file.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+            return
+        import pyarrow as pa
+        self._writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        if self.format == "jsonl":
+            self._file.close()
+        else:
+            self._writer.close()
+            if self.format == "arrow":
+                self._sink.close()
+
+
+def export_dataset(db: Session,
+                   path: str,
+                   taxonomy_id: int,
+                   model_id: Optional[int] = None,
+                   since: Optional[datetime] = None,
+                   layout: str = "long",
+                   organization_id: Optional[int] = None,
+                   batch_size: int = 10000) -> DatasetExportReport:
+    """
+    Export the labels of a taxonomy, and optionally a model's predictions, to a file.
+
+    Rows are streamed from a server-side cursor in batches of ``batch_size`` and written batch
+    by batch, so neither ORM objects nor the whole dataset are held in memory. The format
+    follows the file extension: ``.parquet``, ``.arrow``/``.feather`` (Arrow IPC) or ``.jsonl``.
+
+    - ``long`` layout: one row per label with ``field_name``, ``label`` and, with a model,
+      ``prediction``
+    - ``wide`` layout: one row per document with a column per taxonomy field and, with a
+      model, a ``<field>_prediction`` column per field
+
+    The file is written under a temporary name and moved into place when complete.
+
+    An incremental export with ``since`` also includes documents changed up to
+    ``settings.WATERMARK_OVERLAP_SECONDS`` before it, so rows committed late by transactions
+    still open at the previous export are not missed. Consecutive exports can therefore
+    repeat a document; apply them by ``document_id``.
+
+    Args:
+        db (Session): Database session
+        path (str): Output file
+        taxonomy_id (int): ID of the taxonomy whose labels are exported
+        model_id (Optional[int]): ID of the extraction model whose predictions are included
+        since (Optional[datetime]): Only export documents changed after this UTC time,
+            e.g. ``exported_at`` of the previous report
+        layout (str): "long" or "wide"
+        organization_id (Optional[int]): Only export documents of this organization
+        batch_size (int): Number of rows fetched and written at a time
+
+    Returns:
+        DatasetExportReport: Row and document counts, and the time to use as the next ``since``
+
+    Raises:
+        ValueError: If the layout, the file extension or the taxonomy is unknown
+    """
+    started = time.perf_counter()
+    exported_at = datetime.utcnow()
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {LAYOUTS}")
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export file type '{extension}', expected one of {sorted(EXPORT_FORMATS)}")
+    metadata = taxonomy_cache.get(db, taxonomy_id)
+    if metadata is None:
+        raise ValueError(f"Taxonomy with ID {taxonomy_id} not found")
+
+    with_predictions = model_id is not None
+    report = DatasetExportReport(taxonomy_id=taxonomy_id, model_id=model_id, layout=layout,
+                                 format=EXPORT_FORMATS[extension], path=path, since=since, exported_at=exported_at)
+    schema = _arrow_schema(layout, sorted(metadata.field_ids), with_predictions) if report.format != "jsonl" else None
+
+    changed_since = since - timedelta(seconds=settings.WATERMARK_OVERLAP_SECONDS) if since is not None else None
+    batches = iter_dataset_batches(db, dataset_query(taxonomy_id, model_id, changed_since, organization_id), batch_size)
+    temporary_path = f"{path}.tmp"
+    writer = _DatasetWriter(temporary_path, report.format, schema)
+    try:
+        if layout == "long":
+            last_document_id = None
+            for rows in batches:
+                writer.write_rows(rows)
+                report.rows += len(rows)
+                for row in rows:
+                    if row.document_id != last_document_id:
+                        report.documents += 1
+                        last_document_id = row.document_id
+        else:
+            for documents in pivot_batches(batches, with_predictions):
+                writer.write_dicts(documents)
+                report.rows += len(documents)
+                report.documents += len(documents)
+    except BaseException:
+        writer.close()
+        os.remove(temporary_path)
+        raise
+    writer.close()
+    os.replace(temporary_path, path)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export a labelled dataset to Parquet, Arrow or JSON Lines.")
+    parser.add_argument("output", help="Output file, its extension selects the format")
+    parser.add_argument("--taxonomy-id", type=int, required=True)
+    parser.add_argument("--model-id", type=int, help="Include this model's predictions")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only export documents changed after this UTC time")
+    parser.add_argument("--layout", choices=LAYOUTS, default="long")
+    parser.add_argument("--organization-id", type=int)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    from database import session_scope
+    with session_scope(read_only=True) as db:
+        report = export_dataset(db, args.output, args.taxonomy_id, model_id=args.model_id, since=args.since,
+                                layout=args.layout, organization_id=args.organization_id, batch_size=args.batch_size)
+    print(report)
+    print(f"Next incremental export: --since {report.exported_at.isoformat()}")
+
+
+if __name__ == "__main__":
+    main()
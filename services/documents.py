@@ -1,19 +1,28 @@
-import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from models.DataModels import Prediction, TaxonomyField, Document, FieldLabel
-from typing import List, Optional, Dict
+from models.DataModels import Prediction, Document, DocumentStatus, FieldLabel
+from models.validation_models import IngestionReport, LabelImportConfig, LabelImportReport
+from services.bulk_upsert import upsert_rows
+from services.ingestion import ingest_folder
+from services.storage import ensure_blobs, release_blob, store_file
+from services.taxonomy_service import get_field_id_map, get_required_field_names
+from typing import Any, Iterable, Iterator, List, Optional, Dict, Set, Tuple
 import os
-import shutil
 
 def upload_document(
     db: Session,
     organization_id: int,
     file_path: str,
     individual_id: str,
-    name: Optional[str] = None
+    name: Optional[str] = None,
+    link_mode: str = "reflink"
 ) -> Document:
     """
     Upload a document for an organization.
+
+    The file is stored once per distinct content in the content-addressed blob store;
+    re-uploading the same content only adds a new document pointing at the existing blob.
     
     Args:
         db (Session): Database session
@@ -21,6 +30,7 @@ def upload_document(
         file_path (str): Path to the source document file
         individual_id (str): Unique identifier for the individual associated with document
         name (Optional[str]): Name for the document, defaults to filename if not provided
+        link_mode (str): How a new blob is created, see ``services.storage.store_file``
         
     Returns:
         Document: Created document object
@@ -28,38 +38,29 @@ def upload_document(
     if name is None:
         name = os.path.basename(file_path)
         
-    # Copy file to storage location
-    storage_path = f"storage/org_{organization_id}/{name}"
-    os.makedirs(os.path.dirname(storage_path), exist_ok=True)
-    shutil.copy2(file_path, storage_path)
+    # Store file content in the blob store
+    content_hash, storage_path, _, _ = store_file(file_path, link_mode=link_mode)
     
     document = Document(
         name=name,
         file_path=storage_path,
+        content_hash=content_hash,
         individual_id=individual_id,
         organization_id=organization_id
     )
+    errors = ensure_blobs(db, {content_hash: file_path}, link_mode)
+    if errors:
+        db.rollback()
+        raise ValueError(f"Blob of '{file_path}' could not be stored: {errors[content_hash]}")
     db.add(document)
     db.commit()
     db.refresh(document)
     return document
 
 
-def upload_documents_from_folder(db: Session, folder_path: str, organization_id: int):
-    """Process all documents in a folder"""
-
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith(('.pdf', '.jpg', '.png', '.txt')):
-            file_path = os.path.join(folder_path, file_name)
-
-            # Upload document to our system
-            upload_document(
-                db=db,
-                organization_id=organization_id,
-                file_path=file_path,
-                individual_id="default",  # You might want to specify this based on your needs
-                name=file_name
-            )
+def upload_documents_from_folder(db: Session, folder_path: str, organization_id: int, **ingest_kwargs) -> IngestionReport:
+    """Process all documents in a folder, see ``services.ingestion.ingest_folder`` for the options"""
+    return ingest_folder(db=db, folder_path=folder_path, organization_id=organization_id, **ingest_kwargs)
 
 
 def get_document(db: Session, document_id: int) -> Optional[Document]:
@@ -80,17 +81,19 @@ def get_documents(
     organization_id: Optional[int] = None,
     individual_id: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None
 ) -> List[Document]:
     """
-    Get a list of documents with optional filtering.
+    Get a list of documents with optional filtering, ordered by ID.
     
     Args:
         db (Session): Database session
         organization_id (Optional[int]): Filter documents by organization ID
         individual_id (Optional[str]): Filter documents by individual ID
-        skip (int): Number of records to skip
+        skip (int): Number of records to skip, ignored with after_id
         limit (int): Maximum number of records to return
+        after_id (Optional[int]): Keyset cursor, only return records with a greater ID; see ``schemas.Page``
         
     Returns:
         List[Document]: List of document objects
@@ -100,7 +103,50 @@ def get_documents(
         query = query.filter(Document.organization_id == organization_id)
     if individual_id:
         query = query.filter(Document.individual_id == individual_id)
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(Document.id)
+    if after_id is not None:
+        query = query.filter(Document.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def iter_documents(
+    db: Session,
+    organization_id: Optional[int] = None,
+    individual_id: Optional[str] = None,
+    status: Optional[DocumentStatus] = None,
+    after_id: Optional[int] = None,
+    batch_size: int = 1000
+) -> Iterator[Document]:
+    """
+    Stream documents ordered by ID for batch jobs, fetching ``batch_size`` rows at a time
+    through a server-side cursor instead of loading the whole result.
+
+    The cursor is closed when the transaction ends, so do not commit the session while
+    iterating; use a separate session for writes.
+
+    Args:
+        db (Session): Database session
+        organization_id (Optional[int]): Filter documents by organization ID
+        individual_id (Optional[str]): Filter documents by individual ID
+        status (Optional[DocumentStatus]): Filter documents by status
+        after_id (Optional[int]): Only stream documents with a greater ID, e.g. to resume a job
+        batch_size (int): Number of rows fetched and turned into objects at a time
+
+    Yields:
+        Document: The matching documents
+    """
+    stmt = select(Document)
+    if organization_id:
+        stmt = stmt.where(Document.organization_id == organization_id)
+    if individual_id:
+        stmt = stmt.where(Document.individual_id == individual_id)
+    if status is not None:
+        stmt = stmt.where(Document.status == status)
+    if after_id is not None:
+        stmt = stmt.where(Document.id > after_id)
+    stmt = stmt.order_by(Document.id).execution_options(yield_per=batch_size)
+    yield from db.scalars(stmt)
 
 def update_document(
     db: Session,
@@ -143,11 +189,16 @@ def delete_document(db: Session, document_id: int) -> bool:
     """
     document = get_document(db, document_id)
     if document:
-        # Delete physical file
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
+        content_hash = document.content_hash
+        file_path = document.file_path
         db.delete(document)
         db.commit()
+
+        # Delete physical file: blobs only once no other document shares them
+        if content_hash:
+            release_blob(db, content_hash)
+        elif os.path.exists(file_path):
+            os.remove(file_path)
         return True
     return False
 
@@ -205,14 +256,11 @@ def assign_labels(
     if not document:
         return False
         
-    # Get all required fields for the taxonomy
-    required_fields = db.query(TaxonomyField).filter(
-        TaxonomyField.taxonomy_id == taxonomy_id,
-        TaxonomyField.is_required == True
-    ).all()
+    # Get the required fields and field IDs of the taxonomy from the cache
+    field_ids = get_field_id_map(db, taxonomy_id)
+    required_field_names = get_required_field_names(db, taxonomy_id)
     
     # Verify all required fields are present
-    required_field_names = {field.name for field in required_fields}
     provided_field_names = set(labels.keys())
     missing_fields = required_field_names - provided_field_names
     
@@ -224,16 +272,13 @@ def assign_labels(
     
     # Create new labels
     for field_name, value in labels.items():
-        field = db.query(TaxonomyField).filter(
-            TaxonomyField.taxonomy_id == taxonomy_id,
-            TaxonomyField.name == field_name
-        ).first()
+        field_id = field_ids.get(field_name)
         
-        if field:
+        if field_id is not None:
             label = FieldLabel(
                 document_id=document_id,
-                field_id=field.id,
-                field_name=field.name,
+                field_id=field_id,
+                field_name=field_name,
                 value=value
             )
             db.add(label)
@@ -244,6 +289,102 @@ def assign_labels(
     return True
 
 
+def assign_labels_bulk(
+    db: Session,
+    taxonomy_id: int,
+    labels: Iterable[Tuple[int, Dict[str, str]]],
+    batch_size: int = 500
+) -> Dict[str, Any]:
+    """
+    Assign labels to many documents at once according to a taxonomy.
+
+    The taxonomy's field map is resolved once, labels are written with a batched
+    upsert on the ``uq_document_field`` constraint and the session is committed once
+    per ``batch_size`` documents. Unknown field names are skipped, as in ``assign_labels``.
+
+    Args:
+        db (Session): Database session
+        taxonomy_id (int): ID of the taxonomy to use
+        labels (Iterable[Tuple[int, Dict[str, str]]]): Pairs of document ID and a dictionary
+            mapping field names to label values
+        batch_size (int): Number of documents written per transaction
+
+    Returns:
+        Dict[str, Any]: Counts of ``succeeded`` and ``failed`` documents, and ``errors``
+            mapping each failed document ID to the reason it failed
+    """
+    field_ids = get_field_id_map(db, taxonomy_id)
+    required_field_names = get_required_field_names(db, taxonomy_id)
+    result = {"succeeded": 0, "failed": 0, "errors": {}}
+
+    batch = []
+    for document_id, document_labels in labels:
+        batch.append((document_id, document_labels))
+        if len(batch) >= batch_size:
+            _write_label_batch(db, taxonomy_id, field_ids, required_field_names, batch, result)
+            batch = []
+    if batch:
+        _write_label_batch(db, taxonomy_id, field_ids, required_field_names, batch, result)
+
+    return result
+
+
+def _write_label_batch(
+    db: Session,
+    taxonomy_id: int,
+    field_ids: Dict[str, int],
+    required_field_names: Set[str],
+    batch: List[Tuple[int, Dict[str, str]]],
+    result: Dict[str, Any]
+) -> None:
+    """Validate and upsert one batch of document labels, then commit it."""
+    existing_ids = {
+        document_id for (document_id,) in db.query(Document.id).filter(
+            Document.id.in_({document_id for document_id, _ in batch})
+        ).all()
+    }
+
+    rows = {}
+    labelled_ids = set()
+    for document_id, document_labels in batch:
+        if document_id not in existing_ids:
+            result["errors"][document_id] = "Document not found"
+            continue
+        missing_fields = required_field_names - set(document_labels.keys())
+        if missing_fields:
+            result["errors"][document_id] = f"Missing required fields: {missing_fields}"
+            continue
+
+        for field_name, value in document_labels.items():
+            field_id = field_ids.get(field_name)
+            if field_id is not None:
+                rows[(document_id, field_id)] = {
+                    "document_id": document_id,
+                    "field_id": field_id,
+                    "field_name": field_name,
+                    "value": value,
+                    "occurrence": 1
+                }
+        labelled_ids.add(document_id)
+
+    try:
+        upsert_rows(db, FieldLabel.__table__, "uq_document_field", rows,
+                    ("value", "field_name", "occurrence", "updated_at"))
+        if labelled_ids:
+            db.query(Document).filter(Document.id.in_(labelled_ids)).update(
+                {Document.taxonomy_id: taxonomy_id, Document.is_labeled: True},
+                synchronize_session=False
+            )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        for document_id in labelled_ids:
+            result["errors"][document_id] = str(e)
+        labelled_ids = set()
+
+    failed_ids = {document_id for document_id, _ in batch} - labelled_ids
+    result["succeeded"] += len(labelled_ids)
+    result["failed"] += len(failed_ids)
 
 
 def assign_extraction_values(
@@ -272,14 +413,11 @@ def assign_extraction_values(
     if not document:
         return False
         
-    # Get all required fields for the taxonomy
-    required_fields = db.query(TaxonomyField).filter(
-        TaxonomyField.taxonomy_id == taxonomy_id,
-        TaxonomyField.is_required == True
-    ).all()
+    # Get the required fields and field IDs of the taxonomy from the cache
+    field_ids = get_field_id_map(db, taxonomy_id)
+    required_field_names = get_required_field_names(db, taxonomy_id)
     
     # Verify all required fields are present
-    required_field_names = {field.name for field in required_fields}
     provided_field_names = set(extraction_values.keys())
     missing_fields = required_field_names - provided_field_names
     
@@ -292,16 +430,14 @@ def assign_extraction_values(
     
     # Create new extraction values
     for field_name, value in extraction_values.items():
-        field = db.query(TaxonomyField).filter(
-            TaxonomyField.taxonomy_id == taxonomy_id,
-            TaxonomyField.name == field_name
-        ).first()
+        field_id = field_ids.get(field_name)
         
-        if field:
+        if field_id is not None:
             extraction_value = Prediction(
                 document_id=document_id,
-                field_id=field.id,
-                field_name=field.name,
+                model_id=model_id,
+                field_id=field_id,
+                field_name=field_name,
                 value=value,
                 occurrence=1
             )
@@ -313,28 +449,30 @@ def assign_extraction_values(
     return True
 
 
-def apply_labels_from_excel(db: Session, excel_path: str, document_mapping: List[Dict], taxonomy_id: int):
-    """Apply labels from Excel file to documents"""
-    # Read Excel file containing labels
-    df = pd.read_excel(excel_path)
+def apply_labels_from_excel(db: Session,
+                            excel_path: str,
+                            document_mapping: List[Dict],
+                            taxonomy_id: int,
+                            **import_kwargs) -> LabelImportReport:
+    """
+    Apply labels from an Excel file to documents.
 
-    # Create a mapping of filenames to document IDs
-    filename_to_doc_id = {doc["file_name"]: doc["document_id"] for doc in document_mapping}
+    The file is streamed by ``services.label_import.import_labels``; every column named like a
+    taxonomy field is imported and rows are matched to documents by their ``file_name`` column.
 
-    for _, row in df.iterrows():
-        document_id = filename_to_doc_id.get(row['file_name'])
-        if document_id:
-            # Create labels dictionary from Excel columns
-            labels = {
-                "document_type": row['document_type'],
-                "issue_date": row['issue_date'].strftime('%Y-%m-%d'),
-                "reference_number": row['reference_number']
-            }
-
-            # Assign labels to document
-            assign_labels(
-                db=db,
-                document_id=document_id,
-                taxonomy_id=taxonomy_id,
-                labels=labels
-            )
+    Args:
+        db (Session): Database session
+        excel_path (str): Path to the XLSX file
+        document_mapping (List[Dict]): Dictionaries with the ``file_name`` and ``document_id`` of each document
+        taxonomy_id (int): ID of the taxonomy to use
+        **import_kwargs: Options passed to ``import_labels``, e.g. ``rejected_rows_path``
+
+    Returns:
+        LabelImportReport: Row counts and rejection reasons
+    """
+    # Imported here, services.label_import writes through assign_labels_bulk of this module
+    from services.label_import import import_labels
+
+    filename_to_doc_id = {doc["file_name"]: doc["document_id"] for doc in document_mapping}
+    return import_labels(db, excel_path, taxonomy_id, config=LabelImportConfig(document_column="file_name"),
+                         document_mapping=filename_to_doc_id, **import_kwargs)
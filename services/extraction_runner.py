@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, engine
+from functions.extractors import DocumentExtractor
+from functions.post_processing import PostProcessor
+from models.DataModels import Document, ExtractionModel
+from models.validation_models import ExtractionRunReport
+from services.extractions import PredictionWriter
+
+RUN_MODES = ("thread", "process")
+
+# Each worker thread (or process) keeps its own session
+_worker_state = threading.local()
+
+
+def _init_process_worker():
+    # A forked worker must not reuse the connections pooled by the parent process
+    engine.dispose(close=False)
+
+
+def _worker_session() -> Session:
+    db = getattr(_worker_state, "db", None)
+    if db is None:
+        db = SessionLocal()
+        _worker_state.db = db
+    return db
+
+
+def _extract_document(document_id: int,
+                      model_id: int,
+                      extractor: DocumentExtractor,
+                      post_processor: PostProcessor,
+                      extractor_kwargs: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, str]], Optional[str]]:
+    """
+    Run extraction and post-processing for one document inside a worker.
+
+    Returns:
+        Tuple[int, Optional[Dict[str, str]], Optional[str]]: Document ID, post-processed
+            predictions and an error message if the document failed
+    """
+    db = _worker_session()
+    try:
+        document = db.get(Document, document_id)
+        if document is None:
+            return document_id, None, "Document not found"
+        extraction_model = db.get(ExtractionModel, model_id)
+        predictions = extractor.extract(document, extraction_model, **extractor_kwargs)
+        predictions = post_processor.process(predictions=predictions)
+        return document_id, predictions, None
+    except Exception as e:
+        return document_id, None, f"{type(e).__name__}: {e}"
+    finally:
+        # Release the connection and identity map; the session is reused for the next document
+        db.close()
+
+
+def _create_executor(mode: str, max_workers: Optional[int]) -> Executor:
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_process_worker)
+    raise ValueError(f"Unknown run mode '{mode}', expected one of {RUN_MODES}")
+
+
+def run_extraction(db: Session,
+                   extraction_model: ExtractionModel,
+                   document_ids: Iterable[int],
+                   extractor: DocumentExtractor,
+                   post_processor: PostProcessor,
+                   mode: str = "thread",
+                   max_workers: Optional[int] = None,
+                   batch_size: int = 500,
+                   extractor_kwargs: Optional[Dict[int, Dict[str, Any]]] = None) -> ExtractionRunReport:
+    """
+    Run an extractor over a set of documents in parallel and store the predictions.
+
+    Extraction and post-processing run in a thread or process pool, each worker with its
+    own ``SessionLocal`` session. Predictions are written from the calling session through
+    a ``PredictionWriter``, so database writes stay batched. In ``process`` mode the
+    extractor and post-processor must be picklable (no lambdas in the post-processing
+    operations).
+
+    Args:
+        db (Session): Database session used for writing predictions
+        extraction_model (ExtractionModel): The model the predictions belong to
+        document_ids (Iterable[int]): IDs of the documents to extract
+        extractor (DocumentExtractor): Extractor to run on each document
+        post_processor (PostProcessor): Post-processor applied to each document's predictions
+        mode (str): "thread" for I/O-bound extractors, "process" for CPU-bound ones
+        max_workers (Optional[int]): Number of workers, defaults to the executor's default
+        batch_size (int): Number of documents per prediction write batch
+        extractor_kwargs (Optional[Dict[int, Dict[str, Any]]]): Extra keyword arguments
+            for the extractor, keyed by document ID
+
+    Returns:
+        ExtractionRunReport: Document counts, per-document errors and throughput of the run
+    """
+    extractor_kwargs = extractor_kwargs or {}
+    errors = {}
+    total = 0
+    started = time.perf_counter()
+
+    with _create_executor(mode, max_workers) as executor:
+        # Bound the number of in-flight documents so large document sets are streamed
+        max_in_flight = (max_workers or os.cpu_count() or 1) * 4
+        in_flight = {}
+        writer = PredictionWriter(db, extraction_model, batch_size=batch_size)
+
+        def write(call, *args):
+            try:
+                call(*args)
+            except SQLAlchemyError as e:
+                # The buffered documents were not written; record them and carry on with the run
+                db.rollback()
+                for failed_id in writer.discard():
+                    errors[failed_id] = f"Writing predictions failed: {type(e).__name__}: {e}"
+
+        def collect(futures):
+            for future in futures:
+                document_id = in_flight.pop(future)
+                try:
+                    _, predictions, error = future.result()
+                except Exception as e:
+                    # Raised outside the worker's own handling, e.g. BrokenProcessPool or a pickling error
+                    errors[document_id] = f"{type(e).__name__}: {e}"
+                    continue
+                if error is None and predictions:
+                    try:
+                        write(writer.add, document_id, predictions)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    errors[document_id] = error
+
+        for document_id in document_ids:
+            total += 1
+            try:
+                future = executor.submit(_extract_document,
+                                         document_id,
+                                         extraction_model.id,
+                                         extractor,
+                                         post_processor,
+                                         extractor_kwargs.get(document_id, {}))
+            except BrokenExecutor as e:
+                errors[document_id] = f"{type(e).__name__}: {e}"
+                continue
+            in_flight[future] = document_id
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        collect(list(in_flight))
+        write(writer.flush)
+
+    elapsed = time.perf_counter() - started
+    return ExtractionRunReport(model_id=extraction_model.id,
+                               mode=mode,
+                               documents_total=total,
+                               documents_succeeded=total - len(errors),
+                               documents_failed=len(errors),
+                               errors=errors,
+                               elapsed_seconds=elapsed,
+                               documents_per_second=total / elapsed if elapsed > 0 else 0.0)
@@ -1,48 +1,158 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 
 from functions.extractors import DocumentExtractor
 from functions.post_processing import PostProcessor
-from models.DataModels import Prediction, TaxonomyField, ExtractionModel, Document
+from models.DataModels import Prediction, ExtractionModel, Document
+from services.taxonomy_service import get_field_id_map
 
 
-def add_predictions(db: Session, model: ExtractionModel, document: Document, predictions: Dict[str, str]) -> bool:
+class PredictionWriter:
     """
-    Add predictions for a document using an extraction model.
+    Batching writer for the predictions of one extraction model.
+
+    Predictions are buffered per document and written set-based: one DELETE of the
+    buffered documents' existing predictions followed by one multi-row INSERT, committed
+    once per batch. Field-name to field-ID maps are cached per taxonomy for the lifetime
+    of the writer.
     """
-    # Check for existing predictions and delete them if present
-    existing_predictions = db.query(Prediction).filter(
-        Prediction.model_id == model.id,
-        Prediction.document_id == document.id
-    ).all()
-    
-    for prediction in existing_predictions:
-        db.delete(prediction)
-    
-    # Create new predictions
-    for field_name, value in predictions.items():
-        field_id = db.query(TaxonomyField.id).filter(
-            TaxonomyField.name == field_name,
-            TaxonomyField.taxonomy_id == model.taxonomy.id
-        ).first()[0]
-        
-        if field_id is None:
-            raise ValueError(f"Field '{field_name}' not found for model ID '{model.id}'")
-
-        new_prediction = Prediction(
-            model_id=model.id,
-            document_id=document.id,
-            field_id=field_id,
-            field_name=field_name,
-            value=value,
-            occurrence = 1
+
+    def __init__(self, db: Session, model: ExtractionModel, batch_size: int = 500):
+        self.db = db
+        self.model = model
+        self.batch_size = batch_size
+        self.documents_written = 0
+        self._field_ids: Dict[int, Dict[str, int]] = {}
+        self._pending: Dict[int, List[Dict]] = {}
+
+    def __enter__(self) -> "PredictionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def field_ids(self, taxonomy_id: int) -> Dict[str, int]:
+        """
+        Get the cached field-name to field-ID map of a taxonomy.
+
+        Args:
+            taxonomy_id (int): ID of the taxonomy
+
+        Returns:
+            Dict[str, int]: Dictionary mapping field names to their IDs
+        """
+        if taxonomy_id not in self._field_ids:
+            self._field_ids[taxonomy_id] = get_field_id_map(self.db, taxonomy_id)
+        return self._field_ids[taxonomy_id]
+
+    def add(self, document_id: int, predictions: Dict[str, str]) -> None:
+        """
+        Buffer the predictions of a document, replacing any predictions buffered for it.
+        The buffer is flushed once it holds ``batch_size`` documents.
+
+        Args:
+            document_id (int): ID of the document the predictions belong to
+            predictions (Dict[str, str]): Dictionary mapping field names to predicted values
+
+        Raises:
+            ValueError: If a field name is not part of the model's taxonomy
+        """
+        field_ids = self.field_ids(self.model.taxonomy_id)
+        rows = []
+        for field_name, value in predictions.items():
+            field_id = field_ids.get(field_name)
+            if field_id is None:
+                raise ValueError(f"Field '{field_name}' not found for model ID '{self.model.id}'")
+            rows.append({
+                "model_id": self.model.id,
+                "document_id": document_id,
+                "field_id": field_id,
+                "field_name": field_name,
+                "value": value,
+                "occurrence": 1
+            })
+        self._pending[document_id] = rows
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered predictions and commit.
+
+        Returns:
+            int: Number of documents written
+        """
+        if not self._pending:
+            return 0
+
+        document_ids = list(self._pending.keys())
+        rows = [row for document_rows in self._pending.values() for row in document_rows]
+
+        self.db.execute(
+            delete(Prediction).where(
+                Prediction.model_id == self.model.id,
+                Prediction.document_id.in_(document_ids)
+            )
         )
-        db.add(new_prediction)
-    db.commit()
+        if rows:
+            self.db.execute(insert(Prediction).values(rows))
+        self.db.commit()
+
+        self._pending = {}
+        self.documents_written += len(document_ids)
+        return len(document_ids)
+
+    def discard(self) -> List[int]:
+        """
+        Drop the buffered predictions, e.g. after a failed flush.
 
+        Returns:
+            List[int]: IDs of the documents whose predictions were dropped
+        """
+        document_ids = list(self._pending.keys())
+        self._pending = {}
+        return document_ids
+
+
+def add_predictions(db: Session, model: ExtractionModel, document: Document, predictions: Dict[str, str]) -> bool:
+    """
+    Add predictions for a document using an extraction model.
+    """
+    writer = PredictionWriter(db, model)
+    writer.add(document.id, predictions)
+    writer.flush()
     return True
 
+
+def add_predictions_bulk(db: Session,
+                         model: ExtractionModel,
+                         predictions: Iterable[Tuple[int, Dict[str, str]]],
+                         batch_size: int = 500) -> int:
+    """
+    Replace the predictions of an extraction model for many documents at once.
+
+    Args:
+        db (Session): Database session
+        model (ExtractionModel): Extraction model the predictions come from
+        predictions (Iterable[Tuple[int, Dict[str, str]]]): Pairs of document ID and a
+            dictionary mapping field names to predicted values
+        batch_size (int): Number of documents written per transaction
+
+    Returns:
+        int: Number of documents written
+
+    Raises:
+        ValueError: If a field name is not part of the model's taxonomy
+    """
+    with PredictionWriter(db, model, batch_size=batch_size) as writer:
+        for document_id, document_predictions in predictions:
+            writer.add(document_id, document_predictions)
+    return writer.documents_written
+
 def get_predictions_for_document(db: Session, document_id: int) -> List[Prediction]:
     """
     Get all predictions for a given document.
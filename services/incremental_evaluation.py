@@ -0,0 +1,209 @@
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional
+
+import pandas as pd
+from sqlalchemy import Float, case, cast, delete, exists, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from config import settings
+from functions.evaluation import COMPARISON_COLUMNS, add_match_column, load_comparison_frame
+from functions.matchers import Matcher
+from models.DataModels import DocumentEvaluation, EvaluationCount, FieldLabel, Prediction
+from models.validation_models import ModelEvaluationResult
+from services.metrics import bulk_upsert_metrics
+
+
+def get_changed_document_ids(db: Session, model_id: int, since: datetime) -> List[int]:
+    """
+    Get the documents in a model's evaluation whose labels or predictions were written since a time.
+
+    Only documents the model has predictions for are returned, as evaluated by ``evaluate_model``.
+    Both lookups are range scans of ``ix_field_labels_updated_at`` and ``ix_predictions_model_created``.
+
+    Args:
+        db (Session): Database session
+        model_id (int): ID of the extraction model
+        since (datetime): UTC time of the last evaluation run
+
+    Returns:
+        List[int]: IDs of the changed documents
+    """
+    predicted = aliased(Prediction)
+    relabelled = (
+        select(FieldLabel.document_id)
+        .where(FieldLabel.updated_at > since,
+               exists().where(predicted.document_id == FieldLabel.document_id, predicted.model_id == model_id))
+    )
+    repredicted = select(Prediction.document_id).where(Prediction.model_id == model_id, Prediction.created_at > since)
+    return list(db.scalars(relabelled.union(repredicted)))
+
+
+def _document_outcomes(frame: pd.DataFrame) -> Dict[int, Dict[str, bool]]:
+    """Group the match column of a comparison frame into the per-field outcomes of each document."""
+    outcomes: Dict[int, Dict[str, bool]] = {}
+    for document_id, field_name, match in zip(frame["document_id"].tolist(), frame["field_name"].tolist(),
+                                              frame["match"].tolist()):
+        outcomes.setdefault(document_id, {})[field_name] = bool(match)
+    return outcomes
+
+
+def _count_outcomes(outcomes: Dict[int, Dict[str, bool]], counts: Dict[str, Counter], sign: int) -> None:
+    for field_matches in outcomes.values():
+        for field_name, match in field_matches.items():
+            counts[field_name]["matches"] += sign * match
+            counts[field_name]["total"] += sign
+
+
+def load_evaluation_result(db: Session, model_id: int) -> ModelEvaluationResult:
+    """
+    Derive a model's evaluation figures from its stored counts, without reading labels or predictions.
+
+    Field accuracy comes from the running ``EvaluationCount`` rows; overall accuracy, the mean of
+    the per-document accuracy rates, and the share of fully correct documents are aggregated
+    from the ``DocumentEvaluation`` rows in the database.
+
+    Args:
+        db (Session): Database session
+        model_id (int): ID of the extraction model
+
+    Returns:
+        ModelEvaluationResult: Accuracy figures in percent, as ``evaluate_model`` computes them
+    """
+    sample_size, overall_accuracy, perc_of_full_correct = db.execute(
+        select(func.count(),
+               func.avg(cast(DocumentEvaluation.matches, Float) / DocumentEvaluation.total),
+               func.avg(case((DocumentEvaluation.matches == DocumentEvaluation.total, 1.0), else_=0.0)))
+        .where(DocumentEvaluation.model_id == model_id)
+    ).one()
+    field_accuracy = {
+        field_name: matches / total * 100
+        for field_name, matches, total in db.execute(
+            select(EvaluationCount.field_name, EvaluationCount.matches, EvaluationCount.total)
+            .where(EvaluationCount.model_id == model_id, EvaluationCount.total > 0)
+            .order_by(EvaluationCount.field_name))
+    }
+    return ModelEvaluationResult(
+        model_id=model_id,
+        sample_size=sample_size,
+        overall_accuracy=float(overall_accuracy or 0.0) * 100,
+        perc_of_full_correct=float(perc_of_full_correct or 0.0) * 100,
+        field_accuracy=field_accuracy,
+    )
+
+
+def evaluate_model_incremental(db: Session,
+                               model_id: int,
+                               full: bool = False,
+                               matchers: Optional[Mapping[str, Matcher]] = None,
+                               store_metrics: bool = True,
+                               commit: bool = True) -> ModelEvaluationResult:
+    """
+    Evaluate an extraction model by re-comparing only the documents changed since its last evaluation.
+
+    The outcome of every evaluated document is kept in ``DocumentEvaluation`` and per-field
+    match counts in ``EvaluationCount``. A run finds the documents whose labels or predictions
+    were written after the previous run started, compares just those, subtracts their previous
+    outcomes from the counts and adds the new ones. The count changes are applied with one
+    ``INSERT ... ON CONFLICT DO UPDATE`` executemany that adds to the stored values, and the
+    ``Metric`` rows are derived from the counts and written with ``bulk_upsert_metrics``.
+
+    Changes are looked up from ``settings.WATERMARK_OVERLAP_SECONDS`` before the previous run
+    started, so rows written by transactions still open at that time are not missed; documents
+    compared again without a change leave the counts as they are. Runs of the same model are
+    serialized on an advisory lock held until the transaction ends.
+
+    The first run of a model, or one with ``full``, compares every document and rebuilds the
+    counts. Deleting labels or predictions leaves no timestamp behind, so after deleting all of a
+    document's labels or predictions run with ``full``; the stored outcomes also depend on the
+    matchers, so a run with different matchers needs ``full`` too.
+
+    Args:
+        db (Session): Database session
+        model_id (int): ID of the extraction model to evaluate
+        full (bool): Rebuild the counts from all documents instead of updating them
+        matchers (Optional[Mapping[str, Matcher]]): Field name to matcher, exact comparison for other fields
+        store_metrics (bool): Write the figures to the model's metrics
+        commit (bool): Commit the transaction, otherwise leave that to the caller
+
+    Returns:
+        ModelEvaluationResult: Accuracy figures in percent over all evaluated documents
+    """
+    # Concurrent runs would both apply their count deltas
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('incremental_evaluation'), :model_id)"),
+               {"model_id": model_id})
+    started = datetime.utcnow()
+    last_run: Optional[datetime] = None
+    if not full:
+        last_run = db.scalar(select(func.max(DocumentEvaluation.evaluated_at))
+                             .where(DocumentEvaluation.model_id == model_id))
+
+    if last_run is None:
+        db.execute(delete(DocumentEvaluation).where(DocumentEvaluation.model_id == model_id))
+        db.execute(delete(EvaluationCount).where(EvaluationCount.model_id == model_id))
+        frame = load_comparison_frame(db, model_id, matchers=matchers)
+        previous: Dict[int, Dict[str, bool]] = {}
+    else:
+        document_ids = get_changed_document_ids(
+            db, model_id, last_run - timedelta(seconds=settings.WATERMARK_OVERLAP_SECONDS))
+        if document_ids:
+            frame = load_comparison_frame(db, model_id, document_ids, matchers)
+            previous = {
+                document_id: json.loads(field_matches)
+                for document_id, field_matches in db.execute(
+                    select(DocumentEvaluation.document_id, DocumentEvaluation.field_matches)
+                    .where(DocumentEvaluation.model_id == model_id, DocumentEvaluation.document_id.in_(document_ids)))
+            }
+        else:
+            frame = add_match_column(pd.DataFrame(columns=COMPARISON_COLUMNS))
+            previous = {}
+
+    outcomes = _document_outcomes(frame)
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    _count_outcomes(previous, counts, -1)
+    _count_outcomes(outcomes, counts, 1)
+
+    # Documents that dropped out of the evaluation, e.g. whose labels moved to another taxonomy
+    removed = set(previous) - set(outcomes)
+    if removed:
+        db.execute(delete(DocumentEvaluation).where(DocumentEvaluation.model_id == model_id,
+                                                    DocumentEvaluation.document_id.in_(removed)))
+    if outcomes:
+        stmt = insert(DocumentEvaluation)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_document_evaluation_model_document",
+            set_={
+                "matches": stmt.excluded.matches,
+                "total": stmt.excluded.total,
+                "field_matches": stmt.excluded.field_matches,
+                "evaluated_at": stmt.excluded.evaluated_at
+            }
+        )
+        db.execute(stmt, [{"model_id": model_id, "document_id": document_id,
+                           "matches": sum(field_matches.values()), "total": len(field_matches),
+                           "field_matches": json.dumps(field_matches), "evaluated_at": started}
+                          for document_id, field_matches in outcomes.items()])
+
+    deltas = [{"model_id": model_id, "field_name": field_name, "matches": delta["matches"],
+               "total": delta["total"], "updated_at": started}
+              for field_name, delta in counts.items() if delta["matches"] or delta["total"]]
+    if deltas:
+        stmt = insert(EvaluationCount)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_evaluation_count_model_field",
+            set_={
+                "matches": EvaluationCount.matches + stmt.excluded.matches,
+                "total": EvaluationCount.total + stmt.excluded.total,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt, deltas)
+
+    result = load_evaluation_result(db, model_id)
+    if store_metrics:
+        bulk_upsert_metrics(db, result.to_performance_metrics(), model_id, commit=False)
+    if commit:
+        db.commit()
+    return result
@@ -0,0 +1,148 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.DataModels import Document
+from models.validation_models import IngestionReport
+from services.storage import ensure_blobs, store_file
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.jpg', '.png', '.txt')
+
+
+def iter_document_files(folder_path: str,
+                        recursive: bool = False,
+                        extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS) -> Iterator[str]:
+    """
+    Lazily enumerate the document files of a folder with ``os.scandir``.
+
+    Args:
+        folder_path (str): Folder to enumerate
+        recursive (bool): Whether to descend into subfolders
+        extensions (Tuple[str, ...]): File extensions to include
+
+    Yields:
+        str: Path of each matching file
+    """
+    folders = [folder_path]
+    while folders:
+        with os.scandir(folders.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        folders.append(entry.path)
+                elif entry.is_file() and entry.name.endswith(extensions):
+                    yield entry.path
+
+
+def ingest_folder(db: Session,
+                  folder_path: str,
+                  organization_id: int,
+                  individual_id: str = "default",
+                  recursive: bool = False,
+                  extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS,
+                  link_mode: str = "reflink",
+                  max_workers: int = 8,
+                  batch_size: int = 500,
+                  progress_callback: Optional[Callable[[IngestionReport], None]] = None) -> IngestionReport:
+    """
+    Ingest all documents of a folder as a streaming pipeline.
+
+    Files are enumerated lazily, hashed and stored in the content-addressed blob store in
+    a thread pool, and inserted as ``Document`` rows with one multi-row INSERT and one
+    commit per ``batch_size`` files. Content that is already stored is not copied again.
+
+    Args:
+        db (Session): Database session
+        folder_path (str): Folder to ingest
+        organization_id (int): ID of the organization the documents belong to
+        individual_id (str): Individual ID assigned to every document
+        recursive (bool): Whether to descend into subfolders
+        extensions (Tuple[str, ...]): File extensions to include
+        link_mode (str): How new blobs are created, see ``services.storage.store_file``
+        max_workers (int): Number of copy threads
+        batch_size (int): Number of documents inserted per transaction
+        progress_callback (Optional[Callable[[IngestionReport], None]]): Called with the
+            running report after every committed batch
+
+    Returns:
+        IngestionReport: File counts, per-file errors and throughput of the run
+    """
+    report = IngestionReport(organization_id=organization_id)
+    started = time.perf_counter()
+    rows: List[Dict] = []
+    # Content hash to source file of the rows, to restore blobs released while the batch was committed
+    sources: Dict[str, str] = {}
+
+    def update_timing():
+        report.elapsed_seconds = time.perf_counter() - started
+        if report.elapsed_seconds > 0:
+            report.files_per_second = report.files_ingested / report.elapsed_seconds
+
+    def write_batch():
+        nonlocal rows, sources
+        try:
+            # Holds the blob locks until the commit, see services.storage.ensure_blobs
+            missing = ensure_blobs(db, sources, link_mode)
+            for content_hash, error in missing.items():
+                report.errors[sources[content_hash]] = error
+            stored = [row for row in rows if row["content_hash"] not in missing]
+            report.files_failed += len(rows) - len(stored)
+            rows = stored
+            if rows:
+                db.execute(insert(Document), rows)
+            db.commit()
+            report.files_ingested += len(rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            for row in rows:
+                report.errors[row["file_path"]] = str(e)
+            report.files_failed += len(rows)
+        rows = []
+        sources = {}
+        update_timing()
+        if progress_callback is not None:
+            progress_callback(report)
+
+    def collect(futures):
+        for future in futures:
+            source_path = in_flight.pop(future)
+            try:
+                content_hash, storage_path, size, created = future.result()
+            except OSError as e:
+                report.errors[source_path] = str(e)
+                report.files_failed += 1
+                continue
+            if created:
+                report.bytes_copied += size
+            else:
+                report.files_deduplicated += 1
+            rows.append({
+                "name": os.path.basename(source_path),
+                "file_path": storage_path,
+                "individual_id": individual_id,
+                "organization_id": organization_id,
+                "content_hash": content_hash,
+            })
+            sources[content_hash] = source_path
+            if len(rows) >= batch_size:
+                write_batch()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        for source_path in iter_document_files(folder_path, recursive=recursive, extensions=extensions):
+            report.files_total += 1
+            in_flight[executor.submit(store_file, source_path, link_mode)] = source_path
+            if len(in_flight) >= max_workers * 4:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(list(in_flight))
+
+    if rows:
+        write_batch()
+    update_timing()
+    return report
@@ -0,0 +1,373 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import AsyncSessionLocal, get_async_engine
+from models.DataModels import Document, DocumentStatus, ExtractionJob, ExtractionModel, JobStatus
+from services.result_ingestion import ingest_extraction_results
+from services.nucleus_async_client import (FAILED_JOB_STATUSES, PENDING_JOB_STATUSES, AsyncNucleusClient,
+                                           NucleusJobError, get_nucleus_client)
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_extraction_jobs(db: Session,
+                            document_ids: List[int],
+                            model_id: int,
+                            workflow_id: str,
+                            max_attempts: Optional[int] = None) -> List[int]:
+    """
+    Queue Nucleus extraction runs for many documents at once.
+
+    A document that already has a queued or running job for the same model and workflow
+    is not queued again; the ID of its active job is returned instead. The partial unique index
+    ``uq_extraction_jobs_active`` enforces this for concurrent calls too.
+
+    Args:
+        db (Session): Database session
+        document_ids (List[int]): IDs of the documents to extract
+        model_id (int): ID of the extraction model the results are stored for
+        workflow_id (str): ID of the Nucleus workflow to run
+        max_attempts (Optional[int]): Failed attempts before a job fails, defaults to ``settings.JOB_MAX_ATTEMPTS``
+
+    Returns:
+        List[int]: Job ID for each document, in the order of ``document_ids``
+
+    Raises:
+        ValueError: If the extraction model or one of the documents does not exist
+    """
+    if db.get(ExtractionModel, model_id) is None:
+        raise ValueError(f"Extraction model with ID {model_id} not found")
+    unique_ids = list(dict.fromkeys(document_ids))
+    found = set(db.scalars(select(Document.id).where(Document.id.in_(unique_ids))))
+    missing = [document_id for document_id in unique_ids if document_id not in found]
+    if missing:
+        raise ValueError(f"Documents not found: {missing[:10]}")
+
+    active_jobs = select(ExtractionJob.document_id, ExtractionJob.id).where(
+        ExtractionJob.model_id == model_id,
+        ExtractionJob.workflow_id == workflow_id,
+        ExtractionJob.status.in_(ACTIVE_JOB_STATUSES)
+    )
+    job_ids: Dict[int, int] = dict(db.execute(active_jobs.where(ExtractionJob.document_id.in_(unique_ids))).all())
+
+    new_ids = [document_id for document_id in unique_ids if document_id not in job_ids]
+    if new_ids:
+        now = datetime.utcnow()
+        rows = [{
+            "document_id": document_id,
+            "model_id": model_id,
+            "workflow_id": workflow_id,
+            "status": JobStatus.QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+            "polls": 0,
+            "next_run_at": now,
+            "created_at": now,
+            "updated_at": now,
+        } for document_id in new_ids]
+        # A concurrent call may queue the same documents first; uq_extraction_jobs_active skips those rows
+        stmt = insert(ExtractionJob).on_conflict_do_nothing(
+            index_elements=["document_id", "model_id", "workflow_id"],
+            index_where=text("status IN ('QUEUED', 'RUNNING')")
+        )
+        created = db.execute(stmt.returning(ExtractionJob.document_id, ExtractionJob.id), rows)
+        job_ids.update(dict(created.all()))
+        skipped = [document_id for document_id in new_ids if document_id not in job_ids]
+        if skipped:
+            job_ids.update(dict(db.execute(active_jobs.where(ExtractionJob.document_id.in_(skipped))).all()))
+    db.commit()
+    return [job_ids[document_id] for document_id in document_ids]
+
+
+def get_extraction_job(db: Session, job_id: int) -> Optional[ExtractionJob]:
+    """
+    Get an extraction job by ID.
+
+    Args:
+        db (Session): Database session
+        job_id (int): ID of the job
+
+    Returns:
+        Optional[ExtractionJob]: The job if found, None otherwise
+    """
+    return db.get(ExtractionJob, job_id)
+
+
+def get_extraction_jobs(db: Session,
+                        status: Optional[JobStatus] = None,
+                        document_id: Optional[int] = None,
+                        limit: int = 100,
+                        after_id: Optional[int] = None) -> List[ExtractionJob]:
+    """
+    Get extraction jobs ordered by ID, optionally filtered.
+
+    Args:
+        db (Session): Database session
+        status (Optional[JobStatus]): Filter jobs by status
+        document_id (Optional[int]): Filter jobs by document ID
+        limit (int): Maximum number of records to return
+        after_id (Optional[int]): Keyset cursor, only return jobs with a greater ID
+
+    Returns:
+        List[ExtractionJob]: List of jobs
+    """
+    query = db.query(ExtractionJob)
+    if status is not None:
+        query = query.filter(ExtractionJob.status == status)
+    if document_id:
+        query = query.filter(ExtractionJob.document_id == document_id)
+    if after_id is not None:
+        query = query.filter(ExtractionJob.id > after_id)
+    return query.order_by(ExtractionJob.id).limit(limit).all()
+
+
+def claim_jobs(db: Session, limit: int, lease_seconds: int) -> List[int]:
+    """
+    Claim due jobs for a worker.
+
+    Due rows are locked with ``FOR UPDATE SKIP LOCKED``, so concurrent workers, also in other
+    processes, never claim the same job, and their ``next_run_at`` is pushed out by the lease.
+    A job whose worker dies is claimed again once the lease runs out.
+
+    Args:
+        db (Session): Database session
+        limit (int): Maximum number of jobs to claim
+        lease_seconds (int): Seconds the claim lasts
+
+    Returns:
+        List[int]: IDs of the claimed jobs
+    """
+    now = datetime.utcnow()
+    job_ids = list(db.scalars(
+        select(ExtractionJob.id).where(
+            ExtractionJob.status.in_(ACTIVE_JOB_STATUSES),
+            ExtractionJob.next_run_at <= now
+        ).order_by(ExtractionJob.next_run_at).limit(limit).with_for_update(skip_locked=True)
+    ))
+    if job_ids:
+        db.execute(
+            update(ExtractionJob).where(ExtractionJob.id.in_(job_ids)).values(
+                next_run_at=now + timedelta(seconds=lease_seconds), updated_at=now
+            )
+        )
+    db.commit()
+    return job_ids
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Get the exponential backoff delay before the next attempt.
+
+    Args:
+        attempt (int): Number of attempts made so far, starting at 1
+        base_delay (float): Delay after the first attempt in seconds
+        max_delay (float): Upper bound for the delay in seconds
+
+    Returns:
+        float: Delay in seconds
+    """
+    return min(base_delay * 2 ** max(attempt - 1, 0), max_delay)
+
+
+class ExtractionJobWorker:
+    """
+    In-process worker running queued extraction jobs against Nucleus.
+
+    The worker claims due jobs from the ``extraction_jobs`` table and processes at most
+    ``concurrency`` of them at once. Processing a job is one step of its life cycle:
+
+    - a queued job uploads its document if needed, starts the Nucleus workflow and becomes running
+    - a running job polls the workflow results; while they are pending the job is rescheduled
+      with a growing delay, once they are available they are stored as the model's predictions
+
+    A failed step counts as an attempt and is retried with exponential backoff; a failed
+    workflow is submitted again. After ``max_attempts`` failed attempts the job and its
+    document are marked failed. No connection is held while waiting on Nucleus.
+
+    Args:
+        client (Optional[AsyncNucleusClient]): Nucleus client, defaults to the shared client
+        concurrency (Optional[int]): Maximum number of jobs processed at once
+        poll_interval (Optional[float]): Seconds between queue polls while no job is due
+        session_factory (Optional[Callable[[], AsyncSession]]): Creates the worker's sessions,
+            defaults to sessions on the primary async engine
+    """
+
+    def __init__(self,
+                 client: Optional[AsyncNucleusClient] = None,
+                 concurrency: Optional[int] = None,
+                 poll_interval: Optional[float] = None,
+                 session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self.client = client
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self._session_factory = session_factory or (lambda: AsyncSessionLocal(bind=get_async_engine()))
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        """Start processing jobs in the background of the running event loop."""
+        if self._loop_task is None:
+            self._stopping.clear()
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop claiming jobs and wait for the jobs in progress."""
+        self._stopping.set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                # E.g. a lost database connection; the loop must outlive it or queued jobs stall
+                logger.exception("Claiming extraction jobs failed, retrying in %s seconds", self.poll_interval)
+                claimed = 0
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> int:
+        """
+        Claim as many due jobs as there are free slots and start processing them.
+
+        Returns:
+            int: Number of jobs claimed
+        """
+        if len(self._tasks) >= self.concurrency:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+        free = self.concurrency - len(self._tasks)
+        async with self._session_factory() as db:
+            job_ids = await db.run_sync(claim_jobs, free, settings.JOB_LEASE_SECONDS)
+        for job_id in job_ids:
+            task = asyncio.create_task(self.process(job_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._job_done)
+        return len(job_ids)
+
+    def _job_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        # process() records step failures on the job; this catches what escapes it, e.g. a failed commit.
+        # The job is claimed again once its lease runs out
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Processing an extraction job failed", exc_info=task.exception())
+
+    async def drain(self) -> None:
+        """Process jobs until none is due and none is in progress, e.g. in scripts and tests."""
+        while await self.run_once() or self._tasks:
+            if self._tasks:
+                await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    async def process(self, job_id: int) -> None:
+        """
+        Run the next step of a job and record its outcome.
+
+        Args:
+            job_id (int): ID of a claimed job
+        """
+        client = self.client or get_nucleus_client()
+        async with self._session_factory() as db:
+            job = await db.get(ExtractionJob, job_id)
+            if job is None or job.status not in ACTIVE_JOB_STATUSES:
+                return
+            document = await db.get(Document, job.document_id)
+            # Return the connection to the pool while waiting on Nucleus
+            await db.commit()
+
+            try:
+                if job.nucleus_job_id is None:
+                    await self._submit(client, job, document)
+                else:
+                    await self._poll(db, client, job, document)
+            except Exception as e:
+                if isinstance(e, SQLAlchemyError):
+                    # Reload the job in a fresh transaction; Nucleus state set before the error is lost
+                    await db.rollback()
+                    job = await db.get(ExtractionJob, job_id)
+                    if job is None:
+                        logger.error("Extraction job %s disappeared after a database error", job_id, exc_info=e)
+                        return
+                    document = await db.get(Document, job.document_id)
+                self._record_failure(job, document, e)
+            await db.commit()
+
+    async def _submit(self, client: AsyncNucleusClient, job: ExtractionJob, document: Document) -> None:
+        if document.nucleus_doc_id is None:
+            document.nucleus_doc_id = await client.upload_document(document.file_path)
+        result = await client.run_extraction_workflow(document.nucleus_doc_id, job.workflow_id)
+        if not result.get("job_id"):
+            raise ValueError(f"Nucleus returned no job ID for workflow '{job.workflow_id}'")
+
+        now = datetime.utcnow()
+        job.nucleus_job_id = result["job_id"]
+        job.status = JobStatus.RUNNING
+        job.started_at = now
+        job.polls = 0
+        job.next_run_at = now + timedelta(seconds=settings.JOB_RESULT_POLL_DELAY)
+        document.status = DocumentStatus.PROCESSING
+
+    async def _poll(self, db: AsyncSession, client: AsyncNucleusClient, job: ExtractionJob, document: Document) -> None:
+        results = await client.fetch_extraction_results(job.nucleus_job_id)
+        status = str(results.get("status", "")).lower()
+        if status in FAILED_JOB_STATUSES:
+            raise NucleusJobError(job.nucleus_job_id, status, results)
+
+        now = datetime.utcnow()
+        if status in PENDING_JOB_STATUSES:
+            if job.started_at and (now - job.started_at).total_seconds() > settings.JOB_RESULT_TIMEOUT:
+                raise TimeoutError(f"Nucleus job '{job.nucleus_job_id}' did not complete within "
+                                   f"{settings.JOB_RESULT_TIMEOUT} seconds")
+            job.polls += 1
+            job.next_run_at = now + timedelta(seconds=backoff_delay(
+                job.polls + 1, settings.JOB_RESULT_POLL_DELAY, settings.JOB_RESULT_POLL_MAX_DELAY))
+            return
+
+        extraction_model = await db.get(ExtractionModel, job.model_id)
+        # The local ID goes last, a document_id in the Nucleus payload must not redirect the results.
+        # Not committed here: process() commits the predictions together with the job's new state
+        report = await db.run_sync(ingest_extraction_results, extraction_model,
+                                   [{**results, "document_id": document.id}], commit=False)
+        if report.errors:
+            raise ValueError(f"Extraction results of document {document.id} could not be ingested: {report.errors}")
+
+        job.status = JobStatus.SUCCEEDED
+        job.completed_at = now
+        job.next_run_at = now
+        job.last_error = None
+        document.status = DocumentStatus.EXTRACTED
+
+    @staticmethod
+    def _record_failure(job: ExtractionJob, document: Document, error: Exception) -> None:
+        now = datetime.utcnow()
+        job.attempts += 1
+        job.last_error = f"{type(error).__name__}: {error}"
+        if isinstance(error, (NucleusJobError, TimeoutError)):
+            # The workflow itself failed, the next attempt submits it again
+            job.nucleus_job_id = None
+            job.status = JobStatus.QUEUED
+
+        if job.attempts >= job.max_attempts:
+            job.status = JobStatus.FAILED
+            job.completed_at = now
+            document.status = DocumentStatus.FAILED
+        else:
+            job.next_run_at = now + timedelta(seconds=backoff_delay(
+                job.attempts, settings.JOB_RETRY_BASE_DELAY, settings.JOB_RETRY_MAX_DELAY))
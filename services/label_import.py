@@ -0,0 +1,309 @@
+import os
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from functions.validation_engine import compile_rules_cached
+from models.DataModels import Document
+from models.validation_models import LabelImportConfig, LabelImportReport
+from services.documents import assign_labels_bulk
+from services.taxonomy_cache import TaxonomyMetadata, taxonomy_cache
+
+CSV_EXTENSIONS = (".csv", ".tsv")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+DOCUMENT_KEYS = ("document_id", "name", "file_path", "nucleus_doc_id")
+
+
+def read_label_columns(file_path: str, sheet_name: Optional[str] = None) -> List[str]:
+    """
+    Read the column names of a label file without reading its rows.
+
+    Args:
+        file_path (str): Path to a CSV, TSV, Parquet or XLSX file
+        sheet_name (Optional[str]): Worksheet of XLSX files, the active one by default
+
+    Returns:
+        List[str]: The column names
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return list(pd.read_csv(file_path, sep="\t" if extension == ".tsv" else ",", nrows=0).columns)
+    if extension in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(file_path).schema_arrow.names
+    if extension in XLSX_EXTENSIONS:
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            return [str(name) for name in header if name is not None]
+        finally:
+            workbook.close()
+    raise ValueError(f"Unsupported label file type '{extension}'")
+
+
+def iter_label_chunks(file_path: str,
+                      columns: List[str],
+                      chunk_size: int = 50000,
+                      sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream the rows of a label file in chunks, without loading the whole file.
+
+    CSV files are read with ``pd.read_csv(chunksize=...)`` as strings, Parquet files with
+    ``ParquetFile.iter_batches`` and XLSX files with openpyxl in read-only mode. Empty cells
+    become missing values.
+
+    Args:
+        file_path (str): Path to a CSV, TSV, Parquet or XLSX file
+        columns (List[str]): Columns to read
+        chunk_size (int): Number of rows per chunk
+        sheet_name (Optional[str]): Worksheet of XLSX files, the active one by default
+
+    Yields:
+        pd.DataFrame: The rows of the next chunk, restricted to ``columns``
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        # Only empty cells are missing; strings such as "NA" are kept as values
+        yield from pd.read_csv(file_path, sep="\t" if extension == ".tsv" else ",", usecols=columns, dtype=str,
+                               keep_default_na=False, na_values=[""], chunksize=chunk_size)
+    elif extension in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif extension in XLSX_EXTENSIONS:
+        yield from _iter_xlsx_chunks(file_path, columns, chunk_size, sheet_name)
+    else:
+        raise ValueError(f"Unsupported label file type '{extension}'")
+
+
+def _iter_xlsx_chunks(file_path: str, columns: List[str], chunk_size: int, sheet_name: Optional[str]) -> Iterator[pd.DataFrame]:
+    import openpyxl
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(name) if name is not None else None for name in next(rows, ())]
+        positions = [header.index(column) for column in columns]
+
+        chunk = []
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in positions]
+            if any(value is not None for value in values):
+                chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns, dtype=object)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _cell_to_string(value: Any, date_format: str) -> Optional[str]:
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime(date_format)
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store whole numbers as floats
+        return str(int(value))
+    value = str(value).strip()
+    return value or None
+
+
+def to_label_strings(column: pd.Series, date_format: str = "%Y-%m-%d") -> pd.Series:
+    """
+    Convert a column of cells to label strings, each distinct value once.
+
+    Dates are formatted with ``date_format``, whole floats lose their ``.0``, strings are stripped
+    and missing or blank cells become None.
+
+    Args:
+        column (pd.Series): The cells
+        date_format (str): strftime format of date and datetime cells
+
+    Returns:
+        pd.Series: Object series of strings and None, with the index of ``column``
+    """
+    codes, uniques = pd.factorize(column)
+    strings = np.array([_cell_to_string(value, date_format) for value in uniques] + [None], dtype=object)
+    return pd.Series(strings.take(codes), index=column.index, dtype=object)
+
+
+def resolve_field_columns(columns: List[str], metadata: TaxonomyMetadata, config: LabelImportConfig) -> Dict[str, str]:
+    """
+    Map the columns of a label file to taxonomy fields.
+
+    Args:
+        columns (List[str]): Column names of the file
+        metadata (TaxonomyMetadata): Field metadata of the taxonomy
+        config (LabelImportConfig): Import configuration
+
+    Returns:
+        Dict[str, str]: Column name to field name
+
+    Raises:
+        ValueError: If the mapping names missing columns or unknown fields, or nothing maps
+    """
+    if config.document_column not in columns:
+        raise ValueError(f"Document column '{config.document_column}' not found in the file")
+
+    if config.field_columns:
+        missing_columns = [column for column in config.field_columns if column not in columns]
+        unknown_fields = [field for field in config.field_columns.values() if field not in metadata.field_ids]
+        if missing_columns or unknown_fields:
+            raise ValueError(f"Missing columns {missing_columns} or unknown fields {unknown_fields} "
+                             f"for taxonomy ID '{metadata.taxonomy_id}'")
+        return dict(config.field_columns)
+
+    mapping = {column: column for column in columns
+               if column in metadata.field_ids and column != config.document_column}
+    if not mapping:
+        raise ValueError(f"No column matches a field of taxonomy ID '{metadata.taxonomy_id}'")
+    return mapping
+
+
+def _resolve_document_ids(db: Session,
+                          keys: pd.Series,
+                          document_key: str,
+                          document_mapping: Optional[Dict[str, int]]) -> pd.Series:
+    """Map the document column of a chunk to document IDs with one query; unknown and ambiguous keys become NaN."""
+    if document_mapping is not None:
+        return keys.map(document_mapping).astype(float)
+
+    unique_keys = keys.dropna().unique().tolist()
+    if document_key == "document_id":
+        ids = pd.to_numeric(keys, errors="coerce")
+        candidates = [int(i) for i in ids.dropna().unique()]
+        existing = set(db.scalars(select(Document.id).where(Document.id.in_(candidates)))) if candidates else set()
+        return ids.where(ids.isin(existing))
+
+    column = getattr(Document, document_key)
+    # Keys shared by several documents are ambiguous, so min() is only kept where the count is one
+    rows = db.execute(
+        select(column, func.min(Document.id), func.count()).where(column.in_(unique_keys)).group_by(column)
+    ).all() if unique_keys else []
+    mapping = {key: document_id for key, document_id, count in rows if count == 1}
+    return keys.map(mapping).astype(float)
+
+
+def _validate_chunk(values: pd.DataFrame, metadata: TaxonomyMetadata) -> pd.Series:
+    """Get the rejection reason of every row, None for valid rows. Each rule checks a whole column at once."""
+    reasons = pd.Series(None, index=values.index, dtype=object)
+    for field_name in sorted(metadata.required_fields):
+        missing = values[field_name].isna() if field_name in values else pd.Series(True, index=values.index)
+        reasons = reasons.mask(reasons.isna() & missing, f"Missing required field '{field_name}'")
+
+    for field_name in values.columns:
+        rules = compile_rules_cached(metadata.data_types.get(field_name), metadata.validation_rules.get(field_name))
+        present = values[field_name].notna().to_numpy()
+        if not rules or not present.any():
+            continue
+        column = values[field_name].to_numpy()[present]
+        for rule in rules:
+            invalid = np.zeros(len(values), dtype=bool)
+            invalid[present] = ~rule.check_many(column)
+            reasons = reasons.mask(reasons.isna() & invalid, f"Invalid '{field_name}' ({rule.name})")
+    return reasons
+
+
+def import_labels(db: Session,
+                  file_path: str,
+                  taxonomy_id: int,
+                  config: Optional[LabelImportConfig] = None,
+                  document_mapping: Optional[Dict[str, int]] = None,
+                  chunk_size: int = 50000,
+                  batch_size: int = 5000,
+                  rejected_rows_path: Optional[str] = None) -> LabelImportReport:
+    """
+    Import document labels from a CSV, TSV, Parquet or XLSX file as a streaming pipeline.
+
+    The file is read in chunks of ``chunk_size`` rows. For each chunk the document column is
+    resolved to document IDs with one query, cells are converted to label strings, required
+    fields and the taxonomy's validation rules are checked column by column, and the valid rows
+    are upserted through ``assign_labels_bulk``. Memory use is bounded by the chunk size, not
+    the file size.
+
+    Rows whose document is unknown or ambiguous, that miss a required field or that fail a
+    validation rule are rejected as a whole. They are counted by reason in the report and, if
+    ``rejected_rows_path`` is given, written to that CSV file with their 1-based row number.
+
+    Args:
+        db (Session): Database session
+        file_path (str): Path to the label file
+        taxonomy_id (int): ID of the taxonomy the labels belong to
+        config (Optional[LabelImportConfig]): Column mapping, see ``LabelImportConfig``
+        document_mapping (Optional[Dict[str, int]]): Explicit document column value to document ID
+            map, used instead of looking documents up by ``config.document_key``
+        chunk_size (int): Number of rows read at a time
+        batch_size (int): Number of documents written per transaction
+        rejected_rows_path (Optional[str]): CSV file to write the rejected rows to
+
+    Returns:
+        LabelImportReport: Row counts and rejection reasons
+
+    Raises:
+        ValueError: If the taxonomy does not exist or the columns do not match the configuration
+    """
+    started = time.perf_counter()
+    config = config or LabelImportConfig()
+    if config.document_key not in DOCUMENT_KEYS:
+        raise ValueError(f"Unknown document key '{config.document_key}', expected one of {DOCUMENT_KEYS}")
+    metadata = taxonomy_cache.get(db, taxonomy_id)
+    if metadata is None:
+        raise ValueError(f"Taxonomy with ID {taxonomy_id} not found")
+
+    field_columns = resolve_field_columns(read_label_columns(file_path, config.sheet_name), metadata, config)
+    columns = [config.document_column] + [column for column in field_columns if column != config.document_column]
+    report = LabelImportReport(taxonomy_id=taxonomy_id, rejected_rows_path=rejected_rows_path)
+    reasons_count = Counter()
+    if rejected_rows_path and os.path.exists(rejected_rows_path):
+        os.remove(rejected_rows_path)
+
+    for chunk in iter_label_chunks(file_path, columns, chunk_size, config.sheet_name):
+        chunk.index = pd.RangeIndex(report.rows_total + 1, report.rows_total + 1 + len(chunk), name="row")
+        report.rows_total += len(chunk)
+
+        keys = to_label_strings(chunk[config.document_column], config.date_format)
+        document_ids = _resolve_document_ids(db, keys, config.document_key, document_mapping)
+        values = pd.DataFrame({field: to_label_strings(chunk[column], config.date_format)
+                               for column, field in field_columns.items()}, index=chunk.index)
+
+        reasons = _validate_chunk(values, metadata)
+        reasons = reasons.mask(document_ids.isna(), "Unknown or ambiguous document")
+        accepted = reasons.isna().to_numpy()
+
+        labels = (
+            (int(document_id), {field: value for field, value in row.items() if value is not None})
+            for document_id, row in zip(document_ids[accepted], values[accepted].to_dict("records"))
+        )
+        result = assign_labels_bulk(db, taxonomy_id, labels, batch_size=batch_size)
+        if result["errors"]:
+            # The documents were resolved above, so this only happens on a failed write
+            failed = document_ids.isin(list(result["errors"])) & reasons.isna()
+            reasons = reasons.mask(failed, "Write failed")
+            accepted = reasons.isna().to_numpy()
+
+        rejected = ~accepted
+        report.rows_imported += int(accepted.sum())
+        report.rows_rejected += int(rejected.sum())
+        reasons_count.update(reasons[rejected].tolist())
+        if rejected_rows_path and rejected.any():
+            rejected_rows = values[rejected].copy()
+            rejected_rows.insert(0, config.document_column, keys[rejected])
+            rejected_rows.insert(0, "reason", reasons[rejected])
+            rejected_rows.to_csv(rejected_rows_path, mode="a", header=not os.path.exists(rejected_rows_path))
+
+    report.rejection_reasons = dict(reasons_count)
+    report.elapsed_seconds = time.perf_counter() - started
+    report.rows_per_second = report.rows_total / report.elapsed_seconds if report.elapsed_seconds else 0.0
+    return report
@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import Iterable
+
 from sqlalchemy.orm import Session
 from models.DataModels import Metric
+from models.validation_models import PerformanceMetric
+from services.bulk_upsert import upsert_rows
 
 
 def create_metric(db: Session, name: str, value: float, sample_size: int, model_id: int) -> Metric:
@@ -77,6 +82,36 @@ def create_or_update_metric(db: Session,
     else:
         return create_metric(db, name, value, sample_size, model_id)
 
+def bulk_upsert_metrics(db: Session,
+                        metrics: Iterable[PerformanceMetric],
+                        model_id: int,
+                        commit: bool = True) -> int:
+    """
+    Create or update many metrics of a model in one statement.
+
+    The metrics are upserted on ``uq_model_id_name`` with one ``INSERT ... ON CONFLICT DO UPDATE``
+    executemany, instead of a SELECT and an UPDATE or INSERT per metric as in
+    ``create_or_update_metric``. Metrics without a positive sample size are skipped, the
+    ``check_sample_size_positive`` constraint would reject them.
+
+    Args:
+        db (Session): Database session
+        metrics (Iterable[PerformanceMetric]): Metrics to store, e.g. ``ModelEvaluationResult.to_performance_metrics()``
+        model_id (int): Foreign key to the extraction model that the metrics belong to
+        commit (bool): Commit the transaction, otherwise leave that to the caller
+
+    Returns:
+        int: Number of metrics written
+    """
+    now = datetime.utcnow()
+    rows = {metric.name: {"name": metric.name, "value": metric.value, "sample_size": metric.sample_size,
+                          "model_id": model_id, "created_at": now, "updated_at": now}
+            for metric in metrics if metric.sample_size}
+    upsert_rows(db, Metric.__table__, "uq_model_id_name", rows, ("value", "sample_size", "updated_at"))
+    if commit:
+        db.commit()
+    return len(rows)
+
 def delete_metric(db: Session,
                   metric_id: int) -> bool:
     """
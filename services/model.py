@@ -54,16 +54,18 @@ def get_extraction_models(
     db: Session,
     taxonomy_id: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None
 ) -> List[ExtractionModel]:
     """
-    Get a list of extraction models with optional filtering by taxonomy.
+    Get a list of extraction models with optional filtering by taxonomy, ordered by ID.
     
     Args:
         db (Session): Database session
         taxonomy_id (Optional[int]): Filter models by taxonomy ID
-        skip (int): Number of records to skip
+        skip (int): Number of records to skip, ignored with after_id
         limit (int): Maximum number of records to return
+        after_id (Optional[int]): Keyset cursor, only return records with a greater ID; see ``schemas.Page``
         
     Returns:
         List[ExtractionModel]: List of extraction model objects
@@ -71,7 +73,12 @@ def get_extraction_models(
     query = db.query(ExtractionModel)
     if taxonomy_id:
         query = query.filter(ExtractionModel.taxonomy_id == taxonomy_id)
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(ExtractionModel.id)
+    if after_id is not None:
+        query = query.filter(ExtractionModel.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def update_extraction_model(
     db: Session,
@@ -0,0 +1,238 @@
+import asyncio
+import mimetypes
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
+
+import httpx
+
+from config import settings
+
+# Job statuses reported by the results endpoint while a workflow is still running
+PENDING_JOB_STATUSES = {"pending", "queued", "running", "processing", "in_progress"}
+FAILED_JOB_STATUSES = {"failed", "error", "cancelled"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class NucleusJobError(RuntimeError):
+    """Raised when a Nucleus workflow job finishes unsuccessfully."""
+
+    def __init__(self, job_id: str, status: str, payload: Dict[str, Any]):
+        super().__init__(f"Nucleus job '{job_id}' finished with status '{status}'")
+        self.job_id = job_id
+        self.status = status
+        self.payload = payload
+
+
+async def _read_chunks(file_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read a file in chunks on a worker thread, so the event loop is not blocked by disk I/O."""
+    f = await asyncio.to_thread(open, file_path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _multipart_stream(head: bytes, file_path: str, tail: bytes) -> AsyncIterator[bytes]:
+    yield head
+    async for chunk in _read_chunks(file_path):
+        yield chunk
+    yield tail
+
+
+class AsyncNucleusClient:
+    """
+    Asynchronous Nucleus API client backed by a pooled HTTP connection.
+
+    Use it as an async context manager so the pool is closed when done::
+
+        async with AsyncNucleusClient() as client:
+            document_ids = await client.upload_documents(paths)
+
+    Args:
+        base_url (Optional[str]): Nucleus API URL, defaults to ``settings.NUCLEUS_API_URL``
+        api_key (Optional[str]): Nucleus API key, defaults to ``settings.NUCLEUS_API_KEY``
+        max_concurrency (int): Maximum number of requests in flight at once
+        max_connections (Optional[int]): Size of the connection pool, defaults to ``max_concurrency``
+        timeout (float): Per-request timeout in seconds
+        transport (Optional[httpx.AsyncBaseTransport]): Custom transport, e.g. for tests
+    """
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 api_key: Optional[str] = None,
+                 max_concurrency: int = 8,
+                 max_connections: Optional[int] = None,
+                 timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        max_connections = max_connections or max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url or settings.NUCLEUS_API_URL,
+            headers={"Authorization": f"Bearer {api_key or settings.NUCLEUS_API_KEY}"},
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncNucleusClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            response = await self._client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def upload_document(self, file_path: str) -> str:
+        """
+        Upload a document file to Nucleus as a ``multipart/form-data`` request.
+
+        The body is streamed from an async generator that reads the file in chunks of
+        ``UPLOAD_CHUNK_SIZE`` on a worker thread, so the file is neither read into memory nor
+        read on the event loop.
+
+        Args:
+            file_path (str): Path to the document file
+
+        Returns:
+            str: The Nucleus document ID
+        """
+        boundary = uuid.uuid4().hex
+        file_name = os.path.basename(file_path).replace('"', "%22")
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{file_name}\"\r\n"
+                f"Content-Type: {content_type}\r\n\r\n").encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        size = len(head) + os.path.getsize(file_path) + len(tail)
+        response = await self._request(
+            "POST", "/documents",
+            content=_multipart_stream(head, file_path, tail),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}", "Content-Length": str(size)}
+        )
+        return response.json().get("document_id")
+
+    async def upload_documents(self, file_paths: Iterable[str]) -> Dict[str, Union[str, BaseException]]:
+        """
+        Upload many documents concurrently, bounded by the client's concurrency limit.
+
+        Args:
+            file_paths (Iterable[str]): Paths to the document files
+
+        Returns:
+            Dict[str, Union[str, BaseException]]: Nucleus document ID for each file path,
+                or the exception raised while uploading it
+        """
+        file_paths = list(file_paths)
+        results = await asyncio.gather(*(self.upload_document(path) for path in file_paths),
+                                       return_exceptions=True)
+        return dict(zip(file_paths, results))
+
+    async def run_extraction_workflow(self, doc_id: str, workflow_id: str) -> Dict[str, Any]:
+        """Trigger an extraction workflow in Nucleus."""
+        response = await self._request("POST", f"/workflow/{workflow_id}/run", json={"document_id": doc_id})
+        return response.json()
+
+    async def fetch_extraction_results(self, job_id: str) -> Dict[str, Any]:
+        """Retrieve the current extraction results of a workflow job."""
+        response = await self._request("GET", f"/workflow/results/{job_id}")
+        if response.status_code == 202:
+            return {"status": "pending"}
+        return response.json()
+
+    async def wait_for_results(self,
+                               job_id: str,
+                               timeout: float = 300.0,
+                               initial_delay: float = 1.0,
+                               max_delay: float = 30.0,
+                               backoff: float = 2.0) -> Dict[str, Any]:
+        """
+        Poll a workflow job with exponential backoff until its results are available.
+
+        A job is still running while the results endpoint answers ``202 Accepted`` or
+        reports a status in ``PENDING_JOB_STATUSES``.
+
+        Args:
+            job_id (str): ID of the workflow job
+            timeout (float): Maximum number of seconds to wait
+            initial_delay (float): Delay before the second poll in seconds
+            max_delay (float): Upper bound for the delay between polls in seconds
+            backoff (float): Factor the delay grows by after each poll
+
+        Returns:
+            Dict[str, Any]: The extraction results
+
+        Raises:
+            NucleusJobError: If the job finishes with a status in ``FAILED_JOB_STATUSES``
+            TimeoutError: If the job does not complete within ``timeout`` seconds
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            results = await self.fetch_extraction_results(job_id)
+            status = str(results.get("status", "")).lower()
+            if status in FAILED_JOB_STATUSES:
+                raise NucleusJobError(job_id, status, results)
+            if status not in PENDING_JOB_STATUSES:
+                return results
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Nucleus job '{job_id}' did not complete within {timeout} seconds")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * backoff, max_delay)
+
+    async def run_and_wait(self, doc_id: str, workflow_id: str, **poll_kwargs: Any) -> Dict[str, Any]:
+        """
+        Trigger an extraction workflow and wait for its results.
+
+        Args:
+            doc_id (str): Nucleus document ID
+            workflow_id (str): ID of the workflow to run
+            **poll_kwargs: Polling options passed to ``wait_for_results``
+
+        Returns:
+            Dict[str, Any]: The extraction results
+
+        Raises:
+            ValueError: If Nucleus returns no job ID for the workflow run
+        """
+        result = await self.run_extraction_workflow(doc_id, workflow_id)
+        if not result.get("job_id"):
+            raise ValueError(f"Nucleus returned no job ID for workflow '{workflow_id}'")
+        return await self.wait_for_results(result["job_id"], **poll_kwargs)
+
+
+# Shared client of the API process, so all requests use one connection pool
+_shared_client: Optional[AsyncNucleusClient] = None
+
+
+def get_nucleus_client() -> AsyncNucleusClient:
+    """
+    Get the process-wide Nucleus client, created on first use. Usable as a FastAPI dependency.
+
+    Returns:
+        AsyncNucleusClient: The shared client
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncNucleusClient()
+    return _shared_client
+
+
+async def close_nucleus_client() -> None:
+    """Close the shared client's connection pool, e.g. on application shutdown."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -1,29 +1,32 @@
 import requests
 from config import settings
 
+# Shared session so repeated calls reuse pooled connections
+_session = requests.Session()
+
+def _headers():
+    return {"Authorization": f"Bearer {settings.NUCLEUS_API_KEY}"}
+
 def upload_document_to_nucleus(file_path: str):
     """Example function to upload a document file to Nucleus."""
     # This is a stub: actual API endpoints and request format will differ
     url = f"{settings.NUCLEUS_API_URL}/documents"
-    headers = {"Authorization": f"Bearer {settings.NUCLEUS_API_KEY}"}
-    files = {"file": open(file_path, "rb")}
-    response = requests.post(url, headers=headers, files=files)
+    with open(file_path, "rb") as f:
+        response = _session.post(url, headers=_headers(), files={"file": f})
     response.raise_for_status()
     return response.json().get("document_id")
 
 def run_extraction_workflow(doc_id: str, workflow_id: str):
     """Trigger an extraction workflow in Nucleus."""
     url = f"{settings.NUCLEUS_API_URL}/workflow/{workflow_id}/run"
-    headers = {"Authorization": f"Bearer {settings.NUCLEUS_API_KEY}"}
     payload = {"document_id": doc_id}
-    response = requests.post(url, headers=headers, json=payload)
+    response = _session.post(url, headers=_headers(), json=payload)
     response.raise_for_status()
     return response.json()  # might contain job_id or status
 
 def fetch_extraction_results(job_id: str):
     """Retrieve extraction results once the workflow completes."""
     url = f"{settings.NUCLEUS_API_URL}/workflow/results/{job_id}"
-    headers = {"Authorization": f"Bearer {settings.NUCLEUS_API_KEY}"}
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=_headers())
     response.raise_for_status()
     return response.json()
@@ -53,19 +53,26 @@ def get_organization_by_name(db: Session, name: str) -> Optional[Organization]:
     """
     return db.query(Organization).filter(Organization.name == name).first()
 
-def get_organizations(db: Session, skip: int = 0, limit: int = 100) -> List[Organization]:
+def get_organizations(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Organization]:
     """
-    Get a list of organizations with pagination.
+    Get a list of organizations with pagination, ordered by ID.
     
     Args:
         db (Session): Database session
-        skip (int): Number of records to skip
+        skip (int): Number of records to skip, ignored with after_id
         limit (int): Maximum number of records to return
+        after_id (Optional[int]): Keyset cursor, only return records with a greater ID; see ``schemas.Page``
         
     Returns:
         List[Organization]: List of organization objects
     """
-    return db.query(Organization).offset(skip).limit(limit).all()
+    query = db.query(Organization)
+    query = query.order_by(Organization.id)
+    if after_id is not None:
+        query = query.filter(Organization.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def update_organization(
     db: Session, 
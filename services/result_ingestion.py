@@ -0,0 +1,182 @@
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import Integer, bindparam, delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from models.DataModels import Document, DocumentStatus, ExtractionModel, Prediction
+from models.validation_models import ResultIngestionReport
+from services.bulk_upsert import upsert_rows
+from services.taxonomy_cache import taxonomy_cache
+
+
+def iter_result_file(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the document records of a Nucleus batch result file.
+
+    JSON Lines files (``.jsonl``) are read one record per line; other files are parsed as JSON,
+    either a list of records or an object with the records under ``results``.
+
+    Args:
+        file_path (str): Path to the result file
+
+    Yields:
+        Dict[str, Any]: One record per document, see ``ingest_extraction_results``
+    """
+    with open(file_path, encoding="utf-8") as f:
+        if file_path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        payload = json.load(f)
+    yield from payload.get("results", []) if isinstance(payload, dict) else payload
+
+
+def _resolve_documents(db: Session, records: List[Dict[str, Any]]) -> Dict[Tuple[str, Any], int]:
+    """Map the document reference of each record to an existing document ID, with one query per reference kind."""
+    document_ids = {record["document_id"] for record in records if record.get("document_id") is not None}
+    nucleus_doc_ids = {record["nucleus_doc_id"] for record in records
+                       if record.get("document_id") is None and record.get("nucleus_doc_id") is not None}
+
+    resolved = {}
+    if document_ids:
+        for document_id in db.scalars(select(Document.id).where(Document.id.in_(document_ids))):
+            resolved[("document_id", document_id)] = document_id
+    if nucleus_doc_ids:
+        for nucleus_doc_id, document_id in db.execute(
+                select(Document.nucleus_doc_id, Document.id).where(Document.nucleus_doc_id.in_(nucleus_doc_ids))):
+            resolved[("nucleus_doc_id", nucleus_doc_id)] = document_id
+    return resolved
+
+
+def _record_key(record: Dict[str, Any]) -> Tuple[str, Any]:
+    if record.get("document_id") is not None:
+        return "document_id", record["document_id"]
+    return "nucleus_doc_id", record.get("nucleus_doc_id")
+
+
+def ingest_extraction_results(db: Session,
+                              model: ExtractionModel,
+                              records: Iterable[Dict[str, Any]],
+                              strict: bool = False,
+                              commit: bool = True) -> ResultIngestionReport:
+    """
+    Store Nucleus extraction results of many documents as predictions, in one transaction.
+
+    Each record is the result payload of one document, identified by ``document_id`` or by
+    ``nucleus_doc_id``, with its values under ``fields``::
+
+        {"document_id": 1, "fields": [{"field_name": "isin", "value": "US0378331005"}, ...]}
+
+    Field names are resolved through the taxonomy cache, documents with one query per kind of
+    reference, and all predictions are upserted on ``uq_document_model_field`` with one
+    ``INSERT ... ON CONFLICT DO UPDATE`` executemany, so ingesting the same results again updates the
+    existing rows instead of duplicating them. The result of a document replaces the model's
+    previous one: predictions of the ingested documents for fields the result omits or has no
+    value for are deleted in the same transaction. If a document reports a field more than once,
+    the last value wins. Ingested documents are marked as extracted; a record without a
+    ``fields`` list, e.g. the payload of a failed job, is reported in ``errors`` and leaves the
+    document's predictions as they are.
+
+    Args:
+        db (Session): Database session
+        model (ExtractionModel): Extraction model the results come from
+        records (Iterable[Dict[str, Any]]): Result payloads, one per document
+        strict (bool): Raise instead of skipping unknown documents and fields
+        commit (bool): Commit the transaction, otherwise leave that to the caller
+
+    Returns:
+        ResultIngestionReport: Counts, unknown field names and the records that could not be ingested
+
+    Raises:
+        ValueError: If ``strict`` and a record names an unknown document or field, or has no ``fields`` list
+    """
+    started = time.perf_counter()
+    records = list(records)
+    metadata = taxonomy_cache.get(db, model.taxonomy_id)
+    field_ids = metadata.field_ids if metadata else {}
+    documents = _resolve_documents(db, records)
+
+    report = ResultIngestionReport(model_id=model.id, documents_total=len(records))
+    unknown_fields = Counter()
+    rows: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    ingested_ids = set()
+    for record in records:
+        key = _record_key(record)
+        document_id = documents.get(key)
+        if document_id is None:
+            report.errors[f"{key[0]}={key[1]}"] = "Document not found"
+            continue
+        # Ingesting replaces the document's predictions, so a result that is not a set of fields must not touch them
+        if metadata is None:
+            report.errors[f"{key[0]}={key[1]}"] = f"Taxonomy {model.taxonomy_id} of the model not found"
+            continue
+        if not isinstance(record.get("fields"), list):
+            report.errors[f"{key[0]}={key[1]}"] = "Result has no fields"
+            continue
+
+        for item in record["fields"]:
+            field_id = field_ids.get(item.get("field_name"))
+            if field_id is None:
+                unknown_fields[str(item.get("field_name"))] += 1
+                continue
+            if item.get("value") is None:
+                continue
+            rows[(document_id, field_id)] = {
+                "document_id": document_id,
+                "model_id": model.id,
+                "field_id": field_id,
+                "field_name": item["field_name"],
+                "value": str(item["value"]),
+                "occurrence": item.get("occurrence", 1),
+            }
+        ingested_ids.add(document_id)
+
+    report.unknown_fields = dict(unknown_fields)
+    if strict and (report.errors or unknown_fields):
+        raise ValueError(f"Records not ingested {dict(list(report.errors.items())[:10])} or unknown fields {sorted(unknown_fields)[:10]} "
+                         f"for model ID '{model.id}'")
+
+    if ingested_ids:
+        stale = delete(Prediction).where(Prediction.model_id == model.id, Prediction.document_id.in_(ingested_ids))
+        if rows:
+            # The kept keys go as two arrays; a row-value NOT IN list of this size exceeds the parser's stack
+            document_ids, field_ids = zip(*rows)
+            kept = select(
+                func.unnest(bindparam("kept_document_ids", list(document_ids), type_=ARRAY(Integer))).label("document_id"),
+                func.unnest(bindparam("kept_field_ids", list(field_ids), type_=ARRAY(Integer))).label("field_id")
+            ).subquery()
+            stale = stale.where(~exists().where(kept.c.document_id == Prediction.document_id,
+                                                kept.c.field_id == Prediction.field_id))
+        report.predictions_deleted = db.execute(stale).rowcount
+    upsert_rows(db, Prediction.__table__, "uq_document_model_field", rows,
+                ("value", "field_name", "occurrence", "created_at"))
+    if ingested_ids:
+        db.execute(update(Document).where(Document.id.in_(ingested_ids)).values(status=DocumentStatus.EXTRACTED))
+    if commit:
+        db.commit()
+
+    report.documents_ingested = len(ingested_ids)
+    report.predictions_written = len(rows)
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def ingest_result_file(db: Session, model: ExtractionModel, file_path: str, strict: bool = False) -> ResultIngestionReport:
+    """
+    Ingest a Nucleus batch result file in one transaction, see ``iter_result_file`` and ``ingest_extraction_results``.
+
+    Args:
+        db (Session): Database session
+        model (ExtractionModel): Extraction model the results come from
+        file_path (str): Path to the JSON or JSON Lines result file
+        strict (bool): Raise instead of skipping unknown documents and fields
+
+    Returns:
+        ResultIngestionReport: Counts, unknown field names and the records that could not be ingested
+    """
+    return ingest_extraction_results(db, model, iter_result_file(file_path), strict=strict)
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models.DataModels import Document
+
+BLOB_ROOT = "storage/blobs"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Linux ioctl that makes the destination share the source's extents (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+LINK_MODES = ("copy", "reflink", "hardlink")
+
+
+def hash_file(file_path: str) -> Tuple[str, int]:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        file_path (str): Path of the file to hash
+
+    Returns:
+        Tuple[str, int]: SHA-256 hex digest and size of the file in bytes
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def blob_path(content_hash: str) -> str:
+    """
+    Get the storage path of a blob, fanned out over two directory levels.
+
+    Args:
+        content_hash (str): SHA-256 hex digest of the blob content
+
+    Returns:
+        str: Path of the blob file
+    """
+    return os.path.join(BLOB_ROOT, content_hash[:2], content_hash[2:4], content_hash)
+
+
+def _reflink(source_path: str, target_path: str) -> None:
+    import fcntl
+
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+
+
+def _copy_hashing(source_path: str, target_path: str) -> Tuple[str, int]:
+    """Copy a file and compute the SHA-256 digest of the copied bytes in the same pass."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            target.write(chunk)
+            size += len(chunk)
+    shutil.copystat(source_path, target_path)
+    return digest.hexdigest(), size
+
+
+def _stage(source_path: str, link_mode: str) -> Tuple[str, str, int]:
+    """
+    Create a temporary blob file from a source file and hash its content.
+
+    The hash is computed from the staged file, so the blob content always matches its name even
+    if the source changes meanwhile. A copy is hashed while it is written; linked and cloned files
+    share the source's data and are read once afterwards.
+    """
+    staging_dir = os.path.join(BLOB_ROOT, "tmp")
+    os.makedirs(staging_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=staging_dir, prefix=".tmp-")
+    os.close(fd)
+    try:
+        linked = False
+        if link_mode == "hardlink":
+            try:
+                os.remove(tmp_path)
+                os.link(source_path, tmp_path)
+                linked = True
+            except OSError:
+                pass
+        elif link_mode == "reflink":
+            try:
+                _reflink(source_path, tmp_path)
+                shutil.copystat(source_path, tmp_path)
+                linked = True
+            except (OSError, ImportError):
+                pass
+        if linked:
+            content_hash, size = hash_file(tmp_path)
+        else:
+            content_hash, size = _copy_hashing(source_path, tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path, content_hash, size
+
+
+def _place(tmp_path: str, path: str) -> bool:
+    """Move a staged blob into place unless the content is already stored; readers never see a partial blob."""
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return True
+
+
+def store_file(source_path: str, link_mode: str = "reflink") -> Tuple[str, str, int, bool]:
+    """
+    Store a file in the content-addressed blob store, keeping a single blob per distinct content.
+
+    The file is staged under ``BLOB_ROOT`` and hashed in one pass over its content, then moved to
+    its blob path, or dropped if that content is already stored. A blob can be released by a
+    concurrent ``release_blob`` until a document referencing it is committed, so call
+    ``ensure_blobs`` in the transaction that inserts the documents.
+
+    Args:
+        source_path (str): Path of the file to store
+        link_mode (str): How a new blob is created. "reflink" clones the file's extents where the
+            filesystem supports it, "hardlink" links the source file itself (the source must then
+            never be modified in place), "copy" always copies. Both fall back to a copy
+
+    Returns:
+        Tuple[str, str, int, bool]: Content hash, blob path, size in bytes and whether a new blob was written
+
+    Raises:
+        ValueError: If link_mode is not one of ``LINK_MODES``
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{link_mode}', expected one of {LINK_MODES}")
+
+    tmp_path, content_hash, size = _stage(source_path, link_mode)
+    path = blob_path(content_hash)
+    return content_hash, path, size, _place(tmp_path, path)
+
+
+def lock_blobs(db: Session, content_hashes: Iterable[str]) -> None:
+    """
+    Take transaction-level advisory locks on blobs, held until the transaction ends.
+
+    ``release_blob`` and ``ensure_blobs`` hold the lock of a blob while they check and change
+    its file. Hashes are locked in sorted order, so concurrent callers cannot deadlock.
+
+    Args:
+        db (Session): Database session
+        content_hashes (Iterable[str]): SHA-256 hex digests of the blobs
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(h)) FROM unnest(CAST(:hashes AS text[])) AS h"),
+               {"hashes": sorted(set(content_hashes))})
+
+
+def ensure_blobs(db: Session, sources: Mapping[str, str], link_mode: str = "reflink") -> Dict[str, str]:
+    """
+    Lock the blobs of documents about to be inserted and re-create any that a concurrent
+    ``release_blob`` deleted since ``store_file``.
+
+    Call in the transaction that inserts the documents, before committing it. The blob locks are
+    held until then, so a ``release_blob`` waiting on them sees the new references.
+
+    Args:
+        db (Session): Database session
+        sources (Mapping[str, str]): Content hash to the source file it was stored from
+        link_mode (str): How a missing blob is created again, see ``store_file``
+
+    Returns:
+        Dict[str, str]: Content hash to error for blobs that could not be restored, e.g. because
+            the source file changed; documents must not be inserted for them
+    """
+    errors = {}
+    lock_blobs(db, sources)
+    for content_hash, source_path in sources.items():
+        path = blob_path(content_hash)
+        if os.path.exists(path):
+            continue
+        try:
+            tmp_path, restored_hash, _ = _stage(source_path, link_mode)
+        except OSError as e:
+            errors[content_hash] = str(e)
+            continue
+        if restored_hash != content_hash:
+            os.remove(tmp_path)
+            errors[content_hash] = f"Source file '{source_path}' changed since it was stored"
+            continue
+        _place(tmp_path, path)
+    return errors
+
+
+def release_blob(db: Session, content_hash: Optional[str]) -> bool:
+    """
+    Delete a blob once no document references it anymore.
+
+    The reference check and the deletion run under the blob's advisory lock, see ``lock_blobs``;
+    the transaction is committed to release it.
+
+    Args:
+        db (Session): Database session
+        content_hash (Optional[str]): SHA-256 hex digest of the blob content
+
+    Returns:
+        bool: True if the blob file was deleted, False if it is still referenced or missing
+    """
+    if not content_hash:
+        return False
+    lock_blobs(db, [content_hash])
+    try:
+        still_referenced = db.query(Document.id).filter(Document.content_hash == content_hash).first()
+        if still_referenced:
+            return False
+        try:
+            os.remove(blob_path(content_hash))
+        except FileNotFoundError:
+            return False
+        return True
+    finally:
+        db.commit()
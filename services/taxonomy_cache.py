@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from models.DataModels import Taxonomy, TaxonomyField
+
+
+class TaxonomyMetadata(NamedTuple):
+    """Read-only field metadata of one version of a taxonomy."""
+    taxonomy_id: int
+    version: Optional[str]
+    field_ids: Mapping[str, int]
+    required_fields: FrozenSet[str]
+    data_types: Mapping[str, str]
+    validation_rules: Mapping[str, Optional[str]]
+
+
+def load_taxonomy_metadata(db: Session, taxonomy_id: int) -> Optional[TaxonomyMetadata]:
+    """
+    Load the field metadata of a taxonomy in a single query.
+
+    Args:
+        db (Session): Database session
+        taxonomy_id (int): ID of the taxonomy
+
+    Returns:
+        Optional[TaxonomyMetadata]: The metadata, None if the taxonomy does not exist
+    """
+    rows = db.query(
+        Taxonomy.version,
+        TaxonomyField.name,
+        TaxonomyField.id,
+        TaxonomyField.data_type,
+        TaxonomyField.is_required,
+        TaxonomyField.validation_rules
+    ).outerjoin(TaxonomyField, TaxonomyField.taxonomy_id == Taxonomy.id).filter(
+        Taxonomy.id == taxonomy_id
+    ).all()
+    if not rows:
+        return None
+
+    fields = [row for row in rows if row.id is not None]
+    return TaxonomyMetadata(
+        taxonomy_id=taxonomy_id,
+        version=rows[0].version,
+        field_ids=MappingProxyType({field.name: field.id for field in fields}),
+        required_fields=frozenset(field.name for field in fields if field.is_required),
+        data_types=MappingProxyType({field.name: field.data_type for field in fields}),
+        validation_rules=MappingProxyType({field.name: field.validation_rules for field in fields})
+    )
+
+
+class TaxonomyCache:
+    """
+    In-process LRU cache of taxonomy field metadata.
+
+    Entries are keyed by taxonomy ID. Taxonomy changes made through ``services.taxonomy_service``
+    invalidate the affected entry, changes made elsewhere must call ``invalidate`` themselves.
+    Metadata loaded while an invalidation happened is returned but not cached, so a load that
+    read the taxonomy before a change cannot outlive it. Unknown taxonomies are not cached.
+
+    Args:
+        maxsize (int): Maximum number of cached taxonomies
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[int, TaxonomyMetadata]" = OrderedDict()
+        # Bumped by every invalidate; a load that overlapped one is not stored, it may predate the change
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, taxonomy_id: int) -> Optional[TaxonomyMetadata]:
+        """
+        Get the field metadata of a taxonomy, loading it on a miss.
+
+        Args:
+            db (Session): Database session, only used on a miss
+            taxonomy_id (int): ID of the taxonomy
+
+        Returns:
+            Optional[TaxonomyMetadata]: The metadata, None if the taxonomy does not exist
+        """
+        with self._lock:
+            metadata = self._entries.get(taxonomy_id)
+            if metadata is not None:
+                self._entries.move_to_end(taxonomy_id)
+                self.hits += 1
+                return metadata
+            self.misses += 1
+            generation = self._generation
+
+        metadata = load_taxonomy_metadata(db, taxonomy_id)
+        if metadata is None:
+            return None
+
+        with self._lock:
+            if generation != self._generation:
+                return metadata
+            self._entries[taxonomy_id] = metadata
+            self._entries.move_to_end(taxonomy_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return metadata
+
+    def invalidate(self, taxonomy_id: Optional[int] = None) -> None:
+        """
+        Drop the cached metadata of a taxonomy, or of all taxonomies.
+
+        Args:
+            taxonomy_id (Optional[int]): ID of the taxonomy, None to clear everything
+        """
+        with self._lock:
+            self._generation += 1
+            if taxonomy_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(taxonomy_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: ``hits``, ``misses``, ``evictions`` and current ``size``
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self._entries)}
+
+
+taxonomy_cache = TaxonomyCache()
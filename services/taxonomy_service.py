@@ -1,9 +1,11 @@
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set
 
 from sqlalchemy.orm import Session
 
+from functions.validation_engine import dump_validation_rules
 from models.DataModels import Taxonomy, TaxonomyField
+from services.taxonomy_cache import taxonomy_cache
 
 
 def create_taxonomy(
@@ -26,6 +28,7 @@ def create_taxonomy(
             - data_type (str): Data type of the field
             - description (str, optional): Field description
             - is_required (bool, optional): Whether field is required
+            - validation_rules (dict or str, optional): Validation rules, see ``functions.validation_engine``
         description (Optional[str]): Description of the taxonomy
         version (str): Version of the taxonomy
         
@@ -50,6 +53,7 @@ def create_taxonomy(
             data_type=field_def["data_type"],
             description=field_def.get("description"),
             is_required=field_def.get("is_required", False),
+            validation_rules=dump_validation_rules(field_def.get("validation_rules")),
             taxonomy_id=taxonomy.id
         )
         db.add(field)
@@ -84,20 +88,50 @@ def get_taxonomy_by_name(db: Session, name: str) -> Optional[Taxonomy]:
     """
     return db.query(Taxonomy).filter(Taxonomy.name == name).first()
 
+def get_field_id_map(db: Session, taxonomy_id: int) -> Dict[str, int]:
+    """
+    Get a mapping of field names to field IDs for a taxonomy, served from the taxonomy cache.
+
+    Args:
+        db (Session): Database session
+        taxonomy_id (int): ID of the taxonomy
+
+    Returns:
+        Dict[str, int]: Dictionary mapping field names to their IDs, empty if the taxonomy does not exist
+    """
+    metadata = taxonomy_cache.get(db, taxonomy_id)
+    return dict(metadata.field_ids) if metadata else {}
+
+def get_required_field_names(db: Session, taxonomy_id: int) -> Set[str]:
+    """
+    Get the names of all required fields of a taxonomy, served from the taxonomy cache.
+
+    Args:
+        db (Session): Database session
+        taxonomy_id (int): ID of the taxonomy
+
+    Returns:
+        Set[str]: Names of the required fields
+    """
+    metadata = taxonomy_cache.get(db, taxonomy_id)
+    return set(metadata.required_fields) if metadata else set()
+
 def get_taxonomies(
     db: Session,
     organization_id: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None
 ) -> List[Taxonomy]:
     """
-    Get a list of taxonomies with optional filtering by organization.
+    Get a list of taxonomies with optional filtering by organization, ordered by ID.
     
     Args:
         db (Session): Database session
         organization_id (Optional[int]): Filter taxonomies by organization ID
-        skip (int): Number of records to skip
+        skip (int): Number of records to skip, ignored with after_id
         limit (int): Maximum number of records to return
+        after_id (Optional[int]): Keyset cursor, only return records with a greater ID; see ``schemas.Page``
         
     Returns:
         List[Taxonomy]: List of taxonomy objects
@@ -105,7 +139,12 @@ def get_taxonomies(
     query = db.query(Taxonomy)
     if organization_id:
         query = query.filter(Taxonomy.organization_id == organization_id)
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(Taxonomy.id)
+    if after_id is not None:
+        query = query.filter(Taxonomy.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def update_taxonomy(
     db: Session,
@@ -131,6 +170,7 @@ def update_taxonomy(
             - data_type (str): Data type of the field (e.g., "string", "number", "date")
             - description (Optional[str]): Field description
             - is_required (Optional[bool]): Whether field is required
+            - validation_rules (Optional[dict or str]): Validation rules, see ``functions.validation_engine``
         
     Returns:
         Optional[Taxonomy]: Updated taxonomy object if found, None otherwise
@@ -157,12 +197,14 @@ def update_taxonomy(
                     data_type=field_def["data_type"],
                     description=field_def.get("description"),
                     is_required=field_def.get("is_required", False),
+                    validation_rules=dump_validation_rules(field_def.get("validation_rules")),
                     taxonomy_id=taxonomy_id
                 )
                 db.add(field)
         
         db.commit()
         db.refresh(taxonomy)
+        taxonomy_cache.invalidate(taxonomy_id)
     return taxonomy
 
 def delete_taxonomy(db: Session, taxonomy_id: int) -> bool:
@@ -180,5 +222,6 @@ def delete_taxonomy(db: Session, taxonomy_id: int) -> bool:
     if taxonomy:
         db.delete(taxonomy)
         db.commit()
+        taxonomy_cache.invalidate(taxonomy_id)
         return True
     return False
\ No newline at end of file
@@ -1,17 +1,39 @@
-import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy.orm import Session, selectinload
+
+from functions.document_validator import (
+    DocumentValidator,
+    FieldTypeValidator,
+    MissingFieldsValidator,
+    RequiredFieldsValidator,
+)
+from functions.validation_engine import compile_rules_cached
+from models.DataModels import Document, ExtractionModel, Prediction, Taxonomy
+from models.validation_models import DocumentValidationReport
+
+DEFAULT_DOCUMENT_VALIDATORS = (RequiredFieldsValidator, FieldTypeValidator, MissingFieldsValidator)
+
 
 def validate_field_value(field_value: str, validation_rules: str) -> bool:
     """
-    Example rule-based validation:
-    - Suppose validation_rules is a JSON string that might contain a regex or range info.
-    - Parse it and apply the checks.
+    Rule-based validation of a single value.
+
+    The rules are a JSON string as stored on ``TaxonomyField.validation_rules`` (regex, range,
+    length, identifier, trade date, see ``functions.validation_engine``). They are compiled once
+    per distinct string and reused on later calls.
+
+    Args:
+        field_value (str): Value to validate
+        validation_rules (str): JSON string of validation rules
+
+    Returns:
+        bool: True if the value passes every rule
     """
-    # Pseudocode for regex check:
-    # rules = json.loads(validation_rules)
-    # if 'regex' in rules:
-    #     if not re.match(rules['regex'], field_value):
-    #         return False
-    return True  # For simplicity, always return True in this stub.
+    if not validation_rules:
+        return True
+    return all(rule.check(field_value) for rule in compile_rules_cached(None, validation_rules))
 
 def ai_based_validation(field_value: str, context: dict) -> bool:
     """
@@ -20,3 +42,70 @@ def ai_based_validation(field_value: str, context: dict) -> bool:
     """
     # e.g., if context says typical range is 1-100, and we get 999, return False
     return True
+
+
+def run_document_validators(db: Session,
+                            document_ids: Iterable[int],
+                            extraction_model: ExtractionModel,
+                            validators: Optional[Sequence[DocumentValidator]] = None,
+                            batch_size: int = 1000) -> List[DocumentValidationReport]:
+    """
+    Run document validators over many documents with a fixed number of queries per batch.
+
+    Documents are loaded with their taxonomy and its fields, and the model's predictions with
+    their fields, in one query each per batch. The predictions are grouped by document once
+    and handed to every validator through the ``predictions`` keyword, so no validator
+    triggers a lazy load or re-filters a document's predictions.
+
+    Args:
+        db (Session): Database session
+        document_ids (Iterable[int]): IDs of the documents to validate
+        extraction_model (ExtractionModel): The extraction model whose predictions are validated
+        validators (Optional[Sequence[DocumentValidator]]): Validators to run, defaults to an
+            instance of each of ``DEFAULT_DOCUMENT_VALIDATORS``
+        batch_size (int): Number of documents loaded per batch
+
+    Returns:
+        List[DocumentValidationReport]: One report per document found, in the order of document_ids
+    """
+    if validators is None:
+        validators = [validator_cls() for validator_cls in DEFAULT_DOCUMENT_VALIDATORS]
+    document_ids = list(dict.fromkeys(document_ids))
+
+    reports = []
+    for start in range(0, len(document_ids), batch_size):
+        batch_ids = document_ids[start:start + batch_size]
+
+        documents = db.query(Document).options(
+            selectinload(Document.taxonomy).selectinload(Taxonomy.fields)
+        ).filter(Document.id.in_(batch_ids)).all()
+        documents_by_id = {document.id: document for document in documents}
+
+        predictions_by_document: Dict[int, List[Prediction]] = defaultdict(list)
+        predictions = db.query(Prediction).options(selectinload(Prediction.field)).filter(
+            Prediction.model_id == extraction_model.id,
+            Prediction.document_id.in_(batch_ids)
+        ).all()
+        for prediction in predictions:
+            predictions_by_document[prediction.document_id].append(prediction)
+
+        for document_id in batch_ids:
+            document = documents_by_id.get(document_id)
+            if document is None:
+                continue
+            results = {}
+            errors = {}
+            for validator in validators:
+                name = type(validator).__name__
+                try:
+                    results[name] = validator.validate(document, extraction_model,
+                                                       predictions=predictions_by_document.get(document_id, []))
+                except Exception as e:
+                    results[name] = False
+                    errors[name] = f"{type(e).__name__}: {e}"
+            reports.append(DocumentValidationReport(document_id=document_id,
+                                                    model_id=extraction_model.id,
+                                                    passed=all(results.values()),
+                                                    results=results,
+                                                    errors=errors))
+    return reports
@@ -0,0 +1,214 @@
+"""
+API load benchmark comparing the blocking request handlers with the async ones.
+
+Fires a mix of small concurrent reads (``GET /documents/``, ``GET /documents/{id}``) and slow
+requests that wait on Nucleus (``GET /documents/{id}/fetch_results``), and reports requests per
+second and latency percentiles for each kind.
+
+In-process (the default), both stacks run against the configured database through
+``httpx.ASGITransport``, with Nucleus replaced by a stub that answers "still running" after
+``--nucleus-latency`` seconds:
+
+- ``sync``: the handlers as they were before the async stack, a sync ``Session`` per request
+  and a blocking Nucleus call, run by FastAPI in its thread pool
+- ``async``: the application routers, an ``AsyncSession`` per request and the shared
+  ``AsyncNucleusClient``
+
+Usage:
+    python -m test.benchmarks.api_load_benchmark --reads 2000 --slow 200 --concurrency 200
+    python -m test.benchmarks.api_load_benchmark --url http://localhost:8000 --slow 0
+
+With ``--url`` the workload is sent to a running server instead; its Nucleus calls are real.
+The database needs at least one document and one extraction model.
+
+Once the concurrency exceeds the database pool size the sync stack can deadlock: every worker
+thread waits for a connection while the sessions holding them wait for a thread to close them.
+A run that does not finish within ``--timeout`` seconds is reported as stalled.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy.orm import Session
+
+import schemas
+from database import dispose_async_engines, get_db, get_read_db
+from routers import documents
+from services import nucleus_async_client
+from services.documents import get_document, get_documents
+from services.model import get_extraction_model
+
+
+def create_sync_app(nucleus_latency: float) -> FastAPI:
+    """The document read and fetch_results handlers as blocking functions, as before the async stack."""
+    app = FastAPI()
+
+    @app.get("/documents/", response_model=schemas.Page[schemas.DocumentOut])
+    def list_documents(after_id: Optional[int] = None,
+                       limit: int = Query(100, ge=1, le=1000),
+                       db: Session = Depends(get_read_db)):
+        return schemas.Page[schemas.DocumentOut].from_items(get_documents(db, limit=limit, after_id=after_id), limit)
+
+    @app.get("/documents/{document_id}", response_model=schemas.DocumentOut)
+    def read_document(document_id: int, db: Session = Depends(get_read_db)):
+        doc = get_document(db, document_id)
+        if not doc:
+            raise HTTPException(status_code=404, detail="Document not found")
+        return doc
+
+    @app.get("/documents/{document_id}/fetch_results")
+    def fetch_results(document_id: int, job_id: str, model_id: int, db: Session = Depends(get_db)):
+        if not get_document(db, document_id) or not get_extraction_model(db, model_id):
+            raise HTTPException(status_code=404, detail="Document or extraction model not found")
+        # Blocking Nucleus call, holding a worker thread and a pooled connection while it waits
+        time.sleep(nucleus_latency)
+        return {"message": "Extraction still running", "status": "running"}
+
+    return app
+
+
+def create_async_app(nucleus_latency: float) -> FastAPI:
+    """The application's async document router, with the shared Nucleus client answering from a stub."""
+    async def nucleus_stub(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(nucleus_latency)
+        return httpx.Response(200, json={"status": "running"})
+
+    nucleus_async_client._shared_client = nucleus_async_client.AsyncNucleusClient(
+        base_url="http://nucleus.invalid", api_key="load-test", max_concurrency=1000,
+        transport=httpx.MockTransport(nucleus_stub))
+    app = FastAPI()
+    app.include_router(documents.router)
+    return app
+
+
+def build_workload(reads: int, slow: int, document_id: int, model_id: int) -> List[Dict[str, Any]]:
+    """Interleave the slow requests evenly between the reads."""
+    requests = []
+    for i in range(reads):
+        if i % 2:
+            requests.append({"kind": "read", "url": f"/documents/{document_id}"})
+        else:
+            requests.append({"kind": "read", "url": "/documents/", "params": {"limit": 20}})
+    step = max(1, (reads + slow) // max(slow, 1))
+    for i in range(slow):
+        requests.insert(i * step, {"kind": "slow", "url": f"/documents/{document_id}/fetch_results",
+                                   "params": {"job_id": "load-test", "model_id": model_id}})
+    return requests
+
+
+async def run_workload(client: httpx.AsyncClient,
+                       workload: List[Dict[str, Any]],
+                       concurrency: int,
+                       timeout: float) -> Dict[str, Any]:
+    """Send the workload, giving up after ``timeout`` seconds, e.g. when the stack deadlocks."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: Dict[str, List[float]] = {"read": [], "slow": []}
+    errors = 0
+
+    async def send(request: Dict[str, Any]) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(request["url"], params=request.get("params"))
+            latencies[request["kind"]].append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.gather(*(send(request) for request in workload)), timeout)
+        stalled = False
+    except asyncio.TimeoutError:
+        stalled = True
+    elapsed = time.perf_counter() - started
+
+    completed = sum(len(values) for values in latencies.values())
+    result = {"requests": len(workload), "completed": completed, "errors": errors, "stalled": stalled,
+              "seconds": elapsed, "requests_per_second": completed / elapsed}
+    for kind, values in latencies.items():
+        if values:
+            result[f"{kind}_p50_ms"] = float(np.percentile(values, 50)) * 1000
+            result[f"{kind}_p99_ms"] = float(np.percentile(values, 99)) * 1000
+    return result
+
+
+async def benchmark(name: str, app: Optional[FastAPI], url: Optional[str], args) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False) if app is not None else None
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=url or "http://api", limits=limits,
+                                 timeout=None) as client:
+        workload = build_workload(args.reads, args.slow, args.document_id, args.model_id)
+        # Warm up the connection pools before measuring
+        warmup = await run_workload(client, workload[:args.concurrency], args.concurrency, args.timeout)
+        if warmup["stalled"]:
+            return {"stack": name, **warmup}
+        result = await run_workload(client, workload, args.concurrency, args.timeout)
+    return {"stack": name, **result}
+
+
+def report(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        print(f"{result['stack']:>6}: {result['requests_per_second']:8.1f} req/s  "
+              f"({result['completed']}/{result['requests']} requests in {result['seconds']:.2f} s, "
+              f"{result['errors']} errors){'  STALLED' if result['stalled'] else ''}")
+        for kind in ("read", "slow"):
+            if f"{kind}_p50_ms" in result:
+                print(f"        {kind:>4} p50 {result[f'{kind}_p50_ms']:8.1f} ms   p99 {result[f'{kind}_p99_ms']:8.1f} ms")
+
+
+async def main_async(args) -> List[Dict[str, Any]]:
+    if args.document_id is None or args.model_id is None:
+        from database import session_scope
+        from models.DataModels import Document, ExtractionModel
+        with session_scope(read_only=True) as db:
+            document = db.query(Document).order_by(Document.id).first()
+            model = db.query(ExtractionModel).order_by(ExtractionModel.id).first()
+            if document is None or model is None:
+                raise ValueError("The database needs at least one document and one extraction model")
+            args.document_id = args.document_id or document.id
+            args.model_id = args.model_id or model.id
+
+    if args.url:
+        return [await benchmark("remote", None, args.url, args)]
+
+    results = []
+    if args.stack in ("sync", "both"):
+        results.append(await benchmark("sync", create_sync_app(args.nucleus_latency), None, args))
+    if args.stack in ("async", "both"):
+        results.append(await benchmark("async", create_async_app(args.nucleus_latency), None, args))
+        await nucleus_async_client.close_nucleus_client()
+        await dispose_async_engines()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=2000, help="Number of small read requests")
+    parser.add_argument("--slow", type=int, default=200, help="Number of requests waiting on Nucleus")
+    parser.add_argument("--concurrency", type=int, default=200, help="Requests in flight at once")
+    parser.add_argument("--nucleus-latency", type=float, default=0.5, help="Seconds the Nucleus stub takes to answer")
+    parser.add_argument("--stack", choices=("sync", "async", "both"), default="both")
+    parser.add_argument("--url", help="Load test a running server instead of the in-process applications")
+    parser.add_argument("--document-id", type=int, help="Document to request, defaults to the first one")
+    parser.add_argument("--model-id", type=int, help="Extraction model for fetch_results, defaults to the first one")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Seconds after which a run is reported as stalled")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+    return 1 if any(result["errors"] or result["stalled"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Query plan benchmark for the service layer.
+
+Seeds a synthetic, deterministic dataset into its own schema, runs the hot service queries against
+it, and reports ``EXPLAIN ANALYZE`` timings and the scans each query plans. Every query runs
+inside a transaction that is rolled back, so write paths can be measured too, and each case's own
+writes are rolled back before its statements are explained, so a delete is measured against the
+seeded rows rather than the ones it already removed.
+
+Usage:
+    python -m test.benchmarks.query_plan_benchmark --documents 20000 --fields 10 --models 3
+    python -m test.benchmarks.query_plan_benchmark --drop-index ix_predictions_model_document
+    python -m test.benchmarks.query_plan_benchmark --fail-on-seq-scan
+
+With ``--fail-on-seq-scan`` the script exits with status 1 when a query sequentially scans one of
+the large tables, which is how an index regression shows up.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, delete, event, func, text
+from sqlalchemy.orm import Session
+
+from config import settings
+from functions.evaluation import load_comparison_frame
+from models.DataModels import Base, Document, DocumentStatus, ExtractionModel, FieldLabel, Prediction
+from services.documents import get_documents, iter_documents
+from services.extractions import get_predictions_for_document_and_model, get_predictions_for_model
+from services.taxonomy_cache import taxonomy_cache
+from services.taxonomy_service import get_field_id_map
+from services.validation_service import run_document_validators
+
+BENCHMARK_SCHEMA = "extraction_benchmark"
+LARGE_TABLES = {"documents", "field_labels", "predictions"}
+
+
+def create_benchmark_engine(schema: str = BENCHMARK_SCHEMA):
+    return create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+
+
+def seed(engine, schema: str, organizations: int, documents: int, fields: int, models: int) -> None:
+    """Recreate the benchmark schema and fill it with generate_series, so the data is identical on every run."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    Base.metadata.create_all(bind=engine)
+
+    statuses = ",".join(f"'{status.name}'" for status in DocumentStatus)
+    statements = [
+        """INSERT INTO organizations (name, is_active)
+           SELECT 'org-' || g, true FROM generate_series(1, :organizations) g""",
+        """INSERT INTO taxonomies (name, version, is_active, organization_id)
+           SELECT 'taxonomy-' || o.id, '1.0', true, o.id FROM organizations o""",
+        """INSERT INTO fields (name, data_type, is_required, taxonomy_id)
+           SELECT 'field_' || g, CASE WHEN g % 3 = 0 THEN 'number' ELSE 'string' END, g <= 3, t.id
+           FROM taxonomies t CROSS JOIN generate_series(1, :fields) g""",
+        f"""INSERT INTO documents (name, file_path, individual_id, is_labeled, status, organization_id, taxonomy_id)
+            SELECT 'doc-' || g, '/benchmark/doc-' || g, 'individual-' || (g % 1000), true,
+                   (ARRAY[{statuses}])[1 + g % {len(DocumentStatus)}]::documentstatus,
+                   1 + g % :organizations, 1 + g % :organizations
+            FROM generate_series(1, :documents) g""",
+        """INSERT INTO field_labels (value, document_id, field_id, field_name, occurrence)
+           SELECT 'value-' || d.id || '-' || f.id, d.id, f.id, f.name, 1
+           FROM documents d JOIN fields f ON f.taxonomy_id = d.taxonomy_id""",
+        """INSERT INTO extraction_models (name, is_active, taxonomy_id)
+           SELECT 'model-' || t.id || '-' || g, true, t.id
+           FROM taxonomies t CROSS JOIN generate_series(1, :models) g""",
+        """INSERT INTO predictions (document_id, model_id, field_id, field_name, value, occurrence)
+           SELECT l.document_id, m.id, l.field_id, l.field_name,
+                  CASE WHEN (l.document_id + l.field_id + m.id) % 5 = 0 THEN 'wrong' ELSE l.value END, 1
+           FROM field_labels l
+           JOIN documents d ON d.id = l.document_id
+           JOIN extraction_models m ON m.taxonomy_id = d.taxonomy_id""",
+    ]
+    params = {"organizations": organizations, "documents": documents, "fields": fields, "models": models}
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement), params)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def plan_nodes(plan: Dict[str, Any]) -> List[str]:
+    """Flatten a JSON plan into ``Node Type on relation [using index]`` descriptions of its scans."""
+    nodes = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        node = plan["Node Type"]
+        if "Relation Name" in plan:
+            node += f" on {plan['Relation Name']}"
+        if "Index Name" in plan:
+            node += f" using {plan['Index Name']}"
+        nodes.append(node)
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(conn, statement: str, parameters) -> Dict[str, Any]:
+    row = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters).scalar()
+    result = row[0] if isinstance(row, list) else json.loads(row)[0]
+    return {
+        "planning_ms": result["Planning Time"],
+        "execution_ms": result["Execution Time"],
+        "scans": plan_nodes(result["Plan"]),
+    }
+
+
+def benchmark_cases(sample_document_id: int, sample_model: ExtractionModel) -> List[Tuple[str, Callable[[Session], Any]]]:
+    document_ids = list(range(sample_document_id, sample_document_id + 500))
+    return [
+        ("get_documents (deep keyset page)",
+         lambda db: get_documents(db, organization_id=1, after_id=sample_document_id, limit=100)),
+        ("iter_documents (organization, status)",
+         lambda db: next(iter_documents(db, organization_id=1, status=DocumentStatus.PENDING, batch_size=100), None)),
+        ("taxonomy metadata load",
+         lambda db: (taxonomy_cache.invalidate(), get_field_id_map(db, sample_model.taxonomy_id))),
+        ("get_predictions_for_document_and_model",
+         lambda db: get_predictions_for_document_and_model(db, sample_document_id, sample_model.id)),
+        ("get_predictions_for_model",
+         lambda db: get_predictions_for_model(db, sample_model.id)),
+        ("load_comparison_frame (500 documents)",
+         lambda db: load_comparison_frame(db, sample_model.id, document_ids)),
+        ("run_document_validators (500 documents)",
+         lambda db: run_document_validators(db, document_ids, sample_model)),
+        ("PredictionWriter delete (500 documents)",
+         lambda db: db.execute(delete(Prediction).where(Prediction.model_id == sample_model.id,
+                                                        Prediction.document_id.in_(document_ids)))),
+        ("assign_labels delete",
+         lambda db: db.execute(delete(FieldLabel).where(FieldLabel.document_id == sample_document_id))),
+    ]
+
+
+def run(engine, dropped_indexes: List[str]) -> List[Dict[str, Any]]:
+    """Run every case once in a rolled back savepoint to capture its SQL, then EXPLAIN ANALYZE each captured statement."""
+    results = []
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        for index_name in dropped_indexes:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        sample_model = db.query(ExtractionModel).order_by(ExtractionModel.id).first()
+        sample_document_id = max(1, (db.query(func.max(Document.id)).scalar() or 0) // 2)
+
+        for name, case in benchmark_cases(sample_document_id, sample_model):
+            captured = []
+
+            def capture(conn_, cursor, statement, parameters, context, executemany):
+                if not statement.lstrip().upper().startswith(("EXPLAIN", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+                    captured.append((statement, parameters))
+
+            savepoint = conn.begin_nested()
+            case_db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            event.listen(conn, "before_cursor_execute", capture)
+            try:
+                case(case_db)
+            finally:
+                event.remove(conn, "before_cursor_execute", capture)
+                case_db.close()
+                savepoint.rollback()
+
+            # EXPLAIN ANALYZE executes the statements too, so their writes are rolled back before the next case
+            savepoint = conn.begin_nested()
+            try:
+                for i, (statement, parameters) in enumerate(captured):
+                    label = name if len(captured) == 1 else f"{name} [{i + 1}/{len(captured)}]"
+                    results.append({"query": label, **explain(conn, statement, parameters)})
+            finally:
+                savepoint.rollback()
+        db.close()
+        transaction.rollback()
+    taxonomy_cache.invalidate()
+    return results
+
+
+def report(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        print(f"{result['query']}")
+        print(f"    planning {result['planning_ms']:8.2f} ms   execution {result['execution_ms']:8.2f} ms")
+        for scan in result["scans"]:
+            print(f"    {scan}")
+
+
+def sequential_scans(results: List[Dict[str, Any]]) -> List[str]:
+    return [f"{result['query']}: {scan}" for result in results for scan in result["scans"]
+            if scan.startswith("Seq Scan") and scan.split(" on ")[1].split(" ")[0] in LARGE_TABLES]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default=BENCHMARK_SCHEMA)
+    parser.add_argument("--organizations", type=int, default=4)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--models", type=int, default=3)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data of a previous run")
+    parser.add_argument("--drop-index", action="append", default=[],
+                        help="Drop an index for this run only, to measure what it is worth")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--fail-on-seq-scan", action="store_true",
+                        help=f"Exit with status 1 if a query sequentially scans one of {sorted(LARGE_TABLES)}")
+    args = parser.parse_args(argv)
+
+    engine = create_benchmark_engine(args.schema)
+    if not args.skip_seed:
+        seed(engine, args.schema, args.organizations, args.documents, args.fields, args.models)
+    results = run(engine, args.drop_index)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+
+    scans = sequential_scans(results)
+    if scans:
+        print("\nSequential scans on large tables:", file=sys.stderr)
+        for scan in scans:
+            print(f"    {scan}", file=sys.stderr)
+        if args.fail_on_seq_scan:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
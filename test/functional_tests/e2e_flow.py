@@ -1,16 +1,14 @@
 from database import get_db
 # Import our services
 from functions.extractors import HardcodeValuesExtractor
-from functions.metrics import compare_labels_and_predictions, get_accuracy_for_each_field, \
-    get_percent_of_fully_correctly_extracted, get_overall_accuracy
-from models.validation_models import PerformanceMetric
+from functions.evaluation import evaluate_model
 from functions.post_processing import PostProcessor
 from models.DataModels import Document, Taxonomy
 from org_definition import taxonomy_name, org_name, org_description, test_folder, model_description, fields
 from services.documents import upload_documents_from_folder, get_document, get_documents, \
     assign_labels
-from services.extractions import extract_and_assign_predictions
-from services.metrics import create_or_update_metric
+from services.extraction_runner import run_extraction
+from services.metrics import bulk_upsert_metrics
 from services.model import create_extraction_model, get_extraction_model_by_name
 from services.organization_service import create_organization, get_organization_by_name
 from services.taxonomy_service import get_taxonomy_by_name, create_taxonomy
@@ -95,38 +93,42 @@ if EXTRACTION:
                                                    model_name=model_name,
                                                    model_description=model_description)
 
-    # Running extraction for each document
-    for doc, additional_args in zip(docs, additional_args_list):
-        # You would need to provide actual organization name, taxonomy name, document, and extraction model
-        extract_and_assign_predictions(db=db,
-                                       extraction_model=extraction_model,
-                                       post_processor=post_processor,
-                                       document=doc,
-                                       extractor=extractor,
-                                       **additional_args['labels'])
+    # Running extraction for all documents in a thread pool
+    run_report = run_extraction(db=db,
+                                extraction_model=extraction_model,
+                                document_ids=[doc.id for doc in docs],
+                                extractor=extractor,
+                                post_processor=post_processor,
+                                mode="thread",
+                                extractor_kwargs={doc.id: additional_args['labels']
+                                                  for doc, additional_args in zip(docs, additional_args_list)})
+    print(run_report)
+
+    # The same run in a process pool: extractor and post-processor must survive pickling
+    process_report = run_extraction(db=db,
+                                    extraction_model=extraction_model,
+                                    document_ids=[doc.id for doc in docs],
+                                    extractor=extractor,
+                                    post_processor=post_processor,
+                                    mode="process",
+                                    max_workers=2,
+                                    extractor_kwargs={doc.id: additional_args['labels']
+                                                      for doc, additional_args in zip(docs, additional_args_list)})
+    print(process_report)
+    assert process_report.errors == run_report.errors, process_report.errors
 
     if MODEL_EVALUATION:
         model_id = extraction_model.id
 
-        # Aggregate predictions for each document.
-        doc_results = [compare_labels_and_predictions(db, doc['document_id'], model_id) for doc in document_mapping]
-
-        # Minimal fields:
-        field_accuracy = get_accuracy_for_each_field(doc_results)
-        overall_accuracy = get_overall_accuracy(doc_results)
-        perc_of_full_correct = get_percent_of_fully_correctly_extracted(doc_results)
+        # Evaluate all labelled documents in one query
+        evaluation = evaluate_model(db, model_id, document_ids=[doc['document_id'] for doc in document_mapping])
+        field_accuracy = evaluation.field_accuracy
+        overall_accuracy = evaluation.overall_accuracy
+        perc_of_full_correct = evaluation.perc_of_full_correct
 
         # Add to Metrics database - overall_accuracy, field_accuracy, perc_of_full_correct
-        metrics = [
-            PerformanceMetric(name='overall_accuracy', value=overall_accuracy, sample_size=len(doc_results)),
-            PerformanceMetric(name='perc_of_full_correct', value=perc_of_full_correct, sample_size=len(doc_results)),
-        ] + [PerformanceMetric(name=f"{field}_accuracy",
-                               value=value) for field, value in field_accuracy.items()]
-
-        for metric in metrics:
-            create_or_update_metric(db, metric.name, metric.value, len(doc_results), model_id)
+        bulk_upsert_metrics(db, evaluation.to_performance_metrics(), model_id)
 
-        # print(doc_results)
         print(f"{'='*20} METRICS {'='*20}")
         print(f"Overall accuracy: {overall_accuracy:.2f} %" )
         print(f"Percentage of fully correct documents: {perc_of_full_correct:.2f} %")
@@ -16,7 +16,12 @@ extractions_to_assign = [
                                   "reference_number": "REC-002"}},
 ]
 
+def date_part(value):
+    return value[:10]
+
+
+# Module-level operations, so the post-processor can be pickled for run_extraction(mode="process")
 postprocessing_operations = {
-    'document_type': [lambda x: x.strip()],
-    'issue_date': [lambda x: x[:10]]
+    'document_type': [str.strip],
+    'issue_date': [date_part]
 }
\ No newline at end of file
@@ -0,0 +1,28 @@
+import math
+
+import pytest
+
+from functions.matchers import NumericToleranceMatcher, parse_numbers
+
+
+def test_parse_numbers_ignores_currency_and_units():
+    values = ["1,234.50", "USD 99", "EUR 100", "12 %", "(300)", "-$5", "1e3"]
+    assert list(parse_numbers(values)) == [1234.5, 99.0, 100.0, 12.0, -300.0, -5.0, 1000.0]
+    assert list(parse_numbers(["1.234,5", "(1.000,25)"], decimal=",", thousands=".")) == [1234.5, -1000.25]
+
+
+@pytest.mark.parametrize("value", ["2023-01-05", "12-34", "(-5)", "(5", "1.2.3", "555 1234", "abc", None])
+def test_parse_numbers_rejects_values_that_are_not_a_single_number(value):
+    assert math.isnan(parse_numbers([value])[0])
+
+
+@pytest.mark.parametrize("label, prediction, expected", [
+    ("EUR 100", "100.00", True),
+    ("(300)", "-300", True),
+    ("2023-01-05", "2023-12-31", False),
+    ("12-34", "12", False),
+    ("(-5)", "5", False),
+    ("(-5)", "(-5)", True),
+])
+def test_numeric_matcher_falls_back_to_exact_match_for_non_numbers(label, prediction, expected):
+    assert NumericToleranceMatcher()(label, prediction) is expected
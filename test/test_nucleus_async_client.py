@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.nucleus_async_client import AsyncNucleusClient, NucleusJobError
+
+
+class StubNucleus:
+    """In-memory stand-in for the Nucleus API, served through ``httpx.MockTransport``."""
+
+    def __init__(self, pending_polls: int = 1, job_id="job-1", final_status: str = "completed"):
+        self.pending_polls = pending_polls
+        self.job_id = job_id
+        self.final_status = final_status
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST" and request.url.path == "/documents":
+            return httpx.Response(200, json={"document_id": "doc-1"})
+        if request.method == "POST" and request.url.path.startswith("/workflow/"):
+            return httpx.Response(200, json={"job_id": self.job_id} if self.job_id else {})
+        if request.method == "GET" and request.url.path.startswith("/workflow/results/"):
+            if self.pending_polls > 0:
+                self.pending_polls -= 1
+                return httpx.Response(202)
+            return httpx.Response(200, json={"status": self.final_status,
+                                             "fields": [{"field_name": "document_type", "value": "Invoice"}]})
+        return httpx.Response(404)
+
+
+def make_client(stub: StubNucleus) -> AsyncNucleusClient:
+    return AsyncNucleusClient(base_url="http://nucleus.test", api_key="test-key", transport=httpx.MockTransport(stub))
+
+
+def test_upload_document_streams_multipart_body(tmp_path):
+    content = b"%PDF-1.4\n" + bytes(range(256)) * 10000
+    file_path = tmp_path / 'scan "1".pdf'
+    file_path.write_bytes(content)
+    stub = StubNucleus()
+
+    async def upload():
+        async with make_client(stub) as client:
+            return await client.upload_document(str(file_path))
+
+    assert asyncio.run(upload()) == "doc-1"
+    request = stub.requests[0]
+    assert request.headers["Authorization"] == "Bearer test-key"
+    assert int(request.headers["Content-Length"]) == len(request.content)
+    boundary = request.headers["Content-Type"].split("boundary=")[1]
+    head, body = request.content.split(b"\r\n\r\n", 1)
+    assert head.startswith(f"--{boundary}\r\n".encode())
+    assert b'filename="scan %221%22.pdf"' in head
+    assert b"Content-Type: application/pdf" in head
+    assert body == content + f"\r\n--{boundary}--\r\n".encode()
+
+
+def test_run_and_wait_polls_until_results():
+    stub = StubNucleus(pending_polls=2)
+
+    async def run():
+        async with make_client(stub) as client:
+            return await client.run_and_wait("doc-1", "wf-1", initial_delay=0.001)
+
+    results = asyncio.run(run())
+    assert results["status"] == "completed"
+    assert json.loads(stub.requests[0].content) == {"document_id": "doc-1"}
+    assert [request.url.path for request in stub.requests[1:]] == ["/workflow/results/job-1"] * 3
+
+
+def test_run_and_wait_requires_job_id():
+    stub = StubNucleus(job_id=None)
+
+    async def run():
+        async with make_client(stub) as client:
+            return await client.run_and_wait("doc-1", "wf-1")
+
+    with pytest.raises(ValueError, match="no job ID"):
+        asyncio.run(run())
+    assert len(stub.requests) == 1
+
+
+def test_wait_for_results_raises_on_failed_job():
+    stub = StubNucleus(pending_polls=0, final_status="failed")
+
+    async def run():
+        async with make_client(stub) as client:
+            return await client.wait_for_results("job-1")
+
+    with pytest.raises(NucleusJobError) as error:
+        asyncio.run(run())
+    assert error.value.status == "failed"